@@ -0,0 +1,238 @@
+"""
+Vectorized Underwriting and Risk Engine
+Columnar counterpart of underwrite_application and assess_risk for portfolio-scale runs
+"""
+
+from typing import Any ,Callable ,Dict ,List ,Optional ,Tuple 
+
+import numpy as np 
+
+from agents .rule_engine import Policy ,policy_store ,round_half_even 
+from agents .reason_codes import ReasonCode 
+from agents import risk_agent ,underwriting_agent 
+
+
+DECISIONS =underwriting_agent .DECISIONS 
+RISK_LEVELS =risk_agent .RISK_LEVELS 
+
+FLOAT_COLUMNS =(
+"monthly_income",
+"existing_emi",
+"credit_score",
+"employment_years",
+"loan_amount",
+)
+INTEGER_COLUMNS =(
+"business_vintage_years",
+"itr_years_submitted",
+"bank_statement_months",
+"recent_delinquency_months",
+"address_changes_last_12_months",
+)
+BOOL_COLUMNS ={
+"verified":True ,
+"urgency_flag":False ,
+"stress_detected":False ,
+"inconsistent_statements":False ,
+"geo_risk_flag":False ,
+}
+COLUMNS =FLOAT_COLUMNS +INTEGER_COLUMNS +tuple (BOOL_COLUMNS )
+
+
+def _table_accessor (table :Any )->Tuple [set ,Callable [[str ],Any ]]:
+    if hasattr (table ,"column_names")and hasattr (table ,"column"):
+        return set (table .column_names ),lambda name :table .column (name ).to_numpy (zero_copy_only =False )
+    return set (table .keys ()),lambda name :table [name ]
+
+
+def load_columns (table :Any )->Dict [str ,np .ndarray ]:
+    """
+    Normalise a columnar table into the engine's input arrays
+
+    Accepts a mapping of column name to sequence/ndarray (including a pandas
+    DataFrame) or a pyarrow Table. Missing columns and null cells take the
+    same defaults as the scalar agents' .get() calls, except `verified`,
+    which defaults to True because stress-test portfolios are already
+    KYC-complete; integer-valued columns are truncated like int().
+    """
+    names ,get =_table_accessor (table )
+    unknown =names -set (COLUMNS )
+    if unknown :
+        raise ValueError (f"Unknown columns: {', '.join (sorted (unknown ))}")
+
+    raw ={name :get (name )for name in COLUMNS if name in names }
+    lengths ={len (values )for values in raw .values ()}
+    if len (lengths )>1 :
+        raise ValueError ("All columns must have the same length")
+    n =lengths .pop ()if lengths else 0 
+
+    columns ={}
+    for name in FLOAT_COLUMNS +INTEGER_COLUMNS :
+        if name not in raw :
+            columns [name ]=np .zeros (n )
+            continue 
+        values =np .asarray (raw [name ],dtype =np .float64 )
+        values =np .where (np .isnan (values ),0.0 ,values )
+        columns [name ]=np .trunc (values )if name in INTEGER_COLUMNS else values 
+    for name ,default in BOOL_COLUMNS .items ():
+        if name not in raw :
+            columns [name ]=np .full (n ,default ,dtype =bool )
+            continue 
+        values =np .asarray (raw [name ])
+        if values .dtype ==object :
+            values =np .array ([default if v is None else bool (v )for v in values ],dtype =bool )
+        columns [name ]=values .astype (bool )
+    return columns 
+
+
+def _ratio (numerator :np .ndarray ,denominator :np .ndarray ,positive :np .ndarray )->np .ndarray :
+    safe =np .where (positive ,denominator ,1.0 )
+    return np .where (positive ,numerator /safe ,1.0 )
+
+
+def underwrite_batch (columns :Dict [str ,np .ndarray ],policy :Policy ,count_hits :bool =True )->Dict [str ,np .ndarray ]:
+    """Vectorized underwrite_application; reasons are bitmasks over policy.underwriting.reason_codes"""
+    income =columns ["monthly_income"]
+    positive =income >0 
+    emi_ratio =_ratio (columns ["existing_emi"],income ,positive )
+    lti =_ratio (columns ["loan_amount"],income *12 ,positive )
+
+    inputs ={
+    "emi_ratio":emi_ratio ,
+    "lti":lti ,
+    "credit_score":columns ["credit_score"],
+    "employment_years":columns ["employment_years"],
+    "business_vintage_years":columns ["business_vintage_years"],
+    "itr_years_submitted":columns ["itr_years_submitted"],
+    "bank_statement_months":columns ["bank_statement_months"],
+    }
+    decision ,_ ,reasons =policy .underwriting .evaluate_batch (inputs ,len (income ),count_hits )
+
+    return {
+    "decision":decision ,
+    "risk":decision ,
+    "emi_ratio":round_half_even (emi_ratio ,2 ),
+    "emi_ratio_raw":emi_ratio ,
+    "lti":lti ,
+    "credit_score":columns ["credit_score"],
+    "reasons":reasons ,
+    "inputs":inputs ,
+    }
+
+
+def assess_risk_batch (columns :Dict [str ,np .ndarray ],underwriting :Dict [str ,np .ndarray ],policy :Policy ,count_hits :bool =True )->Dict [str ,np .ndarray ]:
+    """Vectorized assess_risk over the output of underwrite_batch"""
+    annual_income =columns ["monthly_income"]*12 
+    lti =_ratio (columns ["loan_amount"],annual_income ,annual_income >0 )
+
+    inputs ={
+    "verified":columns ["verified"],
+    "underwriting_risk":underwriting ["risk"],
+    "emi_ratio":underwriting ["emi_ratio"],
+    "lti":lti ,
+    "credit_score":columns ["credit_score"],
+    "recent_delinquency_months":columns ["recent_delinquency_months"],
+    "urgency_flag":columns ["urgency_flag"],
+    "stress_detected":columns ["stress_detected"],
+    "inconsistent_statements":columns ["inconsistent_statements"],
+    "address_changes_last_12_months":columns ["address_changes_last_12_months"],
+    "geo_risk_flag":columns ["geo_risk_flag"],
+    }
+    _ ,score ,reasons =policy .risk .evaluate_batch (inputs ,len (lti ),count_hits )
+    score ,band =policy .risk .finalize_score_batch (score )
+
+    return {
+    "risk_band":band ,
+    "risk_score":score ,
+    "risk_score_percent":np .rint (score *100 ).astype (np .int64 ),
+    "reasons":reasons ,
+    "inputs":inputs ,
+    }
+
+
+def evaluate_batch (table :Any ,policy :Optional [Policy ]=None ,count_hits :bool =True )->Dict [str ,Any ]:
+    policy =policy or policy_store .current ()
+    columns =load_columns (table )
+    underwriting =underwrite_batch (columns ,policy ,count_hits )
+    return {
+    "policy":policy ,
+    "columns":columns ,
+    "underwriting":underwriting ,
+    "risk":assess_risk_batch (columns ,underwriting ,policy ,count_hits ),
+    }
+
+
+def underwriting_record (result :Dict [str ,Any ],i :int )->Dict :
+    """Row i in the shape returned by underwrite_application"""
+    policy =result ["policy"]
+    underwriting =result ["underwriting"]
+    codes =policy .underwriting .decode (int (underwriting ["reasons"][i ]))
+    return {
+    "decision":DECISIONS [underwriting ["decision"][i ]],
+    "risk":RISK_LEVELS [underwriting ["risk"][i ]],
+    "emi_ratio":float (underwriting ["emi_ratio"][i ]),
+    "credit_score":float (underwriting ["credit_score"][i ]),
+    "reason_codes":codes ,
+    "reason_params":policy .underwriting .row_params (codes ,underwriting ["inputs"],i ),
+    }
+
+
+def risk_record (result :Dict [str ,Any ],i :int )->Dict :
+    """Row i in the shape returned by assess_risk"""
+    policy =result ["policy"]
+    risk =result ["risk"]
+    codes =policy .risk .decode (int (risk ["reasons"][i ]))
+    return {
+    "risk_band":RISK_LEVELS [risk ["risk_band"][i ]],
+    "risk_score":float (risk ["risk_score"][i ]),
+    "risk_score_percent":int (risk ["risk_score_percent"][i ]),
+    "reason_codes":codes ,
+    "reason_params":policy .risk .row_params (codes ,risk ["inputs"],i ),
+    }
+
+
+def _reason_counts (masks :np .ndarray ,codes :Tuple [int ,...])->Dict [str ,int ]:
+    return {ReasonCode (code ).name :int (np .count_nonzero (masks &np .uint64 (1 <<i )))for i ,code in enumerate (codes )}
+
+
+def summarize (result :Dict [str ,Any ])->Dict [str ,Any ]:
+    policy =result ["policy"]
+    underwriting =result ["underwriting"]
+    risk =result ["risk"]
+    n =len (underwriting ["decision"])
+    decisions =np .bincount (underwriting ["decision"],minlength =3 )
+    bands =np .bincount (risk ["risk_band"],minlength =3 )
+    scores =risk ["risk_score"]
+    return {
+    "rows":n ,
+    "policy_version":policy .version ,
+    "decisions":{label :int (count )for label ,count in zip (DECISIONS ,decisions )},
+    "risk_bands":{label :int (count )for label ,count in zip (RISK_LEVELS ,bands )},
+    "risk_score":{
+    "mean":round (float (scores .mean ()),4 )if n else None ,
+    "p50":float (np .percentile (scores ,50 ))if n else None ,
+    "p95":float (np .percentile (scores ,95 ))if n else None ,
+    "max":float (scores .max ())if n else None ,
+    },
+    "underwriting_reasons":_reason_counts (underwriting ["reasons"],policy .underwriting .reason_codes ),
+    "risk_reasons":_reason_counts (risk ["reasons"],policy .risk .reason_codes ),
+    }
+
+
+def to_columns (result :Dict [str ,Any ])->Dict [str ,List ]:
+    policy =result ["policy"]
+    underwriting =result ["underwriting"]
+    risk =result ["risk"]
+    return {
+    "decision":np .array (DECISIONS )[underwriting ["decision"]].tolist (),
+    "underwriting_risk":np .array (RISK_LEVELS )[underwriting ["risk"]].tolist (),
+    "emi_ratio":underwriting ["emi_ratio"].tolist (),
+    "lti":underwriting ["lti"].tolist (),
+    "underwriting_reason_mask":underwriting ["reasons"].tolist (),
+    "underwriting_reason_bits":list (policy .underwriting .reason_codes ),
+    "risk_band":np .array (RISK_LEVELS )[risk ["risk_band"]].tolist (),
+    "risk_score":risk ["risk_score"].tolist (),
+    "risk_score_percent":risk ["risk_score_percent"].tolist (),
+    "risk_reason_mask":risk ["reasons"].tolist (),
+    "risk_reason_bits":list (policy .risk .reason_codes ),
+    }
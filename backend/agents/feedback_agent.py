@@ -1,5 +1,7 @@
 from typing import Dict ,Optional 
-from transformers import pipeline 
+from ml .gpu_accelerated_inference import accelerator 
+from ml .inference_client import inference_client 
+from agents .reason_codes import render_reasons 
 
 _feedback_llm =None 
 
@@ -7,13 +9,19 @@ _feedback_llm =None
 def _get_feedback_llm ():
     global _feedback_llm 
     if _feedback_llm is None :
-        _feedback_llm =pipeline (
+        from transformers import pipeline 
+
+        _feedback_llm =accelerator .load_model ("feedback_llm",lambda :pipeline (
         "text2text-generation",
         model ="google/flan-t5-base"
-        )
+        ))
     return _feedback_llm 
 
 
+def _count_tokens (tokenizer ,prompt :str ,generated :str ):
+    return len (tokenizer (prompt ).input_ids ),len (tokenizer (generated ).input_ids )
+
+
 def generate_feedback (
 verification_result :Dict ,
 underwriting_result :Dict ,
@@ -28,7 +36,7 @@ emotion :Optional [str ]=None
 
     risk =risk_result .get ("risk_band","MEDIUM")
     uw_decision =underwriting_result .get ("decision","PENDING")
-    reasons =risk_result .get ("reasons",[])
+    reasons =render_reasons (risk_result )
     ver_status =(verification_result or {}).get ("status")
     ver_reason =(verification_result or {}).get ("reason")
 
@@ -70,8 +78,18 @@ emotion :Optional [str ]=None
     f"{base_message }"
     )
 
-    llm =_get_feedback_llm ()
-    response =llm (prompt ,max_new_tokens =120 ,do_sample =False )[0 ]["generated_text"]
+    if inference_client :
+        response =inference_client .call ("feedback_llm",prompt ,max_new_tokens =120 ,do_sample =False )[0 ]["generated_text"]
+    else :
+        llm =_get_feedback_llm ()
+        response =accelerator .run_model (
+        "feedback_llm",
+        llm ,
+        prompt ,
+        max_new_tokens =120 ,
+        do_sample =False ,
+        token_counter =lambda out :_count_tokens (llm .tokenizer ,prompt ,out [0 ]["generated_text"])
+        )[0 ]["generated_text"]
 
     return {
     "feedback":response ,
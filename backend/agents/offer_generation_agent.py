@@ -1,37 +1,44 @@
-from typing import Dict ,Any 
-from transformers import pipeline 
-import torch 
-import torch 
-from transformers import pipeline 
+from typing import Dict ,Any ,Optional 
+from ml .gpu_accelerated_inference import accelerator ,hf_device 
+from ml .inference_client import inference_client 
 
-HF_DEVICE =0 if torch .cuda .is_available ()else -1 
+OFFER_INCOME_MULTIPLE =20 
+NO_OFFER_BANDS =("HIGH",)
+OFFER_TERMS ={"LOW":(10.5 ,60 )}
+DEFAULT_OFFER_TERMS =(13.5 ,36 )
+DEFAULT_OFFER_LOAN_AMOUNT =500000 
 
-_offer_llm =pipeline (
-"text2text-generation",
-model ="google/flan-t5-base",
-device =HF_DEVICE 
-)
-
-
-
-def _get_device ():
-    return 0 if torch .cuda .is_available ()else -1 
+_offer_llm =None 
 
 
 def _get_offer_llm ():
     global _offer_llm 
     if _offer_llm is None :
-        _offer_llm =pipeline (
+        from transformers import pipeline 
+
+        _offer_llm =accelerator .load_model ("offer_llm",lambda :pipeline (
         "text2text-generation",
         model ="google/flan-t5-base",
-        device =_get_device (),
+        device =hf_device (),
         padding =True 
-        )
+        ))
         _offer_llm .model .config .pad_token_id =_offer_llm .model .config .eos_token_id 
         _offer_llm .tokenizer .pad_token_id =_offer_llm .tokenizer .eos_token_id 
     return _offer_llm 
 
 
+def offer_terms (risk_band :str ,loan_amount :float ,monthly_income :float )->Optional [Dict [str ,Any ]]:
+    """Amount, rate and tenure offered for a risk band, or None when the band gets no offer"""
+    if risk_band in NO_OFFER_BANDS :
+        return None 
+    rate ,tenure =OFFER_TERMS .get (risk_band ,DEFAULT_OFFER_TERMS )
+    return {
+    "loan_amount":min (loan_amount ,int (monthly_income *OFFER_INCOME_MULTIPLE )),
+    "interest_rate":rate ,
+    "tenure_months":tenure 
+    }
+
+
 def generate_offer (
 application_data :Dict [str ,Any ],
 underwriting_result :Dict [str ,Any ],
@@ -41,21 +48,19 @@ risk_result :Dict [str ,Any ],
     risk_band =risk_result .get ("risk_band","HIGH")
     income =application_data .get ("monthly_income",0 )
 
-    if risk_band =="HIGH":
+    terms =offer_terms (risk_band ,application_data .get ("loan_amount",DEFAULT_OFFER_LOAN_AMOUNT ),income )
+    if terms is None :
         return {
         "offer_available":False ,
         "reason":"High risk profile"
         }
 
-    approved_amount =min (
-    application_data .get ("loan_amount",500000 ),
-    int (income *20 )
-    )
+    approved_amount =terms ["loan_amount"]
     currency =application_data .get ("currency","INR").upper ()
     currency_symbol ={"INR":"₹","USD":"$","EUR":"€","GBP":"£"}.get (currency ,currency )
 
-    base_rate =10.5 if risk_band =="LOW"else 13.5 
-    tenure =60 if risk_band =="LOW"else 36 
+    base_rate =terms ["interest_rate"]
+    tenure =terms ["tenure_months"]
 
     formatted_amount =f"{currency_symbol }{approved_amount :,.0f}"
 
@@ -67,16 +72,25 @@ risk_result :Dict [str ,Any ],
     "Tone: polite, concise, non-marketing."
     )
 
-    llm =_get_offer_llm ()
+    llm =None if inference_client else _get_offer_llm ()
 
     try :
-        text =llm (
-        prompt ,
-        max_new_tokens =60 ,
-        num_beams =2 ,
-        do_sample =False ,
-        pad_token_id =llm .tokenizer .eos_token_id 
-        )[0 ]["generated_text"]
+        if llm is None :
+            text =inference_client .call ("offer_llm",prompt ,max_new_tokens =60 ,num_beams =2 ,do_sample =False )[0 ]["generated_text"]
+        else :
+            text =accelerator .run_model (
+            "offer_llm",
+            llm ,
+            prompt ,
+            max_new_tokens =60 ,
+            num_beams =2 ,
+            do_sample =False ,
+            pad_token_id =llm .tokenizer .eos_token_id ,
+            token_counter =lambda out :(
+            len (llm .tokenizer (prompt ).input_ids ),
+            len (llm .tokenizer (out [0 ]["generated_text"]).input_ids )
+            )
+            )[0 ]["generated_text"]
     except Exception :
         text ="You are eligible for a loan. Our team will contact you shortly."
 
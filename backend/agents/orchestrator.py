@@ -14,9 +14,7 @@ from agents .underwriting_agent import underwrite_application
 from agents .risk_agent import assess_risk 
 from agents .offer_generation_agent import generate_offer 
 from agents .feedback_agent import generate_feedback 
-
-import torch 
-HF_DEVICE =0 if torch .cuda .is_available ()else -1 
+from agents .reason_codes import with_reason_text 
 
 
 router =APIRouter (prefix ="/orchestrator",tags =["Orchestrator"])
@@ -87,8 +85,8 @@ async def master_orchestrator (payload :OrchestratorRequest ):
     "emotion":emotion_result ,
     "sales":sales ,
     "verification":verification ,
-    "underwriting":underwriting ,
-    "risk":risk ,
+    "underwriting":with_reason_text (underwriting ),
+    "risk":with_reason_text (risk ),
     "offer":offer ,
     "feedback":feedback ,
     "application_data":application_data ,
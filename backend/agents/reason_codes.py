@@ -0,0 +1,107 @@
+"""
+Reason Codes
+Stable integer IDs for underwriting and risk reasons, rendered to text only for presentation
+"""
+
+from enum import IntEnum 
+from typing import Any ,Dict ,Iterable ,List ,Optional 
+
+
+class ReasonCode (IntEnum ):
+    """Values are persisted and aggregated on; never renumber, only add"""
+
+    UW_EMI_EXCESSIVE =101 
+    UW_EMI_ELEVATED =102 
+    UW_CREDIT_VERY_LOW =103 
+    UW_CREDIT_MODERATE =104 
+    UW_EMPLOYMENT_SHORT =105 
+    UW_BUSINESS_NEW =106 
+    UW_NO_ITR =107 
+    UW_BANKING_SHORT =108 
+    UW_LTI_ELEVATED =109 
+    UW_GOOD_PROFILE =110 
+
+    RISK_VERIFICATION_FAILED =201 
+    RISK_UNDERWRITING_HIGH =202 
+    RISK_UNDERWRITING_MEDIUM =203 
+    RISK_EMI_EXCESSIVE =204 
+    RISK_EMI_ELEVATED =205 
+    RISK_CREDIT_LOW =206 
+    RISK_DELINQUENCY =207 
+    RISK_URGENCY =208 
+    RISK_STRESS =209 
+    RISK_INCONSISTENT =210 
+    RISK_ADDRESS_CHANGES =211 
+    RISK_GEO =212 
+    RISK_LTI_HIGH =213 
+    RISK_LTI_ELEVATED =214 
+    RISK_STABLE =215 
+
+
+TEMPLATES ={
+ReasonCode .UW_EMI_EXCESSIVE :"Excessive EMI burden (EMI ratio: {emi_ratio:.1%} exceeds {threshold:.0%} threshold)",
+ReasonCode .UW_EMI_ELEVATED :"Elevated EMI burden (EMI ratio: {emi_ratio:.1%} exceeds {threshold:.0%} threshold)",
+ReasonCode .UW_CREDIT_VERY_LOW :"Very low credit score",
+ReasonCode .UW_CREDIT_MODERATE :"Moderate credit score",
+ReasonCode .UW_EMPLOYMENT_SHORT :"Insufficient employment history",
+ReasonCode .UW_BUSINESS_NEW :"New business (less than {vintage_threshold:g} years)",
+ReasonCode .UW_NO_ITR :"Insufficient ITR filings (below the {itr_threshold:g}-year minimum)",
+ReasonCode .UW_BANKING_SHORT :"Insufficient banking history (below the {banking_threshold:g}-month minimum)",
+ReasonCode .UW_LTI_ELEVATED :"Elevated loan-to-income ratio",
+ReasonCode .UW_GOOD_PROFILE :"Good financial profile",
+ReasonCode .RISK_VERIFICATION_FAILED :"Document verification failed",
+ReasonCode .RISK_UNDERWRITING_HIGH :"High underwriting risk",
+ReasonCode .RISK_UNDERWRITING_MEDIUM :"Underwriting marked medium risk",
+ReasonCode .RISK_EMI_EXCESSIVE :"Excessive EMI burden",
+ReasonCode .RISK_EMI_ELEVATED :"Elevated EMI burden",
+ReasonCode .RISK_CREDIT_LOW :"Low credit score",
+ReasonCode .RISK_DELINQUENCY :"Recent delinquency observed",
+ReasonCode .RISK_URGENCY :"High urgency behavior",
+ReasonCode .RISK_STRESS :"Stress signals detected",
+ReasonCode .RISK_INCONSISTENT :"Inconsistent statements detected",
+ReasonCode .RISK_ADDRESS_CHANGES :"Frequent address changes",
+ReasonCode .RISK_GEO :"Geo-risk flag active",
+ReasonCode .RISK_LTI_HIGH :"High loan-to-income ratio",
+ReasonCode .RISK_LTI_ELEVATED :"Elevated loan-to-income ratio",
+ReasonCode .RISK_STABLE :"Financial profile appears stable",
+}
+
+_STATIC_TEXT ={int (code ):text for code ,text in TEMPLATES .items ()if "{"not in text }
+
+
+def render (code :int ,params :Optional [Dict [str ,Any ]]=None )->str :
+    text =_STATIC_TEXT .get (code )
+    if text is not None :
+        return text 
+    return TEMPLATES [ReasonCode (code )].format (**(params or {}))
+
+
+def render_codes (codes :Iterable [int ],params :Optional [Dict [str ,Any ]]=None )->List [str ]:
+    return [render (code ,params )for code in codes ]
+
+
+def render_reasons (result :Optional [Dict ])->List [str ]:
+    """
+    Text reasons for an underwriting or risk result
+
+    Agent results carry reason_codes plus reason_params; placeholders built
+    elsewhere (pending underwriting, warm-up fixtures) still carry text
+    reasons and are passed through unchanged.
+    """
+    if not result :
+        return []
+    codes =result .get ("reason_codes")
+    if codes is None :
+        return list (result .get ("reasons")or [])
+    return render_codes (codes ,result .get ("reason_params"))
+
+
+def with_reason_text (result :Optional [Dict ])->Optional [Dict ]:
+    """Copy of a result with the text `reasons` filled in, for API responses and LLM prompts"""
+    if not result or "reason_codes"not in result :
+        return result 
+    return {**result ,"reasons":render_reasons (result )}
+
+
+def code_names (codes :Iterable [int ])->List [str ]:
+    return [ReasonCode (code ).name for code in codes ]
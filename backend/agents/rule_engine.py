@@ -0,0 +1,552 @@
+"""
+Credit Policy Rule Engine
+Compiles the declarative underwriting/risk rule table into Python code and reloads it when the file changes
+"""
+
+import ast 
+import copy 
+import functools 
+import logging 
+import os 
+import threading 
+import time 
+from collections import Counter ,deque 
+from typing import Any ,Dict ,List ,Optional ,Tuple 
+
+import numpy as np 
+import yaml 
+
+from agents .reason_codes import ReasonCode 
+from utils .metrics import registry 
+
+logger =logging .getLogger (__name__ )
+
+POLICY_PATH =os .environ .get ("CREDIT_POLICY_PATH",os .path .join (os .path .dirname (__file__ ),"credit_policy.yaml"))
+POLICY_RELOAD_INTERVAL =float (os .environ .get ("CREDIT_POLICY_RELOAD_INTERVAL","2"))
+
+RULE_HITS =registry .counter ("credit_policy_rule_hits","Applications matched by each credit policy rule",["ruleset","rule"])
+POLICY_RELOADS =registry .counter ("credit_policy_reloads","Credit policy load attempts",["status"])
+HIT_FLUSH_THRESHOLD =4096 
+
+LEVELS ={"APPROVED":0 ,"REVIEW":1 ,"DECLINED":2 ,"LOW":0 ,"MEDIUM":1 ,"HIGH":2 }
+
+INPUTS ={
+"underwriting":(
+"emi_ratio",
+"lti",
+"credit_score",
+"employment_years",
+"business_vintage_years",
+"itr_years_submitted",
+"bank_statement_months",
+),
+"risk":(
+"verified",
+"underwriting_risk",
+"emi_ratio",
+"lti",
+"credit_score",
+"recent_delinquency_months",
+"urgency_flag",
+"stress_detected",
+"inconsistent_statements",
+"address_changes_last_12_months",
+"geo_risk_flag",
+),
+}
+
+_COMPARISONS =(ast .Lt ,ast .LtE ,ast .Gt ,ast .GtE ,ast .Eq ,ast .NotEq )
+_ARITHMETIC =(ast .Add ,ast .Sub ,ast .Mult ,ast .Div )
+_SPLITTER =134217729.0 
+
+
+def _divide (left ,right ):
+    return left /right if right else 0.0 
+
+
+def _divide_batch (left ,right ):
+    left ,right =np .broadcast_arrays (np .asarray (left ,dtype =np .float64 ),np .asarray (right ,dtype =np .float64 ))
+    return np .divide (left ,right ,out =np .zeros (left .shape ),where =right !=0 )
+
+
+_SCALAR_NAMESPACE ={"__builtins__":{},"_div":_divide }
+_VECTOR_NAMESPACE ={"__builtins__":{},"_and":np .logical_and ,"_or":np .logical_or ,"_not":np .logical_not ,"_div":_divide_batch }
+
+
+_pending_hits =deque ()
+_flush_lock =threading .Lock ()
+
+
+class PolicyError (ValueError ):
+    pass 
+
+
+def flush_rule_hits ():
+    """
+    Fold rules fired on the scalar path into the hit counter
+
+    evaluate() only appends the fired rule ids to a deque, which is atomic
+    and far cheaper than a labelled counter update per rule; the backlog is
+    folded in at scrape time or once it grows past HIT_FLUSH_THRESHOLD.
+    """
+    with _flush_lock :
+        totals =Counter ()
+        while True :
+            try :
+                ruleset ,fired =_pending_hits .popleft ()
+            except IndexError :
+                break 
+            for rule_id in fired :
+                totals [ruleset ,rule_id ]+=1 
+        for (ruleset ,rule_id ),hits in totals .items ():
+            RULE_HITS .inc (hits ,ruleset =ruleset ,rule =rule_id )
+
+
+registry .add_collector (flush_rule_hits )
+
+
+def _inline (node :ast .expr ,names :Tuple [str ,...],constants :Dict [str ,Any ])->ast .expr :
+    if isinstance (node ,ast .BoolOp )and isinstance (node .op ,(ast .And ,ast .Or )):
+        node .values =[_inline (v ,names ,constants )for v in node .values ]
+    elif isinstance (node ,ast .UnaryOp )and isinstance (node .op ,(ast .Not ,ast .USub )):
+        node .operand =_inline (node .operand ,names ,constants )
+    elif isinstance (node ,ast .BinOp )and isinstance (node .op ,_ARITHMETIC ):
+        node .left =_inline (node .left ,names ,constants )
+        node .right =_inline (node .right ,names ,constants )
+    elif isinstance (node ,ast .Compare )and len (node .ops )==1 and isinstance (node .ops [0 ],_COMPARISONS ):
+        node .left =_inline (node .left ,names ,constants )
+        node .comparators =[_inline (node .comparators [0 ],names ,constants )]
+    elif isinstance (node ,ast .Constant )and type (node .value )in (int ,float ,bool ):
+        pass 
+    elif isinstance (node ,ast .Name )and node .id in names :
+        pass 
+    elif isinstance (node ,ast .Name )and node .id in constants :
+        return ast .copy_location (ast .Constant (constants [node .id ]),node )
+    elif isinstance (node ,ast .Name ):
+        raise PolicyError (f"Unknown name '{node .id }'")
+    else :
+        raise PolicyError (f"Unsupported expression '{ast .unparse (node )}'")
+    return node 
+
+
+def parse_condition (source :Any ,names :Tuple [str ,...],constants :Dict [str ,Any ])->ast .expr :
+    """
+    Parse a rule condition into a validated expression tree
+
+    Only comparisons, and/or/not, arithmetic, numeric literals and known
+    names are accepted; constants and level names are folded in as
+    literals so the compiled code does no lookups for them. Division is
+    compiled as a call that yields 0 for a zero divisor, on the scalar and
+    the vector path alike, so a condition cannot raise at evaluation time.
+    """
+    try :
+        tree =ast .parse (str (source ).strip (),mode ="eval")
+    except SyntaxError as e :
+        raise PolicyError (f"Invalid condition '{source }': {e .msg }")
+    return _inline (tree .body ,names ,constants )
+
+
+def _reason_code (value :Any )->int :
+    try :
+        return int (ReasonCode [str (value )])
+    except KeyError :
+        raise PolicyError (f"Unknown reason code '{value }'")
+
+
+def _identifier (value :Any ,what :str )->str :
+    value =str (value )
+    if not value .isidentifier ():
+        raise PolicyError (f"{what } '{value }' must be an identifier")
+    return value 
+
+
+class _GuardDivision (ast .NodeTransformer ):
+    """Rewrite a / b into _div(a, b)"""
+
+    def visit_BinOp (self ,node ):
+        self .generic_visit (node )
+        if isinstance (node .op ,ast .Div ):
+            return ast .Call (ast .Name ("_div",ast .Load ()),[node .left ,node .right ],[])
+        return node 
+
+
+def _scalar_source (expr :ast .expr )->str :
+    return ast .unparse (_GuardDivision ().visit (copy .deepcopy (expr )))
+
+
+class _Vectorize (_GuardDivision ):
+    """Rewrite and/or/not into element-wise NumPy calls so a condition evaluates over whole columns"""
+
+    def visit_BoolOp (self ,node ):
+        self .generic_visit (node )
+        func ="_and"if isinstance (node .op ,ast .And )else "_or"
+        return functools .reduce (
+        lambda left ,right :ast .Call (ast .Name (func ,ast .Load ()),[left ,right ],[]),
+        node .values ,
+        )
+
+    def visit_UnaryOp (self ,node ):
+        self .generic_visit (node )
+        if isinstance (node .op ,ast .Not ):
+            return ast .Call (ast .Name ("_not",ast .Load ()),[node .operand ],[])
+        return node 
+
+
+def _vector_code (condition :ast .expr ,label :str ):
+    tree =ast .Expression (_Vectorize ().visit (ast .parse (ast .unparse (condition ),mode ="eval").body ))
+    return compile (ast .fix_missing_locations (tree ),label ,"eval")
+
+
+def round_half_even (values :np .ndarray ,ndigits :int =2 )->np .ndarray :
+    """
+    Vectorized equivalent of Python's round(x, ndigits) for float64 arrays
+
+    np.round scales, rounds and unscales, so values whose scaled product
+    lands on .5 only because of float error round differently from the
+    builtin, which rounds the exact binary value. The product's rounding
+    error is recovered exactly with Dekker's two-product and used to break
+    those ties; everything else is already decided by rint.
+    """
+    scale =10.0 **ndigits 
+    scaled =values *scale 
+    high =values *_SPLITTER 
+    high =high -(high -values )
+    low =values -high 
+    error =(high *scale -scaled )+low *scale 
+
+    floor =np .floor (scaled )
+    rounded =np .rint (scaled )
+    tie =(scaled -floor )==0.5 
+    rounded =np .where (tie &(error >0 ),floor +1.0 ,rounded )
+    rounded =np .where (tie &(error <0 ),floor ,rounded )
+    return rounded /scale 
+
+
+def _mask (value ,n :int )->np .ndarray :
+    return np .broadcast_to (np .asarray (value ,dtype =bool ),(n ,))
+
+
+class Rule :
+    def __init__ (self ,spec :Dict ,names :Tuple [str ,...],constants :Dict [str ,Any ]):
+        if not isinstance (spec ,dict )or "id"not in spec or "when"not in spec :
+            raise PolicyError (f"Rule needs an id and a when clause: {spec }")
+        self .id =_identifier (spec ["id"],"Rule id")
+        self .group =spec .get ("group")
+        self .condition =parse_condition (spec ["when"],names ,constants )
+        self .decision =None 
+        if spec .get ("decision")is not None :
+            if spec ["decision"]not in ("APPROVED","REVIEW","DECLINED"):
+                raise PolicyError (f"Rule {self .id }: unknown decision {spec ['decision']}")
+            self .decision =LEVELS [spec ["decision"]]
+        self .weight =float (spec ["weight"])if spec .get ("weight")is not None else None 
+        self .reasons =[]
+        self .params ={}
+        for reason in spec .get ("reasons")or []:
+            if not isinstance (reason ,dict ):
+                reason ={"code":reason }
+            code =_reason_code (reason .get ("code"))
+            when =reason .get ("when")
+            self .reasons .append ((code ,parse_condition (when ,names ,constants )if when is not None else None ))
+            self .params [code ]=[
+            (_identifier (key ,"Reason parameter"),parse_condition (expr ,names ,constants ))
+            for key ,expr in (reason .get ("params")or {}).items ()
+            ]
+        self .vector =_vector_code (self .condition ,f"<policy:{self .id }>")
+        self .reason_vectors =[
+        (code ,_vector_code (when ,f"<policy:{self .id }:{code }>")if when is not None else None )
+        for code ,when in self .reasons 
+        ]
+        self .param_codes ={
+        code :[(key ,compile (_scalar_source (expr ),f"<policy:{self .id }:{key }>","eval"))for key ,expr in params ]
+        for code ,params in self .params .items ()
+        if params 
+        }
+
+
+class Ruleset :
+    """
+    One section of the policy compiled two ways
+
+    evaluate() runs a Python function generated from the table: groups
+    become if/elif chains and constants are literals, so a single
+    application costs about what the hand-written rules did.
+    evaluate_batch() runs the same conditions over NumPy columns with
+    element-wise masks, accumulating weights in rule order so both paths
+    produce identical floats.
+    """
+
+    def __init__ (self ,name :str ,spec :Dict ,constants :Dict [str ,Any ]):
+        if not isinstance (spec ,dict )or not isinstance (spec .get ("rules"),list ):
+            raise PolicyError (f"Section {name } needs a list of rules")
+        self .name =name 
+        names =INPUTS [name ]+(("decision",)if name =="underwriting"else ())
+        scope ={**LEVELS ,**constants }
+        self .rules =[Rule (rule ,names ,scope )for rule in spec ["rules"]]
+
+        ids =[rule .id for rule in self .rules ]
+        if len (set (ids ))!=len (ids ):
+            raise PolicyError (f"Section {name } has duplicate rule ids")
+        seen_groups =[]
+        for rule in self .rules :
+            if rule .group is not None and rule .group in seen_groups and seen_groups [-1 ]!=rule .group :
+                raise PolicyError (f"Rules in group {rule .group } must be contiguous")
+            seen_groups .append (rule .group )
+
+        default =spec .get ("default_reason")
+        self .default_id =None 
+        self .default_code =None 
+        self .default_when =None 
+        self .default_vector =None 
+        if default :
+            self .default_id =_identifier (default .get ("id","default"),"Rule id")
+            self .default_code =_reason_code (default .get ("code"))
+            if default .get ("when")is not None :
+                self .default_when =parse_condition (default ["when"],names ,scope )
+                self .default_vector =_vector_code (self .default_when ,f"<policy:{self .default_id }>")
+
+        if self .default_id in ids :
+            raise PolicyError (f"Section {name } has duplicate rule ids")
+
+        codes =[code for rule in self .rules for code ,_ in rule .reasons ]
+        if self .default_code :
+            codes .append (self .default_code )
+        if len (set (codes ))!=len (codes ):
+            raise PolicyError (f"Section {name }: each reason code may be emitted by one rule only")
+        if len (codes )>64 :
+            raise PolicyError (f"Section {name } has more than 64 reason codes")
+        self .reason_codes =tuple (codes )
+        self .reason_bits ={code :np .uint64 (1 <<i )for i ,code in enumerate (codes )}
+        self .param_codes ={code :params for rule in self .rules for code ,params in rule .param_codes .items ()}
+
+        score =spec .get ("score")or {}
+        self .score_round =int (score .get ("round",2 ))
+        self .score_cap =float (score .get ("cap",1.0 ))
+        self .bands =sorted (((LEVELS [band ],float (low ))for band ,low in (score .get ("bands")or {}).items ()),key =lambda b :-b [1 ])
+        self .default_band =LEVELS [score .get ("default_band","LOW")]
+        self .zero_floor =float (score ["zero_floor"])if score .get ("zero_floor")is not None else None 
+
+        self ._evaluate =self ._generate ()
+
+    def _generate (self ):
+        lines =["def evaluate(values):"]
+        lines +=[f"    {name } = values['{name }']"for name in INPUTS [self .name ]]
+        lines +=["    decision = 0","    score = 0.0","    reasons = []","    params = {}","    fired = []"]
+        previous =None 
+        for rule in self .rules :
+            keyword ="elif"if rule .group is not None and rule .group ==previous else "if"
+            previous =rule .group 
+            lines .append (f"    {keyword } {_scalar_source (rule .condition )}:")
+            lines .append (f"        fired.append('{rule .id }')")
+            if rule .decision is not None :
+                lines .append (f"        if decision < {rule .decision }:")
+                lines .append (f"            decision = {rule .decision }")
+            if rule .weight is not None :
+                lines .append (f"        score += {repr (rule .weight )}")
+            for code ,when in rule .reasons :
+                indent ="        "
+                if when is not None :
+                    lines .append (f"        if {_scalar_source (when )}:")
+                    indent +="    "
+                lines .append (f"{indent }reasons.append({code })")
+                for key ,expr in rule .params [code ]:
+                    lines .append (f"{indent }params[{repr (key )}] = {_scalar_source (expr )}")
+        if self .default_code :
+            condition =f" and ({_scalar_source (self .default_when )})"if self .default_when is not None else ""
+            lines .append (f"    if not reasons{condition }:")
+            lines .append (f"        fired.append('{self .default_id }')")
+            lines .append (f"        reasons.append({self .default_code })")
+        lines .append ("    return decision, score, reasons, params, fired")
+
+        namespace =dict (_SCALAR_NAMESPACE )
+        exec (compile ("\n".join (lines ),f"<policy:{self .name }>","exec"),namespace )
+        return namespace ["evaluate"]
+
+    def evaluate (self ,values :Dict [str ,Any ])->Tuple [int ,float ,List [int ],Dict [str ,Any ]]:
+        """Run the rules for one application: (decision level, raw score, reason codes, reason parameters)"""
+        decision ,score ,reasons ,params ,fired =self ._evaluate (values )
+        _pending_hits .append ((self .name ,fired ))
+        if len (_pending_hits )>HIT_FLUSH_THRESHOLD :
+            flush_rule_hits ()
+        return decision ,score ,reasons ,params 
+
+    def evaluate_batch (self ,values :Dict [str ,np .ndarray ],n :int ,count_hits :bool =True )->Tuple [np .ndarray ,np .ndarray ,np .ndarray ]:
+        """
+        Run the rules over columns of n applications: (decision levels, raw scores, reason bitmasks over reason_codes)
+
+        count_hits=False keeps hypothetical rows (what-if scenarios) out of the rule hit counters.
+        """
+        decision =np .zeros (n ,dtype =np .int8 )
+        score =np .zeros (n )
+        reasons =np .zeros (n ,dtype =np .uint64 )
+        env ={**values ,"decision":decision }
+        remaining =None 
+        previous =None 
+        for rule in self .rules :
+            fired =_mask (eval (rule .vector ,_VECTOR_NAMESPACE ,env ),n )
+            if rule .group is not None :
+                if rule .group !=previous :
+                    remaining =np .ones (n ,dtype =bool )
+                fired =fired &remaining 
+                remaining &=~fired 
+            previous =rule .group 
+            if rule .decision is not None :
+                np .maximum (decision ,rule .decision ,out =decision ,where =fired )
+            if rule .weight is not None :
+                score =score +np .where (fired ,rule .weight ,0.0 )
+            for code ,when in rule .reason_vectors :
+                mask =fired if when is None else fired &_mask (eval (when ,_VECTOR_NAMESPACE ,env ),n )
+                np .bitwise_or (reasons ,self .reason_bits [code ],out =reasons ,where =mask )
+            if count_hits :
+                self ._count (rule .id ,fired )
+        if self .default_code :
+            mask =reasons ==0 
+            if self .default_vector is not None :
+                mask &=_mask (eval (self .default_vector ,_VECTOR_NAMESPACE ,env ),n )
+            np .bitwise_or (reasons ,self .reason_bits [self .default_code ],out =reasons ,where =mask )
+            if count_hits :
+                self ._count (self .default_id ,mask )
+        return decision ,score ,reasons 
+
+    def _count (self ,rule_id :str ,fired :np .ndarray ):
+        hits =int (np .count_nonzero (fired ))
+        if hits :
+            RULE_HITS .inc (hits ,ruleset =self .name ,rule =rule_id )
+
+    def finalize_score (self ,score :float )->Tuple [float ,int ]:
+        """Round, cap and band a raw score: (score, band level)"""
+        score =min (round (score ,self .score_round ),self .score_cap )
+        band =next ((level for level ,low in self .bands if score >=low ),self .default_band )
+        if self .zero_floor is not None and band ==self .default_band and score ==0.0 :
+            score =self .zero_floor 
+        return score ,band 
+
+    def finalize_score_batch (self ,score :np .ndarray )->Tuple [np .ndarray ,np .ndarray ]:
+        score =np .minimum (round_half_even (score ,self .score_round ),self .score_cap )
+        band =np .full (len (score ),self .default_band ,dtype =np .int8 )
+        for level ,low in reversed (self .bands ):
+            band [score >=low ]=level 
+        if self .zero_floor is not None :
+            score =np .where ((band ==self .default_band )&(score ==0.0 ),self .zero_floor ,score )
+        return score ,band 
+
+    def decode (self ,mask :int )->List [int ]:
+        return [code for i ,code in enumerate (self .reason_codes )if mask &(1 <<i )]
+
+    def row_params (self ,codes :List [int ],values :Dict [str ,np .ndarray ],i :int )->Dict [str ,Any ]:
+        """Reason parameters for row i of a batch, computed only for the reasons that row carries"""
+        params ={}
+        row =None 
+        for code in codes :
+            for key ,expr in self .param_codes .get (code ,()):
+                if row is None :
+                    row ={name :column [i ].item ()for name ,column in values .items ()}
+                params [key ]=eval (expr ,_SCALAR_NAMESPACE ,row )
+        return params 
+
+    def describe (self )->List [Dict [str ,Any ]]:
+        flush_rule_hits ()
+        rules =[
+        {
+        "id":rule .id ,
+        "group":rule .group ,
+        "when":ast .unparse (rule .condition ),
+        "decision":None if rule .decision is None else ("APPROVED","REVIEW","DECLINED")[rule .decision ],
+        "weight":rule .weight ,
+        "reasons":[ReasonCode (code ).name for code ,_ in rule .reasons ],
+        "hits":RULE_HITS .value (ruleset =self .name ,rule =rule .id ),
+        }
+        for rule in self .rules 
+        ]
+        if self .default_code :
+            rules .append ({
+            "id":self .default_id ,
+            "group":None ,
+            "when":ast .unparse (self .default_when )if self .default_when is not None else "no other reason",
+            "decision":None ,
+            "weight":None ,
+            "reasons":[ReasonCode (self .default_code ).name ],
+            "hits":RULE_HITS .value (ruleset =self .name ,rule =self .default_id ),
+            })
+        return rules 
+
+
+class Policy :
+    def __init__ (self ,document :Any ):
+        if not isinstance (document ,dict ):
+            raise PolicyError ("Policy must be a mapping")
+        self .version =document .get ("version")
+        self .constants =dict (document .get ("constants")or {})
+        for name ,value in self .constants .items ():
+            if type (value )not in (int ,float )or name in LEVELS :
+                raise PolicyError (f"Constant {name } must be a number and not a level name")
+        try :
+            self .underwriting =Ruleset ("underwriting",document .get ("underwriting"),self .constants )
+            self .risk =Ruleset ("risk",document .get ("risk"),self .constants )
+        except PolicyError :
+            raise 
+        except (KeyError ,TypeError ,ValueError )as e :
+            raise PolicyError (f"Malformed policy: {e }")
+
+
+def load_policy (path :str )->Policy :
+    with open (path ,"r",encoding ="utf-8")as f :
+        return Policy (yaml .safe_load (f ))
+
+
+class PolicyStore :
+    """
+    Holds the compiled policy and swaps in a new one when the file changes
+
+    The file's mtime is checked at most once per reload interval, so the
+    per-application cost is a clock read. A table that fails to load or
+    compile is logged and counted, and the previous policy stays in force.
+    """
+
+    def __init__ (self ,path :str =POLICY_PATH ,reload_interval :float =POLICY_RELOAD_INTERVAL ):
+        self .path =path 
+        self .reload_interval =reload_interval 
+        self ._lock =threading .Lock ()
+        self ._policy :Optional [Policy ]=None 
+        self ._mtime =None 
+        self ._checked =0.0 
+        self .loaded_at =None 
+        self .last_error =None 
+
+    def current (self )->Policy :
+        policy =self ._policy 
+        if policy is not None and (self .reload_interval <=0 or time .monotonic ()-self ._checked <self .reload_interval ):
+            return policy 
+        with self ._lock :
+            if self ._policy is None or time .monotonic ()-self ._checked >=self .reload_interval :
+                self ._refresh ()
+        return self ._policy 
+
+    def reload (self )->Policy :
+        with self ._lock :
+            self ._mtime =None 
+            self ._refresh ()
+        return self ._policy 
+
+    def _refresh (self ):
+        self ._checked =time .monotonic ()
+        try :
+            mtime =os .stat (self .path ).st_mtime_ns 
+            if mtime ==self ._mtime :
+                return 
+            policy =load_policy (self .path )
+        except (OSError ,yaml .YAMLError ,PolicyError )as e :
+            POLICY_RELOADS .inc (status ="error")
+            self .last_error =str (e )
+            if self ._policy is None :
+                raise 
+            logger .warning (f"⚠ Credit policy reload failed, keeping version {self ._policy .version }: {e }")
+            return 
+        self ._policy =policy 
+        self ._mtime =mtime 
+        self .loaded_at =time .time ()
+        self .last_error =None 
+        POLICY_RELOADS .inc (status ="ok")
+        logger .info (f"✓ Credit policy version {policy .version } loaded from {self .path }")
+
+
+policy_store =PolicyStore ()
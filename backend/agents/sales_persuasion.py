@@ -1,16 +1,11 @@
 from fastapi import APIRouter 
 from pydantic import BaseModel 
-from transformers import pipeline 
 from typing import Dict ,Any ,Union ,Optional 
 
 from ml .infer_intent import predict_intent 
 from ml .infer_emotion import analyze_emotion 
-from ml .gpu_accelerated_inference import accelerator 
-
-import torch 
-from transformers import pipeline 
-
-HF_DEVICE =0 if torch .cuda .is_available ()else -1 
+from ml .gpu_accelerated_inference import accelerator ,hf_device 
+from ml .inference_client import inference_client 
 
 
 router =APIRouter (prefix ="/agent/sales",tags =["Sales & Persuasion"])
@@ -22,11 +17,13 @@ def get_sentiment_analyzer ():
     global _sentiment_analyzer 
     if _sentiment_analyzer is None :
         try :
-            _sentiment_analyzer =pipeline (
+            from transformers import pipeline 
+
+            _sentiment_analyzer =accelerator .load_model ("sentiment",lambda :pipeline (
             "sentiment-analysis",
             model ="distilbert-base-uncased-finetuned-sst-2-english",
-            device =HF_DEVICE ,
-            )
+            device =hf_device (),
+            ))
         except Exception as e :
             print (f"Warning: Could not load sentiment analyzer: {e }")
             _sentiment_analyzer ="unavailable"
@@ -122,10 +119,14 @@ payload :Union [SalesAnalyzeRequest ,Dict [str ,Any ]]
     sentiment_score =0.0 
 
     try :
-        analyzer =get_sentiment_analyzer ()
-        if analyzer :
-
-            s_out =accelerator .predict_transformer_model (analyzer ,text ,use_npu =False )
+        s_out =None 
+        if inference_client :
+            s_out =inference_client .call ("sentiment",text )
+        else :
+            analyzer =get_sentiment_analyzer ()
+            if analyzer :
+                s_out =accelerator .predict_transformer_model (analyzer ,text ,use_npu =False ,model_name ="sentiment")
+        if s_out :
             if isinstance (s_out ,list )and s_out :
                 s =s_out [0 ]
                 if isinstance (s ,dict ):
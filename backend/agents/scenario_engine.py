@@ -0,0 +1,258 @@
+"""
+What-if Scenario Engine
+Evaluates a grid of variations on one application in a single batch pass and finds the nearest decision flip
+"""
+
+import math 
+import os 
+from typing import Any ,Dict ,Optional ,Tuple 
+
+import numpy as np 
+
+from agents .batch_engine import (
+BOOL_COLUMNS ,
+COLUMNS ,
+DECISIONS ,
+INTEGER_COLUMNS ,
+RISK_LEVELS ,
+evaluate_batch ,
+risk_record ,
+underwriting_record ,
+)
+from agents .offer_generation_agent import (
+DEFAULT_OFFER_LOAN_AMOUNT ,
+DEFAULT_OFFER_TERMS ,
+NO_OFFER_BANDS ,
+OFFER_INCOME_MULTIPLE ,
+OFFER_TERMS ,
+)
+from agents .rule_engine import Policy ,policy_store 
+
+
+MAX_SCENARIOS =int (os .getenv ("WHAT_IF_MAX_SCENARIOS","250000"))
+DEFAULT_AXIS_STEPS =11 
+
+GRID_FIELDS =tuple (name for name in COLUMNS if name not in BOOL_COLUMNS )
+BEHAVIORAL_FLAGS =("stress_detected","inconsistent_statements")
+
+_OFFERED =np .array ([level not in NO_OFFER_BANDS for level in RISK_LEVELS ])
+_RATES =np .array ([OFFER_TERMS .get (level ,DEFAULT_OFFER_TERMS )[0 ]for level in RISK_LEVELS ])
+_TENURES =np .array ([OFFER_TERMS .get (level ,DEFAULT_OFFER_TERMS )[1 ]for level in RISK_LEVELS ])
+
+
+def _axis (name :str ,spec :Any )->np .ndarray :
+    """A grid axis from a list of values or {"min", "max", "steps"}"""
+    if isinstance (spec ,dict ):
+        try :
+            values =np .linspace (float (spec ["min"]),float (spec ["max"]),int (spec .get ("steps",DEFAULT_AXIS_STEPS )))
+        except (KeyError ,TypeError ,ValueError ):
+            raise ValueError (f"Grid for {name } needs numeric min and max and an integer steps")
+    else :
+        try :
+            values =np .asarray (spec ,dtype =np .float64 )
+        except (TypeError ,ValueError ):
+            raise ValueError (f"Grid for {name } must be a list of numbers")
+    if values .ndim !=1 or not len (values )or not np .isfinite (values ).all ():
+        raise ValueError (f"Grid for {name } must be a non-empty list of finite numbers")
+    return np .trunc (values )if name in INTEGER_COLUMNS else values 
+
+
+def base_table (application :Dict [str ,Any ],verified :bool =True )->Dict [str ,list ]:
+    """
+    One-row batch table for an application in the shape the agents take
+
+    Fields the engine does not use (names, currency, documents) are ignored;
+    behavioural flags may be flat or nested under behavioral_flags like the
+    orchestrator sends them.
+    """
+    table ={name :[application [name ]]for name in COLUMNS if name in application }
+    flags =application .get ("behavioral_flags")
+    if isinstance (flags ,dict ):
+        for name in BEHAVIORAL_FLAGS :
+            if name in flags and name not in table :
+                table [name ]=[flags [name ]]
+    table .setdefault ("verified",[verified ])
+    return table 
+
+
+def _base_value (base :Dict [str ,list ],name :str )->float :
+    """The base application's value for a grid field, read the way the batch engine reads it"""
+    value =base [name ][0 ]if name in base else None 
+    try :
+        value =0.0 if value is None else float (value )
+    except (TypeError ,ValueError ):
+        raise ValueError (f"{name } must be a number")
+    if math .isnan (value ):
+        value =0.0 
+    return float (math .trunc (value ))if name in INTEGER_COLUMNS else value 
+
+
+def expand_grid (application :Dict [str ,Any ],grid :Dict [str ,Any ],verified :bool =True )->Tuple [Dict [str ,np .ndarray ],Dict [str ,np .ndarray ]]:
+    """
+    Cartesian product of the grid over the base application
+
+    Each axis is sorted and includes the base value, so the grid always holds
+    the scenarios that change a single field. Row 0 is the unchanged
+    application; rows 1.. follow the grid in row-major order of the returned
+    axes. Returns (table, axes).
+    """
+    if not grid :
+        raise ValueError ("Grid must vary at least one field")
+    unknown =set (grid )-set (GRID_FIELDS )
+    if unknown :
+        raise ValueError (f"Cannot vary {', '.join (sorted (unknown ))}; grid fields are {', '.join (GRID_FIELDS )}")
+
+    base =base_table (application ,verified )
+    starts ={name :_base_value (base ,name )for name in grid }
+    axes ={name :np .union1d (_axis (name ,spec ),[starts [name ]])for name ,spec in grid .items ()}
+    n =math .prod (len (values )for values in axes .values ())
+    if n >MAX_SCENARIOS :
+        raise ValueError (f"Grid expands to {n } scenarios; the limit is {MAX_SCENARIOS }")
+
+    table ={name :np .repeat (np .asarray (values ),n +1 )for name ,values in base .items ()}
+    for name ,values in zip (axes ,np .meshgrid (*axes .values (),indexing ="ij")):
+        table [name ]=np .concatenate (([starts [name ]],values .ravel ()))
+    return table ,axes 
+
+
+def offer_batch (result :Dict [str ,Any ],requested :Optional [np .ndarray ]=None )->Dict [str ,np .ndarray ]:
+    """
+    Vectorized offer terms behind the orchestrator's offer gate (verified, APPROVED, band that gets an offer)
+
+    Scenarios are priced the way the orchestrator prices a live application,
+    through generate_offer's offer_terms, so rate and tenure follow the risk
+    band. ml.recommend_offer is not used: nothing outside the predictor
+    benchmark calls it, and pricing with it here would quote terms no real
+    application gets.
+
+    requested is the loan amount the offer is capped at, the loan_amount
+    column by default; pass it when the application has no loan_amount so
+    the cap matches generate_offer's default instead of the zero the
+    underwriting columns hold.
+    """
+    columns =result ["columns"]
+    band =result ["risk"]["risk_band"]
+    available =(
+    columns ["verified"]
+    &(result ["underwriting"]["decision"]==DECISIONS .index ("APPROVED"))
+    &_OFFERED [band ]
+    )
+    requested =columns ["loan_amount"]if requested is None else requested 
+    amount =np .minimum (requested ,np .trunc (columns ["monthly_income"]*OFFER_INCOME_MULTIPLE ))
+    return {
+    "offer_available":available ,
+    "loan_amount":amount ,
+    "interest_rate":_RATES [band ],
+    "tenure_months":_TENURES [band ],
+    }
+
+
+def _offer_record (offers :Dict [str ,np .ndarray ],i :int )->Dict [str ,Any ]:
+    if not offers ["offer_available"][i ]:
+        return {"offer_available":False }
+    return {
+    "offer_available":True ,
+    "loan_amount":float (offers ["loan_amount"][i ]),
+    "interest_rate":float (offers ["interest_rate"][i ]),
+    "tenure_months":int (offers ["tenure_months"][i ]),
+    }
+
+
+def _nullable (values :np .ndarray ,present :np .ndarray )->list :
+    out =values .tolist ()
+    for i in np .flatnonzero (~present ):
+        out [i ]=None 
+    return out 
+
+
+def nearest_flip (result :Dict [str ,Any ],axes :Dict [str ,np .ndarray ])->Optional [int ]:
+    """
+    Row index of the smallest change to the base application that flips its decision
+
+    A REVIEW or DECLINED application looks for any better decision; an
+    APPROVED one looks for the first worse decision, i.e. its headroom. The
+    distance is the sum of relative changes per varied field, scaled by the
+    base value (or the axis span when the base is zero), so one field moving
+    10% beats two fields moving 10% each.
+    """
+    columns =result ["columns"]
+    decision =result ["underwriting"]["decision"]
+    baseline =decision [0 ]
+    candidates =decision <baseline if baseline >0 else decision >baseline 
+    candidates [0 ]=False 
+    if not candidates .any ():
+        return None 
+
+    distance =np .zeros (len (decision ))
+    for name ,values in axes .items ():
+        delta =np .abs (columns [name ]-columns [name ][0 ])
+        scale =abs (columns [name ][0 ])or float (np .ptp (values ))or 1.0 
+        distance +=delta /scale 
+    distance [~candidates ]=np .inf 
+    return int (np .argmin (distance ))
+
+
+def _scenario (result :Dict [str ,Any ],offers :Dict [str ,np .ndarray ],i :int )->Dict [str ,Any ]:
+    return {
+    "underwriting":underwriting_record (result ,i ),
+    "risk":risk_record (result ,i ),
+    "offer":_offer_record (offers ,i ),
+    }
+
+
+def evaluate_scenarios (
+application :Dict [str ,Any ],
+grid :Dict [str ,Any ],
+verified :bool =True ,
+return_surface :bool =True ,
+policy :Optional [Policy ]=None ,
+)->Dict [str ,Any ]:
+    policy =policy or policy_store .current ()
+    table ,axes =expand_grid (application ,grid ,verified )
+    result =evaluate_batch (table ,policy ,count_hits =False )
+    requested =None 
+    if "loan_amount"not in application and "loan_amount"not in grid :
+        requested =np .full (len (result ["underwriting"]["decision"]),float (DEFAULT_OFFER_LOAN_AMOUNT ))
+    offers =offer_batch (result ,requested )
+    columns =result ["columns"]
+    decision =result ["underwriting"]["decision"]
+
+    response ={
+    "policy_version":policy .version ,
+    "scenarios":len (decision )-1 ,
+    "axes":{name :values .tolist ()for name ,values in axes .items ()},
+    "baseline":{"inputs":{name :float (columns [name ][0 ])for name in axes },**_scenario (result ,offers ,0 )},
+    "decisions":{label :int (count )for label ,count in zip (DECISIONS ,np .bincount (decision [1 :],minlength =3 ))},
+    "flip":None ,
+    }
+
+    flip =nearest_flip (result ,axes )
+    if flip is not None :
+        response ["flip"]={
+        "scenario":flip -1 ,
+        "changes":{
+        name :{
+        "from":float (columns [name ][0 ]),
+        "to":float (columns [name ][flip ]),
+        "delta":float (columns [name ][flip ]-columns [name ][0 ]),
+        }
+        for name in axes 
+        if columns [name ][flip ]!=columns [name ][0 ]
+        },
+        **_scenario (result ,offers ,flip ),
+        }
+
+    if return_surface :
+        band =result ["risk"]["risk_band"][1 :]
+        available =offers ["offer_available"][1 :]
+        response ["surface"]={
+        "shape":[len (values )for values in axes .values ()],
+        "decision":np .array (DECISIONS )[decision [1 :]].tolist (),
+        "risk_band":np .array (RISK_LEVELS )[band ].tolist (),
+        "risk_score":result ["risk"]["risk_score"][1 :].tolist (),
+        "offer_available":available .tolist (),
+        "offer_amount":_nullable (offers ["loan_amount"][1 :],available ),
+        "interest_rate":_nullable (offers ["interest_rate"][1 :],available ),
+        "tenure_months":_nullable (offers ["tenure_months"][1 :],available ),
+        }
+    return response 
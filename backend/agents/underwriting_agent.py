@@ -1,8 +1,10 @@
 from typing import Dict 
 
+from agents .rule_engine import policy_store 
 
-EMI_THRESHOLD_AUTO_REVIEW =0.40 
-EMI_THRESHOLD_AUTO_REJECT =0.60 
+
+DECISIONS =("APPROVED","REVIEW","DECLINED")
+RISK_LEVELS =("LOW","MEDIUM","HIGH")
 
 
 def underwrite_application (application_data :Dict )->Dict :
@@ -17,62 +19,22 @@ def underwrite_application (application_data :Dict )->Dict :
     emi_ratio =existing_emi /income if income >0 else 1.0 
     lti =application_data .get ("loan_amount",0 )/(income *12 )if income >0 else 1.0 
 
-    reasons =[]
-    decision ="APPROVED"
-    risk ="LOW"
-
-
-    if emi_ratio >EMI_THRESHOLD_AUTO_REJECT :
-        decision ="DECLINED"
-        risk ="HIGH"
-        reasons .append (f"Excessive EMI burden (EMI ratio: {emi_ratio :.1%} exceeds {EMI_THRESHOLD_AUTO_REJECT :.0%} threshold)")
-    elif emi_ratio >EMI_THRESHOLD_AUTO_REVIEW :
-        decision ="REVIEW"
-        risk ="MEDIUM"
-        reasons .append (f"Elevated EMI burden (EMI ratio: {emi_ratio :.1%} exceeds {EMI_THRESHOLD_AUTO_REVIEW :.0%} threshold)")
-
-
-    if credit_score <600 :
-        decision ="DECLINED"
-        risk ="HIGH"
-        reasons .append ("Very low credit score")
-    elif credit_score <700 and decision !="DECLINED":
-        if decision =="APPROVED":
-            decision ="REVIEW"
-            risk ="MEDIUM"
-        reasons .append ("Moderate credit score")
-
-
-    if employment_years <1 and decision !="DECLINED":
-        if decision =="APPROVED":
-            decision ="REVIEW"
-            risk ="MEDIUM"
-        reasons .append ("Insufficient employment history")
-    elif business_vintage <2 or itr_years <1 or bank_stmt_months <6 :
-        if decision =="APPROVED":
-            decision ="REVIEW"
-            risk ="MEDIUM"
-        if business_vintage <2 :
-            reasons .append ("New business (less than 2 years)")
-        if itr_years <1 :
-            reasons .append ("No ITR filed")
-        if bank_stmt_months <6 :
-            reasons .append ("Insufficient banking history")
-
-
-    if lti >0.5 and decision =="APPROVED":
-        decision ="REVIEW"
-        risk ="MEDIUM"
-        reasons .append ("Elevated loan-to-income ratio")
-
-
-    if decision =="APPROVED"and not reasons :
-        reasons .append ("Good financial profile")
+    policy =policy_store .current ()
+    decision ,_ ,reason_codes ,reason_params =policy .underwriting .evaluate ({
+    "emi_ratio":emi_ratio ,
+    "lti":lti ,
+    "credit_score":credit_score ,
+    "employment_years":employment_years ,
+    "business_vintage_years":business_vintage ,
+    "itr_years_submitted":itr_years ,
+    "bank_statement_months":bank_stmt_months ,
+    })
 
     return {
-    "decision":decision ,
-    "risk":risk ,
+    "decision":DECISIONS [decision ],
+    "risk":RISK_LEVELS [decision ],
     "emi_ratio":round (emi_ratio ,2 ),
     "credit_score":credit_score ,
-    "reasons":reasons 
+    "reason_codes":reason_codes ,
+    "reason_params":reason_params 
     }
@@ -1,15 +1,12 @@
 import re 
 from typing import Dict ,Optional ,Any 
-from transformers import pipeline 
 import logging 
 
-import torch 
-from transformers import pipeline 
+from ml .gpu_accelerated_inference import accelerator ,hf_device 
+from ml .inference_client import inference_client 
 
 logger =logging .getLogger (__name__ )
 
-HF_DEVICE =0 if torch .cuda .is_available ()else -1 
-
 
 _name_checker :Optional [Any ]=None 
 
@@ -17,11 +14,13 @@ def get_name_checker ():
     global _name_checker 
     if _name_checker is None :
         try :
-            _name_checker =pipeline (
+            from transformers import pipeline 
+
+            _name_checker =accelerator .load_model ("name_checker",lambda :pipeline (
             "zero-shot-classification",
             model ="facebook/bart-large-mnli",
-            device =HF_DEVICE ,
-            )
+            device =hf_device (),
+            ))
             logger .info ("✓ Name checker pipeline loaded")
         except Exception as e :
             logger .warning (f"⚠ Name checker unavailable: {e }")
@@ -67,15 +66,20 @@ def verify_documents (payload :Dict )->Dict :
     if name :
         prompt =f"Name on documents: {name }"
         try :
-            checker =get_name_checker ()
-            if checker :
-                output =checker (
-                prompt ,
-                candidate_labels =["valid person name","random text"],
-                )
+            if inference_client :
+                output =inference_client .call ("zero_shot",prompt ,candidate_labels =["valid person name","random text"])
             else :
-
-                return success (0.8 )
+                checker =get_name_checker ()
+                if checker :
+                    output =accelerator .run_model (
+                    "name_checker",
+                    checker ,
+                    prompt ,
+                    candidate_labels =["valid person name","random text"],
+                    )
+                else :
+
+                    return success (0.8 )
         except Exception as e :
             logger .warning (f"Name verification failed: {e }")
             return success (0.8 )
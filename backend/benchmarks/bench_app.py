@@ -0,0 +1,296 @@
+"""
+App Load-Test Benchmark
+Boots main.app in-process on SQLite with deterministic stand-in models in place
+of the HF pipelines and mistral_think, drives the main endpoints at a fixed
+concurrency and reports throughput and latency percentiles as JSON
+"""
+
+import argparse 
+import asyncio 
+import hashlib 
+import json 
+import os 
+import platform 
+import subprocess 
+import sys 
+import tempfile 
+import time 
+import types 
+from pathlib import Path 
+from typing import Any ,Callable ,Dict ,List 
+
+sys .path .insert (0 ,str (Path (__file__ ).parent .parent ))
+
+SCENARIOS =("orchestrator","risk","login","pdf_approval","pdf_statistics")
+
+ORCHESTRATOR_PAYLOAD ={
+"message":"I need a personal loan of 5 lakh for home renovation",
+"customer_id":"CUST-BENCH",
+"documents":{"aadhaar":"234567890123","pan":"ABCDE1234F","name":"Bench User"},
+"application_data":{
+"name":"Bench User",
+"monthly_income":90000 ,
+"loan_amount":500000 ,
+"credit_score":760 ,
+"existing_emi":5000 ,
+"tenure_months":36 ,
+"employment_type":"salaried",
+"delinquency_12m":0 ,
+"num_hard_inquiries":1 ,
+},
+}
+
+RISK_PAYLOAD ={
+"credit_score":720 ,
+"delinquency_12m":0 ,
+"outstanding_debt":150000 ,
+"income":900000 ,
+"loan_amount":500000 ,
+"debt_to_income":0.3 ,
+"age":35 ,
+"num_hard_inquiries":1 ,
+"employment_type":"salaried",
+}
+
+APPROVAL_PAYLOAD ={
+"customer":{"name":"Bench User","id":"CUST-BENCH","monthly_income":90000 ,"credit_score":760 },
+"application":{"id":"APP-BENCH","loan_amount":500000 ,"application_date":"2025-02-05"},
+"underwriting":{"decision":"APPROVED","emi_ratio":0.3 ,"decision_confidence":0.9 },
+"risk":{"risk_band":"LOW","risk_score":0.15 },
+"offer":{"approved_amount":500000 ,"interest_rate":9.5 ,"tenure":36 ,"emi":16000 },
+}
+
+
+class _StubTokens :
+    def __init__ (self ,text :str ):
+        self .input_ids =list (range (len (str (text ).split ())+1 ))
+
+
+class _StubTokenizer :
+    eos_token_id =1 
+    pad_token_id =1 
+
+    def __call__ (self ,text ,**kwargs ):
+        return _StubTokens (text )
+
+
+class _StubPipeline :
+    """Deterministic, dependency-free stand-in for a transformers pipeline"""
+
+    def __init__ (self ,task :str ,model :str ="",latency :float =0.0 ,**kwargs ):
+        self .task =task 
+        self .model_name =model 
+        self .latency =latency 
+        self .top_k =kwargs .get ("top_k",1 )
+        self .tokenizer =_StubTokenizer ()
+        self .model =type ("StubModel",(),{"config":type ("StubConfig",(),{"eos_token_id":1 ,"pad_token_id":1 })()})()
+
+    def _score (self ,text :str )->float :
+        digest =hashlib .sha256 (f"{self .model_name }:{text }".encode ()).digest ()
+        return 0.55 +(digest [0 ]/255 )*0.4 
+
+    def __call__ (self ,text ,**kwargs ):
+        if self .latency :
+            time .sleep (self .latency )
+        score =self ._score (str (text ))
+        if self .task =="zero-shot-classification":
+            labels =kwargs .get ("candidate_labels")or ["label"]
+            return {"sequence":text ,"labels":list (labels ),"scores":[score ]+[(1 -score )/max (1 ,len (labels )-1 )]*(len (labels )-1 )}
+        if self .task =="text2text-generation":
+            return [{"generated_text":"Thank you for your application. We will get back to you with the next steps shortly."}]
+        if self .task =="sentiment-analysis":
+            return [{"label":"POSITIVE","score":score }]
+        if "emotion"in self .model_name :
+            labels =["joy","neutral","sadness","fear","anger","surprise","disgust"]
+            return [[{"label":label ,"score":score if i ==0 else (1 -score )/6 }for i ,label in enumerate (labels )]]
+        return [{"label":"LABEL_1","score":score }]
+
+
+def install_stub_models (latency_ms :float ):
+    """
+    Put the stand-ins in place before any app module is imported
+
+    transformers is replaced by a sys.modules shim and the device probe is
+    pre-answered as CPU, so neither torch nor transformers is imported and
+    the benchmark runs without the ML stack installed.
+    """
+    latency =latency_ms /1000.0 
+
+    def pipeline (task ,model ="",**kwargs ):
+        return _StubPipeline (task ,model ,latency ,**kwargs )
+
+    shim =types .ModuleType ("transformers")
+    shim .pipeline =pipeline 
+    sys .modules ["transformers"]=shim 
+
+    import ml .gpu_accelerated_inference as inference 
+
+    inference .hf_device =lambda :-1 
+    inference .accelerator ._device =types .SimpleNamespace (type ="cpu")
+    inference .accelerator ._devices_ready =True 
+
+    def mistral_think (context :str )->dict :
+        if latency :
+            time .sleep (latency *4 )
+        return {
+        "reply":"Thanks for the details. Based on the checks so far you can proceed with the application.",
+        "actions":["apply_loan","check_eligibility"],
+        "confidence":0.8 ,
+        }
+    return mistral_think 
+
+
+def percentile (sorted_values :List [float ],pct :float )->float :
+    if not sorted_values :
+        return 0.0 
+    rank =max (0 ,min (len (sorted_values )-1 ,int (round (pct /100.0 *len (sorted_values )+0.5 ))-1 ))
+    return sorted_values [rank ]
+
+
+async def run_scenario (client ,request_fn :Callable ,total :int ,concurrency :int ,warmup :int )->Dict [str ,Any ]:
+    for _ in range (warmup ):
+        await request_fn (client )
+
+    semaphore =asyncio .Semaphore (concurrency )
+    latencies :List [float ]=[]
+    statuses :Dict [int ,int ]={}
+
+    async def one ():
+        async with semaphore :
+            start =time .perf_counter ()
+            response =await request_fn (client )
+            latencies .append ((time .perf_counter ()-start )*1000 )
+            statuses [response .status_code ]=statuses .get (response .status_code ,0 )+1 
+
+    started =time .perf_counter ()
+    await asyncio .gather (*(one ()for _ in range (total )))
+    elapsed =time .perf_counter ()-started 
+
+    latencies .sort ()
+    return {
+    "requests":total ,
+    "concurrency":concurrency ,
+    "throughput_rps":round (total /elapsed ,2 ),
+    "mean_ms":round (sum (latencies )/len (latencies ),3 ),
+    "p50_ms":round (percentile (latencies ,50 ),3 ),
+    "p95_ms":round (percentile (latencies ,95 ),3 ),
+    "p99_ms":round (percentile (latencies ,99 ),3 ),
+    "max_ms":round (latencies [-1 ],3 ),
+    "statuses":{str (k ):v for k ,v in sorted (statuses .items ())},
+    "errors":sum (v for k ,v in statuses .items ()if k >=400 ),
+    "rejected":statuses .get (503 ,0 ),
+    }
+
+
+def _git_commit ()->str :
+    try :
+        return subprocess .check_output (["git","rev-parse","--short","HEAD"],cwd =Path (__file__ ).parent ,text =True ).strip ()
+    except Exception :
+        return "unknown"
+
+
+async def run (args )->Dict [str ,Any ]:
+    import httpx 
+    import main 
+    import llm .mistral_orchestrator 
+    import routers .orchestrator 
+    from database .models import init_database 
+
+    main .get_device_manager =lambda :None 
+    llm .mistral_orchestrator .mistral_think =args .mistral_think 
+    routers .orchestrator .mistral_think =args .mistral_think 
+    init_database ()
+
+    credentials ={"username_or_email":"bench_user","password":"bench-password-123"}
+
+    async def orchestrator (client ):
+        return await client .post ("/orchestrator/process",json =ORCHESTRATOR_PAYLOAD )
+
+    async def risk (client ):
+        return await client .post ("/agent/risk/score",json =RISK_PAYLOAD )
+
+    async def login (client ):
+        return await client .post ("/auth/login",json =credentials )
+
+    async def pdf_approval (client ):
+        return await client .post ("/pdf-reports/application-approval-pdf",json =APPROVAL_PAYLOAD )
+
+    async def pdf_statistics (client ):
+        return await client .get ("/pdf-reports/sample-statistics-pdf")
+
+    request_fns ={
+    "orchestrator":orchestrator ,
+    "risk":risk ,
+    "login":login ,
+    "pdf_approval":pdf_approval ,
+    "pdf_statistics":pdf_statistics ,
+    }
+
+    results ={}
+    async with main .app .router .lifespan_context (main .app ):
+        transport =httpx .ASGITransport (app =main .app )
+        async with httpx .AsyncClient (transport =transport ,base_url ="http://bench",timeout =120 )as client :
+            await client .post ("/auth/register",json ={
+            "username":"bench_user",
+            "name":"Bench User",
+            "email":"bench@example.com",
+            "password":credentials ["password"],
+            })
+            while (await client .get ("/ready")).status_code !=200 :
+                await asyncio .sleep (0.05 )
+            for name in args .scenarios :
+                results [name ]=await run_scenario (client ,request_fns [name ],args .requests ,args .concurrency ,args .warmup )
+                print (f"{name }: {results [name ]['throughput_rps']} req/s, p99 {results [name ]['p99_ms']} ms",file =sys .stderr )
+
+    return {
+    "commit":_git_commit (),
+    "python":platform .python_version (),
+    "config":{
+    "requests":args .requests ,
+    "concurrency":args .concurrency ,
+    "warmup":args .warmup ,
+    "model_latency_ms":args .model_latency_ms ,
+    "pdf_cache":args .pdf_cache ,
+    "pdf_queue_limit":args .pdf_queue_limit ,
+    },
+    "scenarios":results ,
+    "ml_stack_imported":sorted (name for name in ("torch","transformers")if type (sys .modules .get (name ))is types .ModuleType and getattr (sys .modules [name ],"__file__",None )),
+    }
+
+
+def main ():
+    parser =argparse .ArgumentParser (description =__doc__ )
+    parser .add_argument ("--scenarios",nargs ="+",choices =SCENARIOS ,default =list (SCENARIOS ))
+    parser .add_argument ("--requests",type =int ,default =200 ,help ="Measured requests per scenario")
+    parser .add_argument ("--concurrency",type =int ,default =16 )
+    parser .add_argument ("--warmup",type =int ,default =5 )
+    parser .add_argument ("--model-latency-ms",type =float ,default =0.0 ,help ="Simulated compute per stand-in model call")
+    parser .add_argument ("--pdf-cache",action ="store_true",help ="Leave the PDF report cache enabled")
+    parser .add_argument ("--pdf-queue-limit",type =int ,help ="Override PDF_RENDER_QUEUE_LIMIT (admission control returns 503 beyond it)")
+    parser .add_argument ("--output",help ="Also write the JSON report to this file")
+    parser .add_argument ("--fail-on-error",action ="store_true",help ="Exit 1 if any request returned >= 400")
+    args =parser .parse_args ()
+
+    workdir =tempfile .mkdtemp (prefix ="bench_app_")
+    os .environ ["DATABASE_URL"]=f"sqlite:///{os .path .join (workdir ,'bench.db')}"
+    os .environ ["REPORTS_DIR"]=os .path .join (workdir ,"reports")
+    os .environ ["PDF_CACHE_DIR"]=os .path .join (workdir ,"pdf_cache")
+    os .environ ["PDF_JOB_RESULTS_DIR"]=os .path .join (workdir ,"jobs")
+    os .environ ["PDF_CACHE_ENABLED"]="1"if args .pdf_cache else "0"
+    os .environ .setdefault ("AUTH_SESSION_SWEEP_INTERVAL","0")
+    if args .pdf_queue_limit is not None :
+        os .environ ["PDF_RENDER_QUEUE_LIMIT"]=str (args .pdf_queue_limit )
+
+    args .mistral_think =install_stub_models (args .model_latency_ms )
+    report =asyncio .run (run (args ))
+
+    text =json .dumps (report ,indent =2 )
+    print (text )
+    if args .output :
+        Path (args .output ).write_text (text )
+    if args .fail_on_error and any (s ["errors"]for s in report ["scenarios"].values ()):
+        sys .exit (1 )
+
+
+if __name__ =="__main__":
+    main ()
@@ -0,0 +1,127 @@
+"""
+Auth Lookup Benchmark
+Compares the single OR-query user lookup against the previous two-query lookup
+on a SQLite database seeded with a large users table
+"""
+
+import argparse 
+import json 
+import os 
+import random 
+import sys 
+import tempfile 
+import time 
+from datetime import datetime 
+from pathlib import Path 
+
+sys .path .insert (0 ,str (Path (__file__ ).parent .parent ))
+
+from sqlalchemy import create_engine ,event 
+from sqlalchemy .orm import sessionmaker 
+
+from database .models import Base ,User 
+from routers .auth import _find_user 
+
+
+def _find_user_two_queries (db ,username_or_email ):
+    u =db .query (User ).filter (User .username ==username_or_email ).first ()
+    if not u :
+        u =db .query (User ).filter (User .email ==username_or_email ).first ()
+    return u 
+
+
+def seed_users (engine ,count :int ,start_at :int =0 ,chunk_size :int =50_000 ):
+    """Insert synthetic users start_at..count-1 with Core executemany in chunks"""
+    now =datetime .utcnow ()
+    table =User .__table__ 
+    with engine .begin ()as conn :
+        for start in range (start_at ,count ,chunk_size ):
+            rows =[
+            {
+            "user_id":f"U-{i :010d}",
+            "username":f"user{i }",
+            "name":f"User {i }",
+            "email":f"user{i }@example.com",
+            "password_hash":"x"*64 ,
+            "password_salt":"y"*32 ,
+            "is_active":True ,
+            "created_at":now ,
+            "updated_at":now ,
+            }
+            for i in range (start ,min (start +chunk_size ,count ))
+            ]
+            conn .execute (table .insert (),rows )
+
+
+def run_lookups (session_factory ,lookup_fn ,identifiers ,query_counter ):
+    db =session_factory ()
+    try :
+        query_counter ["n"]=0 
+        latencies =[]
+        for ident in identifiers :
+            start =time .perf_counter ()
+            lookup_fn (db ,ident )
+            latencies .append (time .perf_counter ()-start )
+            db .expunge_all ()
+        latencies .sort ()
+        return {
+        "lookups":len (identifiers ),
+        "queries_per_lookup":round (query_counter ["n"]/len (identifiers ),2 ),
+        "mean_us":round (sum (latencies )/len (latencies )*1e6 ,1 ),
+        "p50_us":round (latencies [len (latencies )//2 ]*1e6 ,1 ),
+        "p99_us":round (latencies [int (len (latencies )*0.99 )]*1e6 ,1 ),
+        }
+    finally :
+        db .close ()
+
+
+def main ():
+    parser =argparse .ArgumentParser (description ="Benchmark auth user lookup strategies")
+    parser .add_argument ("--users",type =int ,default =1_000_000 ,help ="Number of seeded users")
+    parser .add_argument ("--lookups",type =int ,default =20_000 ,help ="Lookups per scenario")
+    parser .add_argument ("--db",type =str ,default =None ,help ="SQLite file to reuse (seeded if empty)")
+    parser .add_argument ("--rtt-ms",type =float ,default =0.0 ,help ="Simulated network round-trip per statement")
+    args =parser .parse_args ()
+
+    db_file =args .db or os .path .join (tempfile .mkdtemp (prefix ="auth_bench_"),"auth_bench.db")
+    engine =create_engine (f"sqlite:///{db_file }",connect_args ={"check_same_thread":False })
+    Base .metadata .create_all (engine )
+
+    query_counter ={"n":0 }
+
+    @event .listens_for (engine ,"before_cursor_execute")
+    def _count_queries (conn ,cursor ,statement ,parameters ,context ,executemany ):
+        query_counter ["n"]+=1 
+        if args .rtt_ms :
+            time .sleep (args .rtt_ms /1000.0 )
+
+    with engine .connect ()as conn :
+        existing =conn .exec_driver_sql ("SELECT COUNT(*) FROM users").scalar ()
+    rtt_ms ,args .rtt_ms =args .rtt_ms ,0.0 
+    if existing <args .users :
+        print (f"Seeding {args .users -existing :,} users into {db_file }...")
+        start =time .perf_counter ()
+        seed_users (engine ,args .users ,start_at =existing )
+        print (f"✓ Seeded in {time .perf_counter ()-start :.1f}s")
+    args .rtt_ms =rtt_ms 
+
+    rng =random .Random (42 )
+    scenarios ={
+    "by_username":[f"user{rng .randrange (args .users )}"for _ in range (args .lookups )],
+    "by_email":[f"user{rng .randrange (args .users )}@example.com"for _ in range (args .lookups )],
+    "miss":[f"nobody{i }@example.com"for i in range (args .lookups )],
+    }
+
+    SessionLocal =sessionmaker (bind =engine )
+    results ={"users":args .users ,"rtt_ms":args .rtt_ms ,"scenarios":{}}
+    for name ,identifiers in scenarios .items ():
+        results ["scenarios"][name ]={
+        "two_queries":run_lookups (SessionLocal ,_find_user_two_queries ,identifiers ,query_counter ),
+        "single_or_query":run_lookups (SessionLocal ,_find_user ,identifiers ,query_counter ),
+        }
+
+    print (json .dumps (results ,indent =2 ))
+
+
+if __name__ =="__main__":
+    main ()
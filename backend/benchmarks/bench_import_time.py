@@ -0,0 +1,97 @@
+"""
+Import Time Benchmark
+Imports main in fresh interpreters under -X importtime, reports the slowest
+top-level imports and fails when the cold import exceeds a time budget or pulls
+in modules that must stay lazy (torch, transformers)
+"""
+
+import argparse 
+import json 
+import os 
+import re 
+import statistics 
+import subprocess 
+import sys 
+from pathlib import Path 
+from typing import Dict ,List ,Tuple 
+
+BACKEND_DIR =Path (__file__ ).parent .parent 
+
+IMPORT_LINE =re .compile (r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_once (module :str ,forbidden :List [str ])->Tuple [float ,Dict [str ,float ],List [str ]]:
+    """Cumulative import seconds, per direct child of module, and which forbidden modules loaded"""
+    probe =f"import sys, json, {module }; print(json.dumps([m for m in {repr (forbidden )} if m in sys.modules]))"
+    env =dict (os .environ ,PYTHONWARNINGS ="ignore")
+    result =subprocess .run (
+    [sys .executable ,"-X","importtime","-c",probe ],
+    cwd =BACKEND_DIR ,env =env ,capture_output =True ,text =True ,check =True ,
+    )
+
+    total =0.0 
+    children :Dict [str ,float ]={}
+    for line in result .stderr .splitlines ():
+        match =IMPORT_LINE .match (line )
+        if not match :
+            continue 
+        cumulative =int (match .group (2 ))/1e6 
+        depth =len (match .group (3 ))//2 
+        name =match .group (4 )
+        if depth ==0 and name ==module :
+            total =cumulative 
+        elif depth ==1 :
+            children [name ]=cumulative 
+    loaded =json .loads (result .stdout .strip ().splitlines ()[-1 ])
+    return total ,children ,loaded 
+
+
+def main ():
+    parser =argparse .ArgumentParser (description =__doc__ )
+    parser .add_argument ("--module",default ="main")
+    parser .add_argument ("--runs",type =int ,default =5 )
+    parser .add_argument ("--budget",type =float ,default =3.0 ,help ="Maximum median cold-import seconds")
+    parser .add_argument ("--forbid",nargs ="*",default =["torch","transformers"],help ="Modules that must not be imported")
+    parser .add_argument ("--top",type =int ,default =15 )
+    parser .add_argument ("--output",help ="Also write the JSON report to this file")
+    args =parser .parse_args ()
+
+    totals =[]
+    children :Dict [str ,List [float ]]={}
+    loaded =set ()
+    for _ in range (args .runs ):
+        total ,per_child ,forbidden =import_once (args .module ,args .forbid )
+        totals .append (total )
+        loaded .update (forbidden )
+        for name ,seconds in per_child .items ():
+            children .setdefault (name ,[]).append (seconds )
+
+    median =statistics .median (totals )
+    slowest =sorted (((name ,statistics .median (values ))for name ,values in children .items ()),key =lambda item :-item [1 ])
+    report ={
+    "module":args .module ,
+    "runs":args .runs ,
+    "median_seconds":round (median ,3 ),
+    "min_seconds":round (min (totals ),3 ),
+    "budget_seconds":args .budget ,
+    "forbidden_loaded":sorted (loaded ),
+    "slowest_imports":{name :round (seconds ,3 )for name ,seconds in slowest [:args .top ]},
+    }
+
+    text =json .dumps (report ,indent =2 )
+    print (text )
+    if args .output :
+        Path (args .output ).write_text (text )
+
+    failures =[]
+    if median >args .budget :
+        failures .append (f"median import {median :.2f}s exceeds budget {args .budget :.2f}s")
+    if loaded :
+        failures .append (f"eagerly imported: {', '.join (sorted (loaded ))}")
+    if failures :
+        print ("FAIL: "+"; ".join (failures ),file =sys .stderr )
+        sys .exit (1 )
+
+
+if __name__ =="__main__":
+    main ()
@@ -0,0 +1,114 @@
+"""
+PDF Style Cache Benchmark
+Measures per-report CPU time and allocations with the module-level style caches
+warm versus cleared before every report (the previous per-request behaviour)
+"""
+
+import argparse 
+import json 
+import statistics 
+import sys 
+import time 
+import tracemalloc 
+from pathlib import Path 
+
+sys .path .insert (0 ,str (Path (__file__ ).parent .parent ))
+
+from utils import pdf_generator 
+from utils .pdf_generator import PDFReportGenerator 
+
+SAMPLE_APPLICATION ={
+"customer":{"name":"Rajesh Kumar","id":"CUST-2025-001","monthly_income":50000 ,"credit_score":720 },
+"application":{"id":"APP-1","loan_amount":500000 ,"application_date":"2025-02-05"},
+"verification":{"id_status":"Verified","income_status":"Verified","address_status":"Verified"},
+"underwriting":{"decision":"APPROVED","emi_ratio":0.35 ,"decision_confidence":0.92 },
+"risk":{"risk_band":"LOW","risk_score":0.15 ,"repayment_risk":"Low","fraud_risk":"Low"},
+"offer":{"approved_amount":500000 ,"interest_rate":8.5 ,"tenure":60 ,"emi":10141.35 },
+"feedback":{"assistant_reply":"Your loan application has been approved.","actions":["send_approval_email"]},
+}
+
+
+def clear_caches ():
+    pdf_generator .get_report_stylesheet .cache_clear ()
+    pdf_generator .get_table_style .cache_clear ()
+    pdf_generator ._static_paragraph .cache_clear ()
+
+
+def build_flowables (generator ):
+    """Everything a report does before doc.build: styles, tables and paragraphs"""
+    data =SAMPLE_APPLICATION 
+    return (
+    generator ._build_header (data )+generator ._build_customer_section (data )
+    +generator ._build_application_section (data )+generator ._build_verification_section (data )
+    +generator ._build_risk_section (data )+generator ._build_underwriting_section (data )
+    +generator ._build_offer_section (data )+generator ._build_feedback_section (data )
+    +generator ._build_footer ()
+    )
+
+
+def setup_stage ():
+    return build_flowables (PDFReportGenerator ())
+
+
+def full_stage ():
+    return PDFReportGenerator ().generate_approval_report (SAMPLE_APPLICATION )
+
+
+def measure (stage ,cold :bool ,reports :int ):
+    timings =[]
+    peaks =[]
+    tracemalloc .start ()
+    for _ in range (reports ):
+        if cold :
+            clear_caches ()
+        tracemalloc .reset_peak ()
+        base =tracemalloc .get_traced_memory ()[0 ]
+        start =time .perf_counter ()
+        stage ()
+        timings .append ((time .perf_counter ()-start )*1000 )
+        peaks .append (tracemalloc .get_traced_memory ()[1 ]-base )
+    tracemalloc .stop ()
+    return timings ,peaks 
+
+
+def summarize (timings ,peaks ):
+    return {
+    "mean_ms":round (statistics .mean (timings ),3 ),
+    "p50_ms":round (statistics .median (timings ),3 ),
+    "peak_kib":round (statistics .median (peaks )/1024 ,1 ),
+    }
+
+
+def compare (stage ,reports :int ,rounds :int =5 ):
+    """Interleave cold and warm rounds so machine noise hits both equally"""
+    results ={True :([],[]),False :([],[])}
+    stage ()
+    for _ in range (rounds ):
+        for cold in (True ,False ):
+            timings ,peaks =measure (stage ,cold ,reports //rounds )
+            results [cold ][0 ].extend (timings )
+            results [cold ][1 ].extend (peaks )
+    cold =summarize (*results [True ])
+    warm =summarize (*results [False ])
+    return {
+    "uncached":cold ,
+    "cached":warm ,
+    "cpu_reduction":round (1 -warm ["p50_ms"]/cold ["p50_ms"],3 ),
+    "peak_reduction":round (1 -warm ["peak_kib"]/cold ["peak_kib"],3 )if cold ["peak_kib"]else 0.0 ,
+    }
+
+
+def main ():
+    parser =argparse .ArgumentParser (description =__doc__ )
+    parser .add_argument ("--reports",type =int ,default =200 )
+    args =parser .parse_args ()
+
+    print (json .dumps ({
+    "reports":args .reports ,
+    "styles_and_flowables":compare (setup_stage ,args .reports ),
+    "full_report":compare (full_stage ,args .reports ),
+    },indent =2 ))
+
+
+if __name__ =="__main__":
+    main ()
@@ -0,0 +1,311 @@
+"""
+Predictor Microbenchmarks
+Single-row and batch latency plus per-call allocations for every ml/ predictor,
+measured against the real joblib artifacts and the rule-based fallbacks so
+scoring-path changes can be compared across commits (see --compare)
+"""
+
+import argparse 
+import importlib 
+import json 
+import platform 
+import random 
+import statistics 
+import subprocess 
+import sys 
+import time 
+import tracemalloc 
+from pathlib import Path 
+from typing import Any ,Callable ,Dict ,List 
+
+sys .path .insert (0 ,str (Path (__file__ ).parent .parent ))
+
+EMPLOYMENT_TYPES =["salaried","self_employed","business","unemployed"]
+ROUTE_MESSAGES =[
+"I want to apply for a personal loan",
+"what is my current emi",
+"my documents were rejected can you check",
+"I am not happy with the interest rate",
+"please connect me with an agent",
+"how much loan am I eligible for",
+]
+
+
+def eligibility_row (rng :random .Random )->Dict [str ,Any ]:
+    return {
+    "credit_score":rng .randint (450 ,850 ),
+    "annual_income":rng .uniform (150000 ,3000000 ),
+    "employment_type":rng .choice (EMPLOYMENT_TYPES ),
+    "existing_loans_count":rng .randint (0 ,5 ),
+    "debt_to_income":rng .uniform (0.05 ,0.8 ),
+    "intent_confidence":rng .random (),
+    "persuasion_index":rng .random (),
+    "sentiment_score":rng .uniform (-1 ,1 ),
+    "age":rng .randint (21 ,65 ),
+    "loan_amount":rng .uniform (50000 ,2500000 ),
+    }
+
+
+def fraud_row (rng :random .Random )->Dict [str ,Any ]:
+    return {
+    "transaction_amount":rng .uniform (100 ,500000 ),
+    "age":rng .randint (21 ,65 ),
+    "income":rng .uniform (150000 ,3000000 ),
+    "location_distance":rng .uniform (0 ,2000 ),
+    "device_change":rng .randint (0 ,1 ),
+    "failed_attempts":rng .randint (0 ,6 ),
+    "account_age_days":rng .randint (1 ,3650 ),
+    "risky_country":rng .randint (0 ,1 ),
+    "velocity":rng .randint (0 ,20 ),
+    }
+
+
+def persuasion_row (rng :random .Random )->Dict [str ,Any ]:
+    return {
+    "intent_confidence":rng .random (),
+    "sentiment_score":rng .uniform (-1 ,1 ),
+    "urgency":rng .randint (0 ,1 ),
+    "hesitation":rng .randint (0 ,1 ),
+    "message_length":rng .randint (5 ,400 ),
+    }
+
+
+def repayment_row (rng :random .Random )->Dict [str ,Any ]:
+    return {
+    "credit_score":rng .randint (450 ,850 ),
+    "income":rng .uniform (150000 ,3000000 ),
+    "loan_amount":rng .uniform (50000 ,2500000 ),
+    "tenure_months":rng .choice ([12 ,24 ,36 ,48 ,60 ]),
+    "emi_amount":rng .uniform (2000 ,80000 ),
+    "debt_to_income":rng .uniform (0.05 ,0.8 ),
+    "age":rng .randint (21 ,65 ),
+    "previous_defaults":rng .randint (0 ,3 ),
+    "late_payments":rng .randint (0 ,10 ),
+    }
+
+
+def risk_row (rng :random .Random )->Dict [str ,Any ]:
+    return {
+    "credit_score":rng .randint (450 ,850 ),
+    "delinquency_12m":rng .randint (0 ,4 ),
+    "outstanding_debt":rng .uniform (0 ,1500000 ),
+    "income":rng .uniform (150000 ,3000000 ),
+    "loan_amount":rng .uniform (50000 ,2500000 ),
+    "debt_to_income":rng .uniform (0.05 ,0.8 ),
+    "age":rng .randint (21 ,65 ),
+    "num_hard_inquiries":rng .randint (0 ,8 ),
+    "employment_type":rng .choice (EMPLOYMENT_TYPES ),
+    }
+
+
+def offer_row (rng :random .Random )->Dict [str ,Any ]:
+    return {
+    "credit_score":rng .randint (450 ,850 ),
+    "income":rng .uniform (150000 ,3000000 ),
+    "risk_score":rng .choice ([0 ,50 ,100 ]),
+    "intent_confidence":rng .random (),
+    "loan_need":rng .uniform (50000 ,2500000 ),
+    "eligible_amount":rng .uniform (50000 ,2500000 ),
+    }
+
+
+def route_row (rng :random .Random )->str :
+    return rng .choice (ROUTE_MESSAGES )
+
+
+CASES ={
+"eligibility":("ml.predict_eligibility","predict_eligibility",eligibility_row ,"kwargs"),
+"fraud":("ml.predict_fraud","detect_fraud",fraud_row ,"positional"),
+"persuasion":("ml.predict_persuasion","predict_persuasion_score",persuasion_row ,"kwargs"),
+"repayment":("ml.predict_repayment","predict_repayment",repayment_row ,"positional"),
+"risk":("ml.predict_risk","predict_risk",risk_row ,"positional"),
+"offer":("ml.recommend_offer","recommend_offer",offer_row ,"positional"),
+"supervisor_route":("ml.supervisor_route","route_message",route_row ,"positional"),
+}
+
+
+def make_call (fn :Callable ,style :str )->Callable :
+    if style =="kwargs":
+        return lambda row :fn (**row )
+    return lambda row :fn (row )
+
+
+def time_single (call :Callable ,rows :List [Any ],iterations :int ,warmup :int )->Dict [str ,float ]:
+    for i in range (warmup ):
+        call (rows [i %len (rows )])
+    samples =[]
+    for i in range (iterations ):
+        row =rows [i %len (rows )]
+        start =time .perf_counter_ns ()
+        call (row )
+        samples .append ((time .perf_counter_ns ()-start )/1000 )
+    samples .sort ()
+    return {
+    "iterations":iterations ,
+    "min_us":round (samples [0 ],2 ),
+    "p50_us":round (statistics .median (samples ),2 ),
+    "mean_us":round (statistics .mean (samples ),2 ),
+    "p95_us":round (samples [int (len (samples )*0.95 )-1 ],2 ),
+    }
+
+
+def time_batch (call :Callable ,rows :List [Any ],repeats :int )->Dict [str ,float ]:
+    """Score a whole batch row by row, the way the batch PDF and CRM paths do today"""
+    for row in rows :
+        call (row )
+    per_row =[]
+    for _ in range (repeats ):
+        start =time .perf_counter_ns ()
+        for row in rows :
+            call (row )
+        per_row .append ((time .perf_counter_ns ()-start )/1000 /len (rows ))
+    p50 =statistics .median (per_row )
+    return {
+    "batch_size":len (rows ),
+    "repeats":repeats ,
+    "per_row_p50_us":round (p50 ,2 ),
+    "rows_per_second":round (1e6 /p50 ,1 )if p50 else 0.0 ,
+    }
+
+
+def measure_allocations (call :Callable ,rows :List [Any ],calls :int )->Dict [str ,float ]:
+    """Peak traced memory per call and bytes still held afterwards"""
+    call (rows [0 ])
+    peaks =[]
+    tracemalloc .start ()
+    try :
+        before =tracemalloc .take_snapshot ()
+        for i in range (calls ):
+            tracemalloc .reset_peak ()
+            base =tracemalloc .get_traced_memory ()[0 ]
+            call (rows [i %len (rows )])
+            peaks .append (tracemalloc .get_traced_memory ()[1 ]-base )
+        after =tracemalloc .take_snapshot ()
+    finally :
+        tracemalloc .stop ()
+    diff =after .compare_to (before ,"filename")
+    allocated_blocks =sum (max (stat .count_diff ,0 )for stat in diff )
+    retained =sum (stat .size_diff for stat in diff )
+    return {
+    "peak_kib_per_call":round (statistics .median (peaks )/1024 ,2 ),
+    "retained_bytes_per_call":round (retained /calls ,1 ),
+    "retained_blocks_per_call":round (allocated_blocks /calls ,2 ),
+    }
+
+
+def bench_case (name :str ,mode :str ,args )->Dict [str ,Any ]:
+    module_name ,fn_name ,row_builder ,style =CASES [name ]
+    module =importlib .import_module (module_name )
+    has_fallback =hasattr (module ,"MODEL_AVAILABLE")
+
+    if mode =="fallback"and not has_fallback :
+        return {"status":"skipped","reason":"no fallback path"}
+    if mode =="model"and has_fallback and not module .MODEL_AVAILABLE :
+        return {"status":"skipped","reason":"artifact not loaded"}
+
+    rng =random .Random (args .seed )
+    rows =[row_builder (rng )for _ in range (max (args .batch_size ,64 ))]
+    call =make_call (getattr (module ,fn_name ),style )
+
+    original =getattr (module ,"MODEL_AVAILABLE",None )
+    if mode =="fallback":
+        module .MODEL_AVAILABLE =False 
+    try :
+        try :
+            call (rows [0 ])
+        except Exception as e :
+            return {"status":"error","error":f"{type (e ).__name__ }: {e }"}
+        return {
+        "status":"ok",
+        "single":time_single (call ,rows ,args .iterations ,args .warmup ),
+        "batch":time_batch (call ,rows [:args .batch_size ],args .batch_repeats ),
+        "allocations":measure_allocations (call ,rows ,args .alloc_calls ),
+        }
+    finally :
+        if has_fallback :
+            module .MODEL_AVAILABLE =original 
+
+
+def _git_commit ()->str :
+    try :
+        return subprocess .check_output (["git","rev-parse","--short","HEAD"],cwd =Path (__file__ ).parent ,text =True ).strip ()
+    except Exception :
+        return "unknown"
+
+
+def _library_versions ()->Dict [str ,str ]:
+    versions ={}
+    for name in ("numpy","pandas","sklearn","xgboost","joblib"):
+        try :
+            versions [name ]=importlib .import_module (name ).__version__ 
+        except Exception :
+            versions [name ]="missing"
+    return versions 
+
+
+def compare (report :Dict [str ,Any ],baseline :Dict [str ,Any ],threshold :float )->List [str ]:
+    """Print p50 ratios against a previous report and return the regressions"""
+    regressions =[]
+    print (f"baseline {baseline .get ('commit')} -> current {report ['commit']}",file =sys .stderr )
+    for key ,result in report ["results"].items ():
+        old =baseline .get ("results",{}).get (key )
+        if result .get ("status")!="ok"or not old or old .get ("status")!="ok":
+            continue 
+        for metric ,field in (("single","p50_us"),("batch","per_row_p50_us")):
+            ratio =result [metric ][field ]/old [metric ][field ]if old [metric ][field ]else 1.0 
+            flag =""
+            if ratio >1 +threshold :
+                flag ="  REGRESSION"
+                regressions .append (f"{key }.{metric }")
+            print (f"  {key :<28}{metric :<8}{old [metric ][field ]:>10.1f}us -> {result [metric ][field ]:>10.1f}us  x{ratio :.2f}{flag }",file =sys .stderr )
+    return regressions 
+
+
+def main ():
+    parser =argparse .ArgumentParser (description =__doc__ )
+    parser .add_argument ("--only",nargs ="+",choices =list (CASES ),help ="Benchmark a subset of predictors")
+    parser .add_argument ("--modes",nargs ="+",choices =["model","fallback"],default =["model","fallback"])
+    parser .add_argument ("--iterations",type =int ,default =300 )
+    parser .add_argument ("--warmup",type =int ,default =20 )
+    parser .add_argument ("--batch-size",type =int ,default =256 )
+    parser .add_argument ("--batch-repeats",type =int ,default =5 )
+    parser .add_argument ("--alloc-calls",type =int ,default =50 )
+    parser .add_argument ("--seed",type =int ,default =1234 )
+    parser .add_argument ("--output",help ="Also write the JSON report to this file")
+    parser .add_argument ("--compare",help ="Previous JSON report to compare p50 latencies against")
+    parser .add_argument ("--threshold",type =float ,default =0.10 ,help ="Allowed slowdown before --compare fails")
+    args =parser .parse_args ()
+
+    results ={}
+    for name in args .only or CASES :
+        for mode in args .modes :
+            results [f"{name }/{mode }"]=bench_case (name ,mode ,args )
+
+    report ={
+    "commit":_git_commit (),
+    "python":platform .python_version (),
+    "libraries":_library_versions (),
+    "config":{
+    "iterations":args .iterations ,
+    "batch_size":args .batch_size ,
+    "batch_repeats":args .batch_repeats ,
+    "alloc_calls":args .alloc_calls ,
+    "seed":args .seed ,
+    },
+    "results":results ,
+    }
+
+    text =json .dumps (report ,indent =2 )
+    print (text )
+    if args .output :
+        Path (args .output ).write_text (text )
+
+    if args .compare :
+        regressions =compare (report ,json .loads (Path (args .compare ).read_text ()),args .threshold )
+        if regressions :
+            print (f"{len (regressions )} regression(s) over {args .threshold :.0%}: {', '.join (regressions )}",file =sys .stderr )
+            sys .exit (1 )
+
+
+if __name__ =="__main__":
+    main ()
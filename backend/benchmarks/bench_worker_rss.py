@@ -0,0 +1,134 @@
+"""
+Worker Memory Benchmark
+Starts the app with N workers either through serve.py (models preloaded in the
+master and shared copy-on-write) or plain uvicorn --workers (every worker loads
+its own copy), waits for readiness and reports per-worker unique and
+proportional set size
+"""
+
+import argparse 
+import json 
+import os 
+import platform 
+import signal 
+import subprocess 
+import sys 
+import time 
+from pathlib import Path 
+from typing import Any ,Dict ,List 
+
+import httpx 
+import psutil 
+
+BACKEND_DIR =Path (__file__ ).parent .parent 
+
+MODES =("preload","independent")
+
+
+def launch (mode :str ,workers :int ,port :int )->subprocess .Popen :
+    env =dict (os .environ ,SERVE_WORKERS =str (workers ),SERVE_PORT =str (port ),SERVE_HOST ="127.0.0.1")
+    if mode =="preload":
+        cmd =[sys .executable ,"serve.py"]
+    else :
+        cmd =[sys .executable ,"-m","uvicorn","main:app","--host","127.0.0.1","--port",str (port ),"--workers",str (workers )]
+    return subprocess .Popen (cmd ,cwd =BACKEND_DIR ,env =env ,stdout =subprocess .DEVNULL ,stderr =subprocess .DEVNULL ,start_new_session =True )
+
+
+def worker_processes (root :psutil .Process )->List [psutil .Process ]:
+    workers =[]
+    for child in root .children (recursive =True ):
+        try :
+            if "resource_tracker"in " ".join (child .cmdline ()):
+                continue 
+        except psutil .Error :
+            continue 
+        workers .append (child )
+    return workers 
+
+
+def wait_until_ready (proc :subprocess .Popen ,port :int ,workers :int ,timeout :float ):
+    """Every worker answers /ready independently, so require a run of consecutive 200s"""
+    deadline =time .time ()+timeout 
+    streak =0 
+    while time .time ()<deadline :
+        if proc .poll ()is not None :
+            raise RuntimeError (f"server exited with status {proc .returncode }")
+        try :
+            ok =httpx .get (f"http://127.0.0.1:{port }/ready",timeout =5 ).status_code ==200 
+        except httpx .HTTPError :
+            ok =False 
+        streak =streak +1 if ok else 0 
+        if streak >=workers *4 and len (worker_processes (psutil .Process (proc .pid )))>=workers :
+            return 
+        time .sleep (0.1 if ok else 0.5 )
+    raise TimeoutError (f"server not ready after {timeout :.0f}s")
+
+
+def memory (process :psutil .Process )->Dict [str ,float ]:
+    info =process .memory_full_info ()
+    return {
+    "pid":process .pid ,
+    "rss_mib":round (info .rss /2 **20 ,1 ),
+    "uss_mib":round (info .uss /2 **20 ,1 ),
+    "pss_mib":round (getattr (info ,"pss",0 )/2 **20 ,1 ),
+    "shared_mib":round (getattr (info ,"shared",0 )/2 **20 ,1 ),
+    }
+
+
+def measure (mode :str ,workers :int ,port :int ,timeout :float ,settle :float )->Dict [str ,Any ]:
+    proc =launch (mode ,workers ,port )
+    try :
+        started =time .perf_counter ()
+        wait_until_ready (proc ,port ,workers ,timeout )
+        ready_seconds =round (time .perf_counter ()-started ,1 )
+        time .sleep (settle )
+
+        root =psutil .Process (proc .pid )
+        children =[memory (p )for p in worker_processes (root )]
+        master =memory (root )
+        total_pss =master ["pss_mib"]+sum (c ["pss_mib"]for c in children )
+        return {
+        "workers":len (children ),
+        "ready_seconds":ready_seconds ,
+        "master":master ,
+        "worker_processes":children ,
+        "worker_uss_mean_mib":round (sum (c ["uss_mib"]for c in children )/max (1 ,len (children )),1 ),
+        "worker_pss_mean_mib":round (sum (c ["pss_mib"]for c in children )/max (1 ,len (children )),1 ),
+        "total_pss_mib":round (total_pss ,1 ),
+        }
+    finally :
+        os .killpg (proc .pid ,signal .SIGTERM )
+        try :
+            proc .wait (timeout =30 )
+        except subprocess .TimeoutExpired :
+            os .killpg (proc .pid ,signal .SIGKILL )
+            proc .wait ()
+
+
+def main ():
+    parser =argparse .ArgumentParser (description =__doc__ )
+    parser .add_argument ("--workers",type =int ,default =4 )
+    parser .add_argument ("--modes",nargs ="+",choices =MODES ,default =list (MODES ))
+    parser .add_argument ("--port",type =int ,default =8765 )
+    parser .add_argument ("--timeout",type =float ,default =900 ,help ="Seconds to wait for every worker to warm up")
+    parser .add_argument ("--settle",type =float ,default =2.0 ,help ="Seconds to wait after readiness before sampling")
+    parser .add_argument ("--output",help ="Also write the JSON report to this file")
+    args =parser .parse_args ()
+
+    results ={}
+    for mode in args .modes :
+        results [mode ]=measure (mode ,args .workers ,args .port ,args .timeout ,args .settle )
+        print (f"{mode }: {results [mode ]['worker_uss_mean_mib']} MiB unique per worker, {results [mode ]['total_pss_mib']} MiB total",file =sys .stderr )
+
+    report ={"python":platform .python_version (),"platform":platform .platform (),"results":results }
+    if {"preload","independent"}<=results .keys ():
+        report ["total_pss_saved_mib"]=round (results ["independent"]["total_pss_mib"]-results ["preload"]["total_pss_mib"],1 )
+
+    text =json .dumps (report ,indent =2 )
+    print (text )
+    if args .output :
+        Path (args .output ).write_text (text )
+
+
+if __name__ =="__main__":
+    main ()
@@ -0,0 +1,210 @@
+"""
+Bulk Import/Export CLI
+Streams CSV or Parquet files into loan_requests, risk_assessments and
+eligibility_checks with Core executemany inserts (one transaction per chunk),
+and streams tables back out through server-side cursors
+
+Usage:
+    python database/bulk_io.py import loan_requests applications.csv
+    python database/bulk_io.py export risk_assessments assessments.parquet --chunk-size 50000
+"""
+
+import argparse 
+import csv 
+import sys 
+import time 
+from datetime import datetime 
+from pathlib import Path 
+from typing import Any ,Callable ,Dict ,Iterator ,List 
+
+sys .path .insert (0 ,str (Path (__file__ ).parent .parent ))
+
+from sqlalchemy import Boolean ,DateTime ,Float ,Integer ,select 
+
+from database .models import EligibilityCheck ,LoanRequest ,RiskAssessment ,get_engine 
+from services .statistics_service import days_touched ,invalidate_rollups 
+
+TABLES ={
+"loan_requests":LoanRequest .__table__ ,
+"risk_assessments":RiskAssessment .__table__ ,
+"eligibility_checks":EligibilityCheck .__table__ ,
+}
+
+DEFAULT_CHUNK_SIZE =10_000 
+
+TRUE_VALUES ={"1","true","t","yes","y"}
+
+
+def _parse_bool (value :str )->bool :
+    return value .strip ().lower ()in TRUE_VALUES 
+
+
+def _converter (column )->Callable [[str ],Any ]:
+    """Map a CSV string to the column's Python type"""
+    if isinstance (column .type ,Boolean ):
+        return _parse_bool 
+    if isinstance (column .type ,Integer ):
+        return lambda v :int (float (v ))
+    if isinstance (column .type ,Float ):
+        return float 
+    if isinstance (column .type ,DateTime ):
+        return datetime .fromisoformat 
+    return str 
+
+
+def _detect_format (path :str ,fmt :str )->str :
+    if fmt :
+        return fmt 
+    return "parquet"if path .lower ().endswith ((".parquet",".pq"))else "csv"
+
+
+def _require_pyarrow ():
+    try :
+        import pyarrow 
+        import pyarrow .parquet 
+    except ImportError :
+        raise SystemExit ("Parquet support requires pyarrow: pip install pyarrow")
+    return pyarrow 
+
+
+def _check_columns (table ,names :List [str ]):
+    unknown =[n for n in names if n not in table .c ]
+    if unknown :
+        raise SystemExit (f"Unknown columns for {table .name }: {', '.join (unknown )}")
+
+
+def iter_csv_chunks (path :str ,table ,chunk_size :int )->Iterator [List [Dict [str ,Any ]]]:
+    with open (path ,newline ="",encoding ="utf-8")as f :
+        reader =csv .DictReader (f )
+        _check_columns (table ,reader .fieldnames or [])
+        converters ={name :_converter (table .c [name ])for name in reader .fieldnames }
+        chunk =[]
+        for raw in reader :
+            chunk .append ({
+            name :(converters [name ](value )if value not in ("",None )else None )
+            for name ,value in raw .items ()
+            })
+            if len (chunk )>=chunk_size :
+                yield chunk 
+                chunk =[]
+        if chunk :
+            yield chunk 
+
+
+def iter_parquet_chunks (path :str ,table ,chunk_size :int )->Iterator [List [Dict [str ,Any ]]]:
+    pa =_require_pyarrow ()
+    parquet_file =pa .parquet .ParquetFile (path )
+    _check_columns (table ,parquet_file .schema_arrow .names )
+    for batch in parquet_file .iter_batches (batch_size =chunk_size ):
+        yield batch .to_pylist ()
+
+
+def import_table (table_name :str ,path :str ,fmt :str =None ,chunk_size :int =DEFAULT_CHUNK_SIZE )->int :
+    """
+    Bulk insert a file into a table, committing once per chunk
+
+    Daily statistics rollups for the days a chunk touches are dropped in the
+    same transaction, so imported history shows up in period reports.
+    """
+    table =TABLES [table_name ]
+    fmt =_detect_format (path ,fmt )
+    chunks =iter_parquet_chunks (path ,table ,chunk_size )if fmt =="parquet"else iter_csv_chunks (path ,table ,chunk_size )
+
+    engine =get_engine ()
+    total =0 
+    started =time .perf_counter ()
+    for chunk in chunks :
+        with engine .begin ()as conn :
+            conn .execute (table .insert (),chunk )
+            invalidate_rollups (conn ,days_touched (table ,chunk ))
+        total +=len (chunk )
+        print (f"  ✓ {total :,} rows imported into {table_name }",file =sys .stderr )
+
+    elapsed =time .perf_counter ()-started 
+    print (f"✓ Imported {total :,} rows in {elapsed :.1f}s ({total /max (elapsed ,1e-9 ):,.0f} rows/s)",file =sys .stderr )
+    return total 
+
+
+def _stream_partitions (table ,chunk_size :int )->Iterator [List [Any ]]:
+    engine =get_engine ()
+    with engine .connect ()as conn :
+        result =conn .execution_options (stream_results =True ,yield_per =chunk_size ).execute (
+        select (table ).order_by (table .c .id )
+        )
+        for partition in result .partitions ():
+            yield partition 
+
+
+def _arrow_schema (pa ,table ):
+    fields =[]
+    for column in table .columns :
+        if isinstance (column .type ,Boolean ):
+            arrow_type =pa .bool_ ()
+        elif isinstance (column .type ,Integer ):
+            arrow_type =pa .int64 ()
+        elif isinstance (column .type ,Float ):
+            arrow_type =pa .float64 ()
+        elif isinstance (column .type ,DateTime ):
+            arrow_type =pa .timestamp ("us")
+        else :
+            arrow_type =pa .string ()
+        fields .append (pa .field (column .name ,arrow_type ))
+    return pa .schema (fields )
+
+
+def export_table (table_name :str ,path :str ,fmt :str =None ,chunk_size :int =DEFAULT_CHUNK_SIZE )->int :
+    """Stream a table to CSV (or stdout with '-') or Parquet with constant memory"""
+    table =TABLES [table_name ]
+    fmt =_detect_format (path ,fmt )
+    names =[c .name for c in table .columns ]
+    total =0 
+
+    if fmt =="parquet":
+        pa =_require_pyarrow ()
+        schema =_arrow_schema (pa ,table )
+        with pa .parquet .ParquetWriter (path ,schema )as writer :
+            for partition in _stream_partitions (table ,chunk_size ):
+                columns =list (zip (*partition ))
+                writer .write_table (pa .Table .from_arrays (
+                [pa .array (col ,type =field .type )for col ,field in zip (columns ,schema )],
+                schema =schema ,
+                ))
+                total +=len (partition )
+                print (f"  ✓ {total :,} rows exported",file =sys .stderr )
+        return total 
+
+    out =sys .stdout if path =="-"else open (path ,"w",newline ="",encoding ="utf-8")
+    try :
+        writer =csv .writer (out )
+        writer .writerow (names )
+        for partition in _stream_partitions (table ,chunk_size ):
+            writer .writerows (
+            [v .isoformat ()if isinstance (v ,datetime )else v for v in row ]
+            for row in partition 
+            )
+            total +=len (partition )
+            print (f"  ✓ {total :,} rows exported",file =sys .stderr )
+    finally :
+        if out is not sys .stdout :
+            out .close ()
+    return total 
+
+
+def main ():
+    parser =argparse .ArgumentParser (description ="Bulk import/export for backtesting tables")
+    parser .add_argument ("command",choices =["import","export"])
+    parser .add_argument ("table",choices =sorted (TABLES ))
+    parser .add_argument ("path",help ="CSV/Parquet file ('-' exports CSV to stdout)")
+    parser .add_argument ("--format",choices =["csv","parquet"],default =None ,help ="Defaults to the file extension")
+    parser .add_argument ("--chunk-size",type =int ,default =DEFAULT_CHUNK_SIZE ,help ="Rows per insert batch / fetch")
+    args =parser .parse_args ()
+
+    if args .command =="import":
+        import_table (args .table ,args .path ,args .format ,args .chunk_size )
+    else :
+        total =export_table (args .table ,args .path ,args .format ,args .chunk_size )
+        print (f"✓ Exported {total :,} rows from {args .table }",file =sys .stderr )
+
+
+if __name__ =="__main__":
+    main ()
@@ -0,0 +1,180 @@
+"""
+Decision Writer
+Write-behind persistence for orchestrator decisions. Request handlers enqueue
+rows without waiting on the database; a background task batches them into
+executemany inserts, flushed by size or interval, and drains on shutdown
+"""
+
+import asyncio 
+import logging 
+import os 
+from collections import defaultdict 
+from typing import Any ,Dict ,List ,Optional ,Tuple 
+
+from sqlalchemy .exc import DataError ,IntegrityError 
+
+from database .models import get_engine 
+
+logger =logging .getLogger (__name__ )
+
+DECISION_PERSISTENCE_ENABLED =os .environ .get ("DECISION_PERSISTENCE_ENABLED","1")=="1"
+DECISION_QUEUE_SIZE =int (os .environ .get ("DECISION_QUEUE_SIZE","10000"))
+DECISION_BATCH_SIZE =int (os .environ .get ("DECISION_BATCH_SIZE","500"))
+DECISION_FLUSH_INTERVAL =float (os .environ .get ("DECISION_FLUSH_INTERVAL","1.0"))
+DECISION_RETRY_DELAY =float (os .environ .get ("DECISION_RETRY_DELAY","2.0"))
+
+_DATA_ERRORS =(IntegrityError ,DataError )
+
+_STOP =object ()
+
+
+class DecisionWriter :
+    """Batches (model, row) records from the event loop into bulk inserts"""
+
+    def __init__ (
+    self ,
+    batch_size :int =DECISION_BATCH_SIZE ,
+    flush_interval :float =DECISION_FLUSH_INTERVAL ,
+    max_queue :int =DECISION_QUEUE_SIZE ,
+    engine =None ,
+    retry_delay :float =DECISION_RETRY_DELAY ,
+    ):
+        self .batch_size =batch_size 
+        self .flush_interval =flush_interval 
+        self .max_queue =max_queue 
+        self .engine =engine 
+        self .retry_delay =retry_delay 
+        self .written =0 
+        self .dropped =0 
+        self ._queue :Optional [asyncio .Queue ]=None 
+        self ._task :Optional [asyncio .Task ]=None 
+        self ._closing =False 
+
+    @property 
+    def running (self )->bool :
+        return self ._task is not None and not self ._task .done ()and not self ._closing 
+
+    def start (self ):
+        """Start the flush loop on the running event loop"""
+        if self .running :
+            return 
+        self ._closing =False 
+        self ._queue =asyncio .Queue (maxsize =self .max_queue )
+        self ._task =asyncio .create_task (self ._run ())
+        logger .info (f"✓ Decision writer started (batch={self .batch_size }, interval={self .flush_interval }s)")
+
+    def submit (self ,records :List [Tuple [Any ,Dict [str ,Any ]]])->bool :
+        """
+        Enqueue records without blocking; records are dropped when the queue is full
+
+        Args:
+            records: (ORM model class, column values) pairs
+
+        Returns:
+            True if the writer accepted the records
+        """
+        if not self .running :
+            return False 
+        for model ,values in records :
+            try :
+                self ._queue .put_nowait ((model .__table__ ,values ))
+            except asyncio .QueueFull :
+                self .dropped +=1 
+                if self .dropped %1000 ==1 :
+                    logger .warning (f"⚠ Decision queue full, dropped {self .dropped } records so far")
+        return True 
+
+    async def stop (self ):
+        """Stop accepting records, then flush everything already queued"""
+        if self ._task is None :
+            return 
+        self ._closing =True 
+        await self ._queue .put (_STOP )
+        await self ._task 
+        self ._task =None 
+        logger .info (f"Decision writer drained ({self .written } written, {self .dropped } dropped)")
+
+    async def _run (self ):
+        loop =asyncio .get_running_loop ()
+        pending =[]
+        stopping =False 
+        while not stopping :
+            deadline =loop .time ()+self .flush_interval 
+            while len (pending )<self .batch_size :
+                timeout =deadline -loop .time ()
+                if timeout <=0 :
+                    break 
+                try :
+                    item =await asyncio .wait_for (self ._queue .get (),timeout )
+                except asyncio .TimeoutError :
+                    break 
+                if item is _STOP :
+                    stopping =True 
+                    break 
+                pending .append (item )
+            if pending :
+                await self ._flush (pending )
+                pending =[]
+
+    async def _flush (self ,items :List [Tuple [Any ,Dict [str ,Any ]]]):
+        grouped =defaultdict (list )
+        for table ,values in items :
+            grouped [table ].append (values )
+        rejected =[]
+        for attempt in range (2 ):
+            try :
+                await asyncio .to_thread (self ._write ,grouped ,rejected )
+                break 
+            except Exception as e :
+                remaining =sum (len (rows )for rows in grouped .values ())
+                if attempt :
+                    rejected .extend (row for rows in grouped .values ()for row in rows )
+                    logger .warning (f"⚠ Failed to persist {remaining } decision records: {getattr (e ,'orig',e )}")
+                else :
+                    logger .warning (f"⚠ Decision batch failed, retrying {remaining } records in {self .retry_delay }s: {getattr (e ,'orig',e )}")
+                    await asyncio .sleep (self .retry_delay )
+        self .written +=len (items )-len (rejected )
+        self .dropped +=len (rejected )
+
+    def _write (self ,grouped :Dict [Any ,List [Dict [str ,Any ]]],rejected :List [Dict [str ,Any ]]):
+        """
+        Insert a batch in one transaction, removing rows from grouped as they land
+
+        Only data errors (an FK violation from a client-supplied
+        loan_request_id, say) split the batch: it is retried table by table and
+        then row by row, and the rows the database refuses go to rejected.
+        Anything else, a lost connection or a timeout, is raised with the
+        unwritten rows still in grouped so the caller retries them as a whole.
+        """
+        engine =self .engine or get_engine ()
+        try :
+            with engine .begin ()as conn :
+                for table ,rows in grouped .items ():
+                    conn .execute (table .insert (),rows )
+            grouped .clear ()
+            return 
+        except _DATA_ERRORS as e :
+            logger .warning (f"⚠ Decision batch failed, retrying per table: {e .orig }")
+        for table in list (grouped ):
+            self ._write_table (engine ,table ,grouped [table ],rejected )
+            del grouped [table ]
+
+    def _write_table (self ,engine ,table ,rows :List [Dict [str ,Any ]],rejected :List [Dict [str ,Any ]]):
+        try :
+            with engine .begin ()as conn :
+                conn .execute (table .insert (),rows )
+            rows .clear ()
+            return 
+        except _DATA_ERRORS :
+            pass 
+        while rows :
+            try :
+                with engine .begin ()as conn :
+                    conn .execute (table .insert (),rows [0 ])
+            except _DATA_ERRORS as e :
+                rejected .append (rows [0 ])
+                logger .warning (f"⚠ Dropped {table .name } decision record: {e .orig }")
+            rows .pop (0 )
+
+
+decision_writer =DecisionWriter ()
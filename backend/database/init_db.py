@@ -26,6 +26,8 @@ def main ():
         print ("  - intent_detections")
         print ("  - emotion_analysis")
         print ("  - persuasion_scores")
+        print ("  - auth_sessions")
+        print ("  - daily_stats_rollups")
 
     except Exception as e :
         print (f"✗ Error initializing database: {str (e )}")
@@ -52,7 +52,8 @@ def init_sqlite_database ():
         "8. intent_detections",
         "9. emotion_analysis",
         "10. persuasion_scores",
-        "11. auth_sessions"
+        "11. auth_sessions",
+        "12. daily_stats_rollups"
         ]
 
         for table_name in table_list :
@@ -0,0 +1,57 @@
+"""
+Auth Session Sweeper
+Deletes expired and logged-out auth sessions in bounded batches so the
+auth_sessions table and its token indexes stay proportional to live sessions
+"""
+
+import asyncio 
+import logging 
+import os 
+from datetime import datetime 
+from typing import Optional 
+
+from sqlalchemy import and_ ,delete ,or_ ,select 
+
+from database .models import AuthSession ,get_engine 
+
+logger =logging .getLogger (__name__ )
+
+SWEEP_INTERVAL_SECONDS =float (os .environ .get ("AUTH_SESSION_SWEEP_INTERVAL","300"))
+SWEEP_BATCH_SIZE =int (os .environ .get ("AUTH_SESSION_SWEEP_BATCH","1000"))
+
+
+def sweep_sessions (engine =None ,batch_size :int =SWEEP_BATCH_SIZE ,now :Optional [datetime ]=None )->int :
+    """
+    Delete inactive or expired sessions, one short transaction per batch
+
+    Returns:
+        Number of deleted sessions
+    """
+    engine =engine or get_engine ()
+    now =now or datetime .utcnow ()
+    table =AuthSession .__table__ 
+    stale =or_ (table .c .active ==False ,and_ (table .c .active ==True ,table .c .expires_at <now ))
+
+    deleted =0 
+    while True :
+        with engine .begin ()as conn :
+            ids =conn .execute (select (table .c .id ).where (stale ).limit (batch_size )).scalars ().all ()
+            if not ids :
+                break 
+            conn .execute (delete (table ).where (table .c .id .in_ (ids )))
+        deleted +=len (ids )
+        if len (ids )<batch_size :
+            break 
+    return deleted 
+
+
+async def run_session_sweeper (interval :float =SWEEP_INTERVAL_SECONDS ):
+    """Sweep periodically until cancelled; the blocking deletes run in a worker thread"""
+    while True :
+        try :
+            deleted =await asyncio .to_thread (sweep_sessions )
+            if deleted :
+                logger .info (f"✓ Swept {deleted } expired/inactive auth sessions")
+        except Exception as e :
+            logger .warning (f"⚠ Auth session sweep failed: {e }")
+        await asyncio .sleep (interval )
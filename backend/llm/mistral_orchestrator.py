@@ -1,38 +1,50 @@
 import os 
-import torch 
 import re 
 import json 
-from typing import Tuple ,Optional 
-from transformers import AutoTokenizer ,AutoModelForCausalLM 
-try :
-    from transformers import BitsAndBytesConfig 
-except Exception :
-    BitsAndBytesConfig =None 
-from utils .gpu_utils import get_device_manager ,setup_gpu_environment 
+from functools import lru_cache 
+from typing import Any ,Tuple ,Optional 
+from ml .gpu_accelerated_inference import accelerator 
+from ml .inference_client import inference_client 
 
 
-setup_gpu_environment ()
-device_manager =get_device_manager ()
+MODEL_ID =os .environ .get ("LLM_MODEL_ID","TinyLlama/TinyLlama-1.1B-Chat-v1.0")
+MAX_NEW_TOKENS =int (os .environ .get ("LLM_MAX_TOKENS","128"))
 
 
+_tokenizer :Optional [Any ]=None 
+_model :Optional [Any ]=None 
 
-MODEL_ID =os .environ .get ("LLM_MODEL_ID","TinyLlama/TinyLlama-1.1B-Chat-v1.0")
-MAX_NEW_TOKENS =int (os .environ .get ("LLM_MAX_TOKENS","128"))
-DEVICE =device_manager .get_device ()
-DTYPE =device_manager .get_dtype ()
 
+@lru_cache (maxsize =1 )
+def _runtime ()->Tuple [Any ,Any ]:
+    """Device and dtype for the LLM, resolved (and torch imported) on first use"""
+    from utils .gpu_utils import get_device_manager ,setup_gpu_environment 
 
-_tokenizer :Optional [AutoTokenizer ]=None 
-_model :Optional [AutoModelForCausalLM ]=None 
+    setup_gpu_environment ()
+    device_manager =get_device_manager ()
+    return device_manager .get_device (),device_manager .get_dtype ()
 
 
-def _load_llm ()->Tuple [AutoTokenizer ,AutoModelForCausalLM ]:
+def _load_llm ()->Tuple [Any ,Any ]:
     """Load tokenizer and model lazily with GPU-aware settings."""
     global _tokenizer ,_model 
     if _tokenizer is not None and _model is not None :
         return _tokenizer ,_model 
 
-    _tokenizer =AutoTokenizer .from_pretrained (MODEL_ID ,use_fast =True )
+    _tokenizer ,_model =accelerator .load_model ("mistral",_build_llm )
+    return _tokenizer ,_model 
+
+
+def _build_llm ()->Tuple [Any ,Any ]:
+    import torch 
+    from transformers import AutoTokenizer ,AutoModelForCausalLM 
+    try :
+        from transformers import BitsAndBytesConfig 
+    except Exception :
+        BitsAndBytesConfig =None 
+
+    DEVICE ,DTYPE =_runtime ()
+    tokenizer =AutoTokenizer .from_pretrained (MODEL_ID ,use_fast =True )
 
     kwargs ={"torch_dtype":DTYPE ,"low_cpu_mem_usage":True }
     if str (DEVICE )=="cuda":
@@ -50,17 +62,17 @@ def _load_llm ()->Tuple [AutoTokenizer ,AutoModelForCausalLM ]:
             kwargs ["device_map"]="auto"
 
     try :
-        _model =AutoModelForCausalLM .from_pretrained (MODEL_ID ,**kwargs )
+        model =AutoModelForCausalLM .from_pretrained (MODEL_ID ,**kwargs )
     except Exception :
 
         fallback_kwargs ={"torch_dtype":DTYPE ,"low_cpu_mem_usage":True }
         if str (DEVICE )=="cuda":
             fallback_kwargs ["device_map"]="auto"
-        _model =AutoModelForCausalLM .from_pretrained (MODEL_ID ,**fallback_kwargs )
+        model =AutoModelForCausalLM .from_pretrained (MODEL_ID ,**fallback_kwargs )
     if str (DEVICE )!="cuda":
-        _model .to (DEVICE )
-    _model .eval ()
-    return _tokenizer ,_model 
+        model .to (DEVICE )
+    model .eval ()
+    return tokenizer ,model 
 
 
 def mistral_think (context :str )->dict :
@@ -89,15 +101,26 @@ Context:
 {context }
 """
 
+    if inference_client :
+        return inference_client .call ("mistral",context )
+
+    import torch 
+
     tokenizer ,model =_load_llm ()
+    DEVICE ,_ =_runtime ()
     inputs =tokenizer (prompt ,return_tensors ="pt").to (DEVICE )
 
+    input_tokens =int (inputs ["input_ids"].shape [-1 ])
+
     with torch .no_grad ():
-        outputs =model .generate (
+        outputs =accelerator .run_model (
+        "mistral",
+        model .generate ,
         **inputs ,
         max_new_tokens =MAX_NEW_TOKENS ,
         temperature =0.4 ,
-        top_p =0.9 
+        top_p =0.9 ,
+        token_counter =lambda out :(input_tokens ,int (out .shape [-1 ])-input_tokens )
         )
 
     text =tokenizer .decode (outputs [0 ],skip_special_tokens =True )
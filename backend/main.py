@@ -1,39 +1,76 @@
 from fastapi import FastAPI 
-import torch 
+from fastapi .responses import PlainTextResponse ,JSONResponse 
 import signal 
 import sys 
-from utils .gpu_utils import setup_gpu_environment ,get_device_manager 
+import asyncio 
+from contextlib import asynccontextmanager ,suppress 
 from ml .gpu_accelerated_inference import accelerator 
 
-
-setup_gpu_environment ()
-device_manager =get_device_manager ()
-
 from routers import crm 
 from routers import credit_score 
 from routers import agents 
 from routers import eligibility 
 from routers import risk 
+from routers import underwriting 
 from routers import offer 
 from routers import supervisor_route 
 from routers .feedback_router import router as feedback_router 
 from routers .orchestrator import router as orchestrator_router 
 from routers .pdf_report import router as pdf_report_router 
 from routers import auth 
+from routers .debug import router as debug_router 
+from database .session_sweeper import run_session_sweeper ,SWEEP_INTERVAL_SECONDS 
+from database .decision_writer import decision_writer ,DECISION_PERSISTENCE_ENABLED 
+from utils .pdf_render_pool import pdf_render_pool 
+from utils .pdf_batch_jobs import pdf_job_manager 
+from utils .report_storage import report_storage 
+from utils .metrics import registry as metrics_registry 
+from utils .warmup import model_warmup 
+
+
+def get_device_manager ():
+    from utils .gpu_utils import get_device_manager as _get_device_manager 
+    return _get_device_manager ()
+
 
+def init_devices ():
+    """Import torch and probe GPU/NPU off the request path; routers that need no model never wait for it"""
+    accelerator .init_devices ()
+    get_device_manager ()
 
-if torch .cuda .is_available ():
-    HF_DEVICE =0 
-elif hasattr (torch ,"xpu")and torch .xpu .is_available ():
-    HF_DEVICE =0 
-else :
-    HF_DEVICE =-1 
+
+@asynccontextmanager 
+async def lifespan (app :FastAPI ):
+    sweeper =None 
+    if SWEEP_INTERVAL_SECONDS >0 :
+        sweeper =asyncio .create_task (run_session_sweeper (SWEEP_INTERVAL_SECONDS ))
+    if DECISION_PERSISTENCE_ENABLED :
+        decision_writer .start ()
+    pdf_job_retention =asyncio .create_task (pdf_job_manager .run_retention ())
+    report_janitor =asyncio .create_task (report_storage .run_janitor ())
+    devices =asyncio .create_task (asyncio .to_thread (init_devices ))
+    warmup =asyncio .create_task (model_warmup .run ())
+    try :
+        yield 
+    finally :
+        await decision_writer .stop ()
+        for task in (devices ,warmup ,pdf_job_retention ,report_janitor ):
+            task .cancel ()
+            with suppress (asyncio .CancelledError ):
+                await task 
+        await pdf_job_manager .shutdown ()
+        pdf_render_pool .shutdown ()
+        if sweeper :
+            sweeper .cancel ()
+            with suppress (asyncio .CancelledError ):
+                await sweeper 
 
 
 app =FastAPI (
 title ="Agentic AI Backend",
 version ="1.0.0",
-description ="Advanced AI-powered lending platform with multi-agent orchestration - GPU/NPU Accelerated"
+description ="Advanced AI-powered lending platform with multi-agent orchestration - GPU/NPU Accelerated",
+lifespan =lifespan 
 )
 
 app .include_router (crm .router )
@@ -41,16 +78,19 @@ app .include_router (credit_score .router )
 app .include_router (agents .router )
 app .include_router (eligibility .router )
 app .include_router (risk .router )
+app .include_router (underwriting .router )
 app .include_router (offer .router )
 app .include_router (supervisor_route .router )
 app .include_router (feedback_router )
 app .include_router (orchestrator_router )
 app .include_router (pdf_report_router )
 app .include_router (auth .router )
+app .include_router (debug_router )
 
 
 @app .get ("/")
 def root ():
+    device_manager =get_device_manager ()
     device_info =accelerator .get_device_info ()
     device_info ["device_manager"]={
     "primary_device":str (device_manager .get_device ()),
@@ -63,20 +103,33 @@ def root ():
     return {
     "message":"Agentic AI Backend running - GPU/NPU ACCELERATED",
     "version":"1.0.0",
-    "acceleration":device_info 
+    "acceleration":device_info ,
+    "models":accelerator .get_model_stats ()
     }
 
 
 @app .get ("/health")
 def health_check ():
+    device_manager =get_device_manager ()
     return {
     "status":"healthy",
     "service":"agentic-ai-backend",
-    "gpu_enabled":torch .cuda .is_available (),
+    "gpu_enabled":device_manager .gpu_device is not None ,
     "device":str (device_manager .get_device ())
     }
 
 
+@app .get ("/ready")
+def readiness_check ():
+    report =model_warmup .report ()
+    return JSONResponse (report ,status_code =200 if model_warmup .ready else 503 )
+
+
+@app .get ("/metrics",response_class =PlainTextResponse )
+def metrics ():
+    return PlainTextResponse (metrics_registry .render (),media_type ="text/plain; version=0.0.4; charset=utf-8")
+
+
 def signal_handler (sig ,frame ):
     sys .exit (0 )
 
@@ -0,0 +1,15 @@
+"""
+Model Artifact Loading
+Loads joblib artifacts with numpy payloads memory-mapped read-only, so workers
+forked from a preloading master (see serve.py) share the array pages instead of
+each holding a private copy
+"""
+import os 
+import joblib 
+
+JOBLIB_MMAP_MODE =os .environ .get ("JOBLIB_MMAP_MODE","r")
+
+
+def load_artifact (path :str ):
+    mmap_mode =JOBLIB_MMAP_MODE if JOBLIB_MMAP_MODE in ("r","c")else None 
+    return joblib .load (path ,mmap_mode =mmap_mode )
@@ -2,25 +2,106 @@
 GPU and NPU Accelerated Inference Engine
 Uses CUDA 13.0 for GPU and OpenVINO for Intel NPU
 Optimized for RTX 5070 and Intel AI Boost
+torch is imported and devices are probed on first use, not at import time
 """
-import torch 
 import numpy as np 
 import logging 
-from typing import Any ,Dict ,List ,Tuple ,Optional 
+import threading 
+import time 
+from typing import Any ,Callable ,Dict ,Tuple ,Optional 
 import pandas as pd 
+try :
+    import psutil 
+except ImportError :
+    psutil =None 
+
+from utils .metrics import registry 
 
 logger =logging .getLogger (__name__ )
 
+MODEL_CALLS =registry .counter ("model_calls","Inference calls per model",["model"])
+MODEL_INPUT_TOKENS =registry .counter ("model_input_tokens","Prompt tokens consumed per generative model",["model"])
+MODEL_OUTPUT_TOKENS =registry .counter ("model_output_tokens","Tokens generated per generative model",["model"])
+MODEL_BATCH_SIZE =registry .histogram (
+"model_batch_size","Inputs per inference call",["model"],
+buckets =(1 ,2 ,4 ,8 ,16 ,32 ,64 ,128 ,256 ,512 ,1024 ),
+)
+MODEL_QUEUE_WAIT =registry .histogram ("model_queue_wait_seconds","Time a model call waited for an executor thread or its model lock",["model"])
+MODEL_COMPUTE =registry .histogram ("model_compute_seconds","Time spent inside model inference",["model"])
+MODEL_LOAD_SECONDS =registry .gauge ("model_load_seconds","Wall time of the last model load",["model"])
+MODEL_LOAD_RSS =registry .gauge ("model_load_rss_delta_bytes","Process RSS growth across the last model load",["model"])
+
+
+_queued =threading .local ()
+
+
+def queued_since (enqueued :Optional [float ]):
+    """
+    Mark model calls on this thread as queued since enqueued (a perf_counter time)
+
+    Set by the executor that picked the work up, so run_model reports the
+    wait in that executor's own queue; None clears it.
+    """
+    _queued .since =enqueued 
+
+
+def hf_device ()->int :
+    """Device index for transformers pipelines: first GPU when CUDA is available, else CPU"""
+    import torch 
+    return 0 if torch .cuda .is_available ()else -1 
+
+
+def _rss_bytes ()->Optional [int ]:
+    if psutil is None :
+        return None 
+    return psutil .Process ().memory_info ().rss 
+
 class AcceleratedInference :
     """Handles GPU/NPU accelerated model inference with CUDA 13.0 support"""
 
     def __init__ (self ):
-        self .device =self ._setup_device ()
-        self .npu_device =self ._setup_npu ()
-        self .openvino_available =self ._check_openvino ()
-
-    def _setup_device (self )->torch .device :
+        self ._device =None 
+        self ._npu_device =None 
+        self ._openvino_available =False 
+        self ._devices_ready =False 
+        self ._devices_guard =threading .Lock ()
+        self ._model_locks :Dict [str ,threading .Lock ]={}
+        self ._locks_guard =threading .Lock ()
+        self ._models_seen :Dict [str ,Dict [str ,Any ]]={}
+
+    def init_devices (self ):
+        """Import torch and probe GPU/NPU/OpenVINO once, on the first call that needs a device"""
+        if self ._devices_ready :
+            return 
+        with self ._devices_guard :
+            if self ._devices_ready :
+                return 
+            from utils .gpu_utils import setup_gpu_environment 
+
+            self ._device =self ._setup_device ()
+            self ._npu_device =self ._setup_npu ()
+            self ._openvino_available =self ._check_openvino ()
+            setup_gpu_environment ()
+            self ._devices_ready =True 
+
+    @property 
+    def device (self )->"torch.device":
+        self .init_devices ()
+        return self ._device 
+
+    @property 
+    def npu_device (self )->Optional ["torch.device"]:
+        self .init_devices ()
+        return self ._npu_device 
+
+    @property 
+    def openvino_available (self )->bool :
+        self .init_devices ()
+        return self ._openvino_available 
+
+    def _setup_device (self )->"torch.device":
         """Setup CUDA 13.0 GPU device with optimizations"""
+        import torch 
         if torch .cuda .is_available ():
             device =torch .device ("cuda:0")
             try :
@@ -55,8 +136,9 @@ class AcceleratedInference :
             logger .warning ("⚠ GPU not available - CPU will be used (slower)")
             return torch .device ("cpu")
 
-    def _setup_npu (self )->Optional [torch .device ]:
+    def _setup_npu (self )->Optional ["torch.device"]:
         """Setup Intel AI Boost NPU if available"""
+        import torch 
         try :
             if hasattr (torch ,"xpu")and torch .xpu .is_available ():
                 logger .info ("✓ Intel XPU (NPU) detected and available")
@@ -88,11 +170,125 @@ class AcceleratedInference :
             return False 
 
 
-    def predict_sklearn_model (self ,model ,data :pd .DataFrame ,use_gpu :bool =True ,use_npu :bool =False )->Tuple [np .ndarray ,Optional [np .ndarray ]]:
+    def _model_lock (self ,name :str )->threading .Lock :
+        with self ._locks_guard :
+            lock =self ._model_locks .get (name )
+            if lock is None :
+                lock =self ._model_locks [name ]=threading .Lock ()
+                self ._models_seen .setdefault (name ,{})
+            return lock 
+
+    def load_model (self ,name :str ,loader :Callable [[],Any ])->Any :
+        """
+        Run a model loader, recording load time and process RSS growth
+
+        RSS deltas are approximate when several models load concurrently.
+        """
+        rss_before =_rss_bytes ()
+        started =time .perf_counter ()
+        model =loader ()
+        elapsed =time .perf_counter ()-started 
+        MODEL_LOAD_SECONDS .set (elapsed ,model =name )
+        info ={"load_seconds":round (elapsed ,3 )}
+        if rss_before is not None :
+            delta =_rss_bytes ()-rss_before 
+            MODEL_LOAD_RSS .set (delta ,model =name )
+            info ["load_rss_delta_mb"]=round (delta /(1024 *1024 ),1 )
+        with self ._locks_guard :
+            self ._models_seen .setdefault (name ,{}).update (info )
+        logger .info (f"✓ Loaded {name } in {elapsed :.2f}s ({info .get ('load_rss_delta_mb','?')} MB RSS)")
+        return model 
+
+    def run_model (
+    self ,
+    name :str ,
+    fn :Callable [...,Any ],
+    *args ,
+    batch_size :int =1 ,
+    serialize :bool =False ,
+    token_counter :Optional [Callable [[Any ],Tuple [int ,int ]]]=None ,
+    **kwargs 
+    )->Any :
+        """
+        Call fn(*args, **kwargs) as one inference of model `name`, recording metrics
+
+        Calls to the same model overlap. Pass serialize=True only for a
+        callable that is known not to be thread-safe: calls to that model then
+        run one at a time behind a per-model lock, which caps it at one call
+        per process. Queue wait is the time since queued_since() was set by
+        the executor running this call, plus any lock wait; it is not
+        recorded for calls that neither queued nor serialized. token_counter
+        maps the result to (input_tokens, output_tokens) for generative
+        models.
+        """
+        lock =self ._model_lock (name )
+        enqueued =getattr (_queued ,"since",None )
+        if serialize :
+            if enqueued is None :
+                enqueued =time .perf_counter ()
+            lock .acquire ()
+        started =time .perf_counter ()
+        try :
+            result =fn (*args ,**kwargs )
+            if token_counter is not None :
+                input_tokens ,output_tokens =token_counter (result )
+                MODEL_INPUT_TOKENS .inc (input_tokens ,model =name )
+                MODEL_OUTPUT_TOKENS .inc (output_tokens ,model =name )
+            return result 
+        finally :
+            finished =time .perf_counter ()
+            if serialize :
+                lock .release ()
+            if enqueued is not None :
+                MODEL_QUEUE_WAIT .observe (started -enqueued ,model =name )
+            MODEL_COMPUTE .observe (finished -started ,model =name )
+            MODEL_BATCH_SIZE .observe (batch_size ,model =name )
+            MODEL_CALLS .inc (model =name )
+
+    def get_model_stats (self )->Dict [str ,Dict [str ,Any ]]:
+        """Per-model runtime counters for capacity planning"""
+        with self ._locks_guard :
+            names =sorted (self ._models_seen )
+            loads ={n :dict (v )for n ,v in self ._models_seen .items ()}
+        stats ={}
+        for name in names :
+            wait =MODEL_QUEUE_WAIT .snapshot (model =name )
+            compute =MODEL_COMPUTE .snapshot (model =name )
+            calls =compute ["count"]
+            output_tokens =MODEL_OUTPUT_TOKENS .value (model =name )
+            entry ={
+            "calls":calls ,
+            "input_tokens":int (MODEL_INPUT_TOKENS .value (model =name )),
+            "output_tokens":int (output_tokens ),
+            "avg_queue_wait_ms":round (wait ["sum"]/wait ["count"]*1000 ,3 )if wait ["count"]else 0.0 ,
+            "avg_compute_ms":round (compute ["sum"]/calls *1000 ,3 )if calls else 0.0 ,
+            "output_tokens_per_sec":round (output_tokens /compute ["sum"],2 )if compute ["sum"]else 0.0 ,
+            "batch_sizes":MODEL_BATCH_SIZE .distribution (model =name ),
+            }
+            entry .update (loads .get (name ,{}))
+            stats [name ]=entry 
+        return stats 
+
+    def predict_sklearn_model (
+    self ,
+    model ,
+    data :pd .DataFrame ,
+    use_gpu :bool =True ,
+    use_npu :bool =False ,
+    model_name :Optional [str ]=None 
+    )->Tuple [np .ndarray ,Optional [np .ndarray ]]:
         """
         Accelerated prediction for sklearn models with GPU/NPU support
         Converts to GPU tensors for faster computation
         """
+        if model_name :
+            return self .run_model (
+            model_name ,self ._predict_sklearn_model ,model ,data ,use_gpu ,use_npu ,
+            batch_size =len (data ),serialize =False 
+            )
+        return self ._predict_sklearn_model (model ,data ,use_gpu ,use_npu )
+
+    def _predict_sklearn_model (self ,model ,data :pd .DataFrame ,use_gpu :bool ,use_npu :bool )->Tuple [np .ndarray ,Optional [np .ndarray ]]:
         try :
 
             target_device =None 
@@ -104,6 +300,7 @@ class AcceleratedInference :
                 logger .info (f"Using GPU for sklearn inference")
 
             if target_device :
+                import torch 
 
                 data_tensor =torch .tensor (data .values ,dtype =torch .float32 ).to (target_device )
 
@@ -130,11 +327,17 @@ class AcceleratedInference :
             probabilities =model .predict_proba (data )if hasattr (model ,'predict_proba')else None 
             return predictions ,probabilities 
 
-    def predict_transformer_model (self ,pipeline ,text :str ,use_npu :bool =False ,use_gpu :bool =True ):
+    def predict_transformer_model (self ,pipeline ,text :str ,use_npu :bool =False ,use_gpu :bool =True ,model_name :Optional [str ]=None ):
         """
         Accelerated prediction for HuggingFace transformers
         Uses NPU if available, otherwise GPU
         """
+        if model_name :
+            batch_size =len (text )if isinstance (text ,list )else 1 
+            return self .run_model (model_name ,self ._predict_transformer_model ,pipeline ,text ,use_npu ,use_gpu ,batch_size =batch_size )
+        return self ._predict_transformer_model (pipeline ,text ,use_npu ,use_gpu )
+
+    def _predict_transformer_model (self ,pipeline ,text :str ,use_npu :bool ,use_gpu :bool ):
         try :
             if use_npu and self .openvino_available and self .npu_device :
 
@@ -163,6 +366,8 @@ class AcceleratedInference :
 
 
 
+            import torch 
+
             logger .warning ("OpenVINO optimization not fully implemented, using GPU")
             return pipeline (text )if torch .cuda .is_available ()else pipeline (text )
         except Exception as e :
@@ -171,6 +376,7 @@ class AcceleratedInference :
 
     def get_device_info (self )->Dict [str ,Any ]:
         """Return current device information with CUDA 13.0 details"""
+        import torch 
         info ={
         "device":str (self .device ),
         "gpu_available":torch .cuda .is_available (),
@@ -194,6 +400,7 @@ class AcceleratedInference :
 
     def get_memory_stats (self )->Dict [str ,Any ]:
         """Get detailed memory statistics"""
+        import torch 
         stats ={}
 
         if torch .cuda .is_available ():
@@ -206,6 +413,7 @@ class AcceleratedInference :
 
     def free_memory (self ):
         """Free GPU and NPU memory"""
+        import torch 
         if torch .cuda .is_available ():
             torch .cuda .empty_cache ()
             torch .cuda .synchronize ()
@@ -1,24 +1,22 @@
-from transformers import pipeline 
-import torch 
-from utils .gpu_utils import setup_gpu_environment ,get_device_manager 
+from ml .gpu_accelerated_inference import accelerator ,hf_device 
+from ml .inference_client import inference_client 
 
 
-setup_gpu_environment ()
-device_manager =get_device_manager ()
-
 _analyzer =None 
 
 
 def _load ():
     global _analyzer 
     if _analyzer is None :
-        device_str ="cuda"if torch .cuda .is_available ()else "cpu"
-        _analyzer =pipeline (
+        from transformers import pipeline 
+
+        device_str ="cuda"if hf_device ()==0 else "cpu"
+        _analyzer =accelerator .load_model ("emotion",lambda :pipeline (
         "text-classification",
         model ="j-hartmann/emotion-english-distilroberta-base",
         top_k =None ,
         device =device_str ,
-        )
+        ))
     return _analyzer 
 
 
@@ -52,5 +50,8 @@ def _normalize (output ):
 
 
 def analyze_emotion (text ):
-    raw =_load ()(text )
+    if inference_client :
+        raw =inference_client .call ("emotion",text )
+    else :
+        raw =accelerator .run_model ("emotion",_load (),text )
     return _normalize (raw )
@@ -1,18 +1,21 @@
-from transformers import pipeline 
-import torch 
+from ml .gpu_accelerated_inference import accelerator ,hf_device 
+from ml .inference_client import inference_client 
 
 _model =None 
 
 def _load ():
     global _model 
     if _model is None :
-        device =0 if torch .cuda .is_available ()else -1 
-        _model =pipeline (
+        from transformers import pipeline 
+
+        _model =accelerator .load_model ("intent",lambda :pipeline (
         "text-classification",
         model ="distilbert-base-uncased",
-        device =device 
-        )
+        device =hf_device ()
+        ))
     return _model 
 
 def predict_intent (text ):
-    return _load ()(text )
+    if inference_client :
+        return inference_client .call ("intent",text )
+    return accelerator .run_model ("intent",_load (),text )
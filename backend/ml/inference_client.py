@@ -0,0 +1,109 @@
+"""
+Inference Sidecar Client
+Pooled, blocking client for the inference sidecar (ml/inference_server.py).
+Enabled by pointing INFERENCE_SIDECAR_SOCKET at the sidecar's Unix socket;
+model call sites then send their inputs over IPC instead of running locally
+"""
+
+import json 
+import logging 
+import os 
+import queue 
+import socket 
+import threading 
+import time 
+from typing import Any ,Optional 
+
+from ml .inference_server import HEADER ,KIND_ERROR ,KIND_REQUEST ,decode_header ,encode_frame ,recv_exact 
+from utils .metrics import registry 
+
+logger =logging .getLogger (__name__ )
+
+INFERENCE_SIDECAR_SOCKET =os .environ .get ("INFERENCE_SIDECAR_SOCKET","")
+INFERENCE_POOL_SIZE =int (os .environ .get ("INFERENCE_POOL_SIZE","8"))
+INFERENCE_TIMEOUT =float (os .environ .get ("INFERENCE_TIMEOUT","120"))
+
+SIDECAR_SECONDS =registry .histogram ("inference_sidecar_seconds","Round-trip time of sidecar inference calls",["op"])
+SIDECAR_ERRORS =registry .counter ("inference_sidecar_errors","Sidecar calls that failed",["op"])
+
+
+class InferenceError (RuntimeError ):
+    """The sidecar ran the operation and reported a failure"""
+
+    def __init__ (self ,error_type :str ,message :str ):
+        super ().__init__ (f"{error_type }: {message }")
+        self .error_type =error_type 
+
+
+class InferenceClient :
+    """Keeps up to pool_size connections open; each in-flight call holds one exclusively"""
+
+    def __init__ (self ,path :str ,pool_size :int =INFERENCE_POOL_SIZE ,timeout :float =INFERENCE_TIMEOUT ):
+        self .path =path 
+        self .pool_size =max (1 ,pool_size )
+        self .timeout =timeout 
+        self ._reset ()
+        os .register_at_fork (after_in_child =self ._reset )
+
+    def _reset (self ):
+        """Connections must never be shared between processes, so forked children start empty"""
+        self ._idle :"queue.LifoQueue[socket.socket]"=queue .LifoQueue ()
+        self ._slots =threading .BoundedSemaphore (self .pool_size )
+
+    def _connect (self )->socket .socket :
+        sock =socket .socket (socket .AF_UNIX ,socket .SOCK_STREAM )
+        sock .settimeout (self .timeout )
+        sock .connect (self .path )
+        return sock 
+
+    def _roundtrip (self ,sock :socket .socket ,frame :bytes ):
+        sock .sendall (frame )
+        kind ,length =decode_header (recv_exact (sock ,HEADER .size ))
+        return kind ,json .loads (recv_exact (sock ,length ))
+
+    def call (self ,op :str ,*args ,**kwargs )->Any :
+        frame =encode_frame (KIND_REQUEST ,{"op":op ,"args":args ,"kwargs":kwargs })
+        start =time .perf_counter ()
+        if not self ._slots .acquire (timeout =self .timeout ):
+            SIDECAR_ERRORS .inc (op =op )
+            raise TimeoutError (f"no sidecar connection free within {self .timeout :.0f}s")
+        try :
+            try :
+                sock =self ._idle .get_nowait ()
+            except queue .Empty :
+                sock =self ._connect ()
+            try :
+                kind ,body =self ._roundtrip (sock ,frame )
+            except (ConnectionError ,BrokenPipeError ):
+                sock .close ()
+                sock =self ._connect ()
+                try :
+                    kind ,body =self ._roundtrip (sock ,frame )
+                except Exception :
+                    sock .close ()
+                    raise 
+            except Exception :
+                sock .close ()
+                raise 
+            self ._idle .put (sock )
+        except Exception :
+            SIDECAR_ERRORS .inc (op =op )
+            raise 
+        finally :
+            self ._slots .release ()
+            SIDECAR_SECONDS .observe (time .perf_counter ()-start ,op =op )
+
+        if kind ==KIND_ERROR :
+            SIDECAR_ERRORS .inc (op =op )
+            raise InferenceError (body .get ("type","Error"),body .get ("error",""))
+        return body 
+
+    def close (self ):
+        while True :
+            try :
+                self ._idle .get_nowait ().close ()
+            except queue .Empty :
+                break 
+
+
+inference_client :Optional [InferenceClient ]=InferenceClient (INFERENCE_SIDECAR_SOCKET )if INFERENCE_SIDECAR_SOCKET else None 
@@ -0,0 +1,252 @@
+"""
+Inference Sidecar Server
+Out-of-process owner of the transformer models (intent, emotion, sentiment,
+zero-shot, flan-t5 and the LLM). API workers reach it over a Unix socket using
+length-prefixed frames: a fixed binary header followed by a compact JSON body
+
+Run with: python -m ml.inference_server --socket /tmp/ey_inference.sock
+"""
+
+import argparse 
+import asyncio 
+import json 
+import logging 
+import os 
+import signal 
+import socket 
+import struct 
+import sys 
+import time 
+from concurrent .futures import ThreadPoolExecutor 
+from typing import Any ,Callable ,Dict ,Optional ,Tuple 
+
+logger =logging .getLogger (__name__ )
+
+HEADER =struct .Struct ("!2sBBI")
+MAGIC =b"EY"
+PROTOCOL_VERSION =1 
+KIND_REQUEST =0 
+KIND_RESULT =1 
+KIND_ERROR =2 
+MAX_FRAME_BYTES =16 *1024 *1024 
+
+INFERENCE_SERVER_THREADS =int (os .environ .get ("INFERENCE_SERVER_THREADS","4"))
+
+
+class ProtocolError (RuntimeError ):
+    """Raised when a peer sends a frame that does not follow the sidecar protocol"""
+
+
+def _json_default (value ):
+    if hasattr (value ,"tolist"):
+        return value .tolist ()
+    if hasattr (value ,"item"):
+        return value .item ()
+    raise TypeError (f"Cannot serialise {type (value ).__name__ }")
+
+
+def encode_frame (kind :int ,body :Any )->bytes :
+    payload =json .dumps (body ,separators =(",",":"),default =_json_default ).encode ("utf-8")
+    if len (payload )>MAX_FRAME_BYTES :
+        raise ProtocolError (f"frame of {len (payload )} bytes exceeds {MAX_FRAME_BYTES }")
+    return HEADER .pack (MAGIC ,PROTOCOL_VERSION ,kind ,len (payload ))+payload 
+
+
+def decode_header (header :bytes )->Tuple [int ,int ]:
+    magic ,version ,kind ,length =HEADER .unpack (header )
+    if magic !=MAGIC or version !=PROTOCOL_VERSION :
+        raise ProtocolError (f"unexpected frame header {repr (header )}")
+    if length >MAX_FRAME_BYTES :
+        raise ProtocolError (f"frame of {length } bytes exceeds {MAX_FRAME_BYTES }")
+    return kind ,length 
+
+
+def recv_exact (sock :socket .socket ,size :int )->bytes :
+    buffer =bytearray ()
+    while len (buffer )<size :
+        chunk =sock .recv (size -len (buffer ))
+        if not chunk :
+            raise ConnectionError ("inference sidecar closed the connection")
+        buffer .extend (chunk )
+    return bytes (buffer )
+
+
+def _op_intent (text :str ):
+    from ml .infer_intent import predict_intent 
+    return predict_intent (text )
+
+
+def _op_emotion (text :str ):
+    from ml .gpu_accelerated_inference import accelerator 
+    from ml .infer_emotion import _load 
+    return accelerator .run_model ("emotion",_load (),text )
+
+
+def _op_sentiment (text :str ):
+    from agents .sales_persuasion import get_sentiment_analyzer 
+    from ml .gpu_accelerated_inference import accelerator 
+
+    analyzer =get_sentiment_analyzer ()
+    if analyzer is None :
+        raise RuntimeError ("sentiment analyzer unavailable")
+    return accelerator .predict_transformer_model (analyzer ,text ,use_npu =False ,model_name ="sentiment")
+
+
+def _op_zero_shot (text :str ,candidate_labels ):
+    from agents .verification_agent import get_name_checker 
+    from ml .gpu_accelerated_inference import accelerator 
+
+    checker =get_name_checker ()
+    if checker is None :
+        raise RuntimeError ("name checker unavailable")
+    return accelerator .run_model ("name_checker",checker ,text ,candidate_labels =candidate_labels )
+
+
+def _op_feedback_llm (prompt :str ,**kwargs ):
+    from agents .feedback_agent import _count_tokens ,_get_feedback_llm 
+    from ml .gpu_accelerated_inference import accelerator 
+
+    llm =_get_feedback_llm ()
+    return accelerator .run_model (
+    "feedback_llm",llm ,prompt ,
+    token_counter =lambda out :_count_tokens (llm .tokenizer ,prompt ,out [0 ]["generated_text"]),
+    **kwargs ,
+    )
+
+
+def _op_offer_llm (prompt :str ,**kwargs ):
+    from agents .feedback_agent import _count_tokens 
+    from agents .offer_generation_agent import _get_offer_llm 
+    from ml .gpu_accelerated_inference import accelerator 
+
+    llm =_get_offer_llm ()
+    return accelerator .run_model (
+    "offer_llm",llm ,prompt ,
+    pad_token_id =llm .tokenizer .eos_token_id ,
+    token_counter =lambda out :_count_tokens (llm .tokenizer ,prompt ,out [0 ]["generated_text"]),
+    **kwargs ,
+    )
+
+
+def _op_mistral (context :str ):
+    from llm .mistral_orchestrator import mistral_think 
+    return mistral_think (context )
+
+
+def _op_stats ():
+    from ml .gpu_accelerated_inference import accelerator 
+    return {"pid":os .getpid (),"models":accelerator .get_model_stats ()}
+
+
+OPERATIONS :Dict [str ,Callable [...,Any ]]={
+"ping":lambda :"pong",
+"stats":_op_stats ,
+"intent":_op_intent ,
+"emotion":_op_emotion ,
+"sentiment":_op_sentiment ,
+"zero_shot":_op_zero_shot ,
+"feedback_llm":_op_feedback_llm ,
+"offer_llm":_op_offer_llm ,
+"mistral":_op_mistral ,
+}
+
+
+class InferenceServer :
+    """Serves one request at a time per connection; model calls run on a thread pool"""
+
+    def __init__ (self ,path :str ,threads :int =INFERENCE_SERVER_THREADS ):
+        self .path =path 
+        self .executor =ThreadPoolExecutor (max_workers =threads ,thread_name_prefix ="inference")
+        self .requests =0 
+        self .errors =0 
+        self ._server :Optional [asyncio .AbstractServer ]=None 
+
+    def _dispatch (self ,request :Dict [str ,Any ],enqueued :float )->Any :
+        from ml .gpu_accelerated_inference import queued_since 
+
+        operation =OPERATIONS .get (request .get ("op"))
+        if operation is None :
+            raise ValueError (f"unknown operation {repr (request .get ('op'))}")
+        queued_since (enqueued )
+        try :
+            return operation (*request .get ("args",[]),**request .get ("kwargs",{}))
+        finally :
+            queued_since (None )
+
+    async def _handle (self ,reader :asyncio .StreamReader ,writer :asyncio .StreamWriter ):
+        loop =asyncio .get_running_loop ()
+        try :
+            while True :
+                try :
+                    kind ,length =decode_header (await reader .readexactly (HEADER .size ))
+                    request =json .loads (await reader .readexactly (length ))
+                except asyncio .IncompleteReadError :
+                    break 
+                if kind !=KIND_REQUEST :
+                    raise ProtocolError (f"unexpected frame kind {kind }")
+
+                self .requests +=1 
+                try :
+                    result =await loop .run_in_executor (self .executor ,self ._dispatch ,request ,time .perf_counter ())
+                    frame =encode_frame (KIND_RESULT ,result )
+                except Exception as e :
+                    self .errors +=1 
+                    logger .warning (f"⚠ Sidecar {request .get ('op')} failed: {e }")
+                    frame =encode_frame (KIND_ERROR ,{"type":type (e ).__name__ ,"error":str (e )})
+                writer .write (frame )
+                await writer .drain ()
+        except (ProtocolError ,ValueError ,ConnectionError )as e :
+            logger .warning (f"⚠ Dropping sidecar connection: {e }")
+        finally :
+            writer .close ()
+
+    async def serve (self ):
+        if os .path .exists (self .path ):
+            os .unlink (self .path )
+        self ._server =await asyncio .start_unix_server (self ._handle ,path =self .path )
+        os .chmod (self .path ,0o660 )
+        logger .info (f"✓ Inference sidecar listening on {self .path }")
+        async with self ._server :
+            await self ._server .serve_forever ()
+
+    def close (self ):
+        if self ._server :
+            self ._server .close ()
+        self .executor .shutdown (wait =False ,cancel_futures =True )
+        if os .path .exists (self .path ):
+            os .unlink (self .path )
+
+
+def main ():
+    parser =argparse .ArgumentParser (description ="Inference sidecar for the heavy transformer models")
+    parser .add_argument ("--socket",default =os .environ .get ("INFERENCE_SIDECAR_SOCKET","/tmp/ey_inference.sock"))
+    parser .add_argument ("--threads",type =int ,default =INFERENCE_SERVER_THREADS )
+    parser .add_argument ("--warmup",action ="store_true",help ="Load and prime the models before accepting connections")
+    args =parser .parse_args ()
+
+    logging .basicConfig (level =logging .INFO ,format ="%(asctime)s [sidecar] %(message)s")
+    os .environ .pop ("INFERENCE_SIDECAR_SOCKET",None )
+
+    if args .warmup :
+        from utils .warmup import PRIMERS 
+        for name in ("intent","emotion","sentiment","name_checker","feedback_llm","offer_llm","mistral"):
+            start =time .perf_counter ()
+            try :
+                PRIMERS [name ]()
+                logger .info (f"✓ Primed {name } in {time .perf_counter ()-start :.2f}s")
+            except Exception as e :
+                logger .warning (f"⚠ Could not prime {name }: {e }")
+
+    server =InferenceServer (args .socket ,args .threads )
+    signal .signal (signal .SIGTERM ,lambda signum ,frame :sys .exit (0 ))
+    try :
+        asyncio .run (server .serve ())
+    except KeyboardInterrupt :
+        pass 
+    finally :
+        server .close ()
+
+
+if __name__ =="__main__":
+    sys .path .insert (0 ,os .path .dirname (os .path .dirname (os .path .abspath (__file__ ))))
+    main ()
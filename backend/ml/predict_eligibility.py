@@ -1,5 +1,5 @@
 import os 
-import joblib 
+from ml .artifacts import load_artifact 
 import numpy as np 
 from ml .gpu_accelerated_inference import accelerator 
 
@@ -7,7 +7,7 @@ BASE_DIR =os .path .dirname (__file__ )
 MODEL_PATH =os .path .join (BASE_DIR ,"eligibility_model.joblib")
 
 try :
-    _model =joblib .load (MODEL_PATH )
+    _model =load_artifact (MODEL_PATH )
     MODEL_AVAILABLE =True 
 except Exception as e :
     print (f"Warning: Could not load eligibility model: {e }. Using fallback.")
@@ -55,7 +55,7 @@ loan_amount :float ,
     }])
 
 
-    predictions ,proba_array =accelerator .predict_sklearn_model (_model ,df ,use_gpu =True )
+    predictions ,proba_array =accelerator .predict_sklearn_model (_model ,df ,use_gpu =True ,model_name ="eligibility")
 
     proba =proba_array [0 ]if proba_array is not None else None 
     classes =list (_model .classes_ )
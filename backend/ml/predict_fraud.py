@@ -1,5 +1,5 @@
 import os 
-import joblib 
+from ml .artifacts import load_artifact 
 import pandas as pd 
 from ml .gpu_accelerated_inference import accelerator 
 
@@ -7,7 +7,7 @@ BASE =os .path .dirname (__file__ )
 MODEL =os .path .join (BASE ,"fraud_model.joblib")
 
 try :
-    _model_data =joblib .load (MODEL )
+    _model_data =load_artifact (MODEL )
     iso =_model_data ["isolation_forest"]
     scaler =_model_data .get ("scaler")
     clf =_model_data ["classifier"]
@@ -49,7 +49,7 @@ def detect_fraud (values ):
 
 
     X_scaled_df =pd .DataFrame (X_scaled )
-    predictions ,proba_array =accelerator .predict_sklearn_model (clf ,X_scaled_df ,use_gpu =True )
+    predictions ,proba_array =accelerator .predict_sklearn_model (clf ,X_scaled_df ,use_gpu =True ,model_name ="fraud")
 
     prob =proba_array [0 ][1 ]if proba_array is not None else 0.5 
     verdict ="fraudulent"if prob >0.5 else "legit"
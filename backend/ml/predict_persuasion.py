@@ -1,12 +1,12 @@
 import os 
-import joblib 
+from ml .artifacts import load_artifact 
 import numpy as np 
 
 BASE_DIR =os .path .dirname (__file__ )
 MODEL_PATH =os .path .join (BASE_DIR ,"persuasion_model.joblib")
 
 try :
-    _model =joblib .load (MODEL_PATH )
+    _model =load_artifact (MODEL_PATH )
     MODEL_AVAILABLE =True 
 except Exception as e :
     print (f"Warning: Could not load persuasion model: {e }. Using fallback.")
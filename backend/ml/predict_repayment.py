@@ -1,12 +1,12 @@
 import os 
-import joblib 
+from ml .artifacts import load_artifact 
 import pandas as pd 
 
 BASE =os .path .dirname (__file__ )
 MODEL =os .path .join (BASE ,"repayment_model.joblib")
 
 try :
-    clf =joblib .load (MODEL )
+    clf =load_artifact (MODEL )
     MODEL_AVAILABLE =True 
 except Exception as e :
     print (f"Warning: Could not load repayment model: {e }. Using fallback.")
@@ -1,5 +1,5 @@
 import os 
-import joblib 
+from ml .artifacts import load_artifact 
 import pandas as pd 
 import numpy as np 
 import logging 
@@ -13,7 +13,7 @@ TIER_MAP ={0 :"low",1 :"medium",2 :"high"}
 logger =logging .getLogger (__name__ )
 
 try :
-    model =joblib .load (MODEL_PATH )
+    model =load_artifact (MODEL_PATH )
     MODEL_AVAILABLE =True 
     logger .info ("✓ Risk model loaded successfully")
 except Exception as e :
@@ -63,7 +63,7 @@ def predict_risk (values ):
     df =pd .DataFrame ([values ])
 
 
-    predictions ,pred_proba_array =accelerator .predict_sklearn_model (model ,df ,use_gpu =True )
+    predictions ,pred_proba_array =accelerator .predict_sklearn_model (model ,df ,use_gpu =True ,model_name ="risk")
 
     pred_class =int (predictions [0 ])
     pred_proba =pred_proba_array [0 ]if pred_proba_array is not None else None 
@@ -1,12 +1,12 @@
 import os 
-import joblib 
+from ml .artifacts import load_artifact 
 import pandas as pd 
 
 BASE =os .path .dirname (__file__ )
 MODEL =os .path .join (BASE ,"offer_model.joblib")
 
 try :
-    bundle =joblib .load (MODEL )
+    bundle =load_artifact (MODEL )
     rate_model =bundle ["rate_model"]
     tenure_model =bundle ["tenure_model"]
     features =bundle ["features"]
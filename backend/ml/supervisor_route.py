@@ -1,11 +1,11 @@
 import os 
-import joblib 
+from ml .artifacts import load_artifact 
 import numpy as np 
 
 BASE =os .path .dirname (__file__ )
 MODEL =os .path .join (BASE ,"supervisor_model.joblib")
 
-bundle =joblib .load (MODEL )
+bundle =load_artifact (MODEL )
 
 vec =bundle ["vectorizer"]
 clf =bundle ["classifier"]
@@ -3,26 +3,121 @@ PDF Report Generator - API Client Utility
 Provides convenient functions to generate PDF reports via HTTP requests
 """
 
-import requests 
-import json 
+import asyncio 
 import os 
+import requests 
+from concurrent .futures import ThreadPoolExecutor 
+from contextlib import contextmanager 
 from pathlib import Path 
 from datetime import datetime 
-from typing import Dict ,Any ,Optional 
+from typing import Dict ,Any ,List ,Optional 
+from requests .adapters import HTTPAdapter 
+from urllib3 .util .retry import Retry 
+
+CHUNK_SIZE =64 *1024 
+RETRY_STATUSES =(429 ,502 ,503 ,504 )
+
+
+@contextmanager 
+def _part_file (output_file :str ):
+    """Open output_file.part for writing; it replaces output_file on success and is deleted if the write fails"""
+    Path (output_file ).parent .mkdir (parents =True ,exist_ok =True )
+    tmp_file =f"{output_file }.part"
+    try :
+        with open (tmp_file ,'wb')as f :
+            yield f 
+        os .replace (tmp_file ,output_file )
+    except BaseException :
+        try :
+            os .unlink (tmp_file )
+        except FileNotFoundError :
+            pass 
+        raise 
+
+
+def _write_stream (chunks ,output_file :str )->int :
+    """Write an iterable of byte chunks to output_file atomically; returns bytes written"""
+    size =0 
+    with _part_file (output_file )as f :
+        for chunk in chunks :
+            f .write (chunk )
+            size +=len (chunk )
+    return size 
 
 
 class PDFReportClient :
     """Client for PDF Report API endpoints"""
 
-    def __init__ (self ,base_url :str ="http://localhost:8000"):
+    def __init__ (
+    self ,
+    base_url :str ="http://localhost:8000",
+    pool_size :int =10 ,
+    retries :int =3 ,
+    backoff_factor :float =0.5 ,
+    timeout :float =30 
+    ):
         """
         Initialize PDF Report Client
-        
+
         Args:
             base_url: Base URL of the FastAPI server (default: http://localhost:8000)
+            pool_size: Keep-alive connections held per host
+            retries: Retries on connection errors and 429/502/503/504 (honours Retry-After)
+            backoff_factor: Exponential backoff base between retries, in seconds
+            timeout: Per-request timeout in seconds
         """
         self .base_url =base_url 
         self .pdf_endpoint =f"{base_url }/pdf-reports"
+        self .timeout =timeout 
+
+        retry =Retry (
+        total =retries ,
+        backoff_factor =backoff_factor ,
+        status_forcelist =RETRY_STATUSES ,
+        allowed_methods =frozenset ({"GET","POST"}),
+        respect_retry_after_header =True ,
+        raise_on_status =False 
+        )
+        adapter =HTTPAdapter (pool_connections =pool_size ,pool_maxsize =pool_size ,max_retries =retry )
+        self .session =requests .Session ()
+        self .session .mount ("http://",adapter )
+        self .session .mount ("https://",adapter )
+
+    def close (self ):
+        self .session .close ()
+
+    def __enter__ (self ):
+        return self 
+
+    def __exit__ (self ,*exc ):
+        self .close ()
+
+    def _download (self ,method :str ,path :str ,output_file :Optional [str ],label :str ,**kwargs )->Dict [str ,Any ]:
+        """Issue a request and stream a 200 PDF body to output_file in chunks (or return it in memory)"""
+        with self .session .request (method ,f"{self .pdf_endpoint }{path }",stream =True ,timeout =self .timeout ,**kwargs )as response :
+            if response .status_code !=200 :
+                return {
+                "status":"error",
+                "message":f"Server error: {response .status_code }",
+                "details":response .text 
+                }
+
+            if output_file :
+                size =_write_stream (response .iter_content (CHUNK_SIZE ),output_file )
+                return {
+                "status":"success",
+                "message":f"{label } generated and saved",
+                "file":output_file ,
+                "size":size 
+                }
+
+            content =response .content 
+            return {
+            "status":"success",
+            "message":f"{label } generated",
+            "content":content ,
+            "size":len (content )
+            }
 
     def generate_application_pdf (
     self ,
@@ -32,53 +127,21 @@ class PDFReportClient :
     )->Dict [str ,Any ]:
         """
         Generate a PDF report for a loan application approval
-        
+
         Args:
             application_data: Dictionary containing application details
-            output_file: Optional local file path to save PDF
-            save_to_server: If True, saves PDF on server instead of downloading
-        
+            output_file: Optional local file path to stream the PDF into
+            save_to_server: If True, also saves PDF on the server
+
         Returns:
             Dictionary with status and file information
         """
         try :
-            payload ={
-            "application_data":application_data ,
-            "save_to_file":save_to_server ,
-            "filepath":None 
-            }
-
-            response =requests .post (
-            f"{self .pdf_endpoint }/application-approval-pdf",
-            json =payload ,
-            timeout =30 
+            return self ._download (
+            "POST","/application-approval-pdf",output_file ,"PDF",
+            json =application_data ,
+            params ={"save_to_file":save_to_server }
             )
-
-            if response .status_code ==200 :
-                if output_file :
-
-                    with open (output_file ,'wb')as f :
-                        f .write (response .content )
-                    return {
-                    "status":"success",
-                    "message":"PDF generated and saved",
-                    "file":output_file ,
-                    "size":len (response .content )
-                    }
-                else :
-                    return {
-                    "status":"success",
-                    "message":"PDF generated",
-                    "content":response .content ,
-                    "size":len (response .content )
-                    }
-            else :
-                return {
-                "status":"error",
-                "message":f"Server error: {response .status_code }",
-                "details":response .text 
-                }
-
         except Exception as e :
             return {
             "status":"error",
@@ -94,52 +157,21 @@ class PDFReportClient :
     )->Dict [str ,Any ]:
         """
         Generate a PDF report with statistics
-        
+
         Args:
             statistics_data: Dictionary containing statistics
-            output_file: Optional local file path to save PDF
-            save_to_server: If True, saves PDF on server
-        
+            output_file: Optional local file path to stream the PDF into
+            save_to_server: If True, also saves PDF on the server
+
         Returns:
             Dictionary with status and file information
         """
         try :
-            payload ={
-            "statistics_data":statistics_data ,
-            "save_to_file":save_to_server ,
-            "filepath":None 
-            }
-
-            response =requests .post (
-            f"{self .pdf_endpoint }/statistics-pdf",
-            json =payload ,
-            timeout =30 
+            return self ._download (
+            "POST","/statistics-pdf",output_file ,"Statistics PDF",
+            json =statistics_data ,
+            params ={"save_to_file":save_to_server }
             )
-
-            if response .status_code ==200 :
-                if output_file :
-                    with open (output_file ,'wb')as f :
-                        f .write (response .content )
-                    return {
-                    "status":"success",
-                    "message":"Statistics PDF generated and saved",
-                    "file":output_file ,
-                    "size":len (response .content )
-                    }
-                else :
-                    return {
-                    "status":"success",
-                    "message":"Statistics PDF generated",
-                    "content":response .content ,
-                    "size":len (response .content )
-                    }
-            else :
-                return {
-                "status":"error",
-                "message":f"Server error: {response .status_code }",
-                "details":response .text 
-                }
-
         except Exception as e :
             return {
             "status":"error",
@@ -150,31 +182,15 @@ class PDFReportClient :
     def get_sample_application_pdf (self ,output_file :str ="sample_application.pdf")->Dict [str ,Any ]:
         """
         Download sample application PDF
-        
+
         Args:
             output_file: Local file path to save PDF
-        
+
         Returns:
             Dictionary with status information
         """
         try :
-            response =requests .get (f"{self .pdf_endpoint }/sample-application-pdf",timeout =30 )
-
-            if response .status_code ==200 :
-                with open (output_file ,'wb')as f :
-                    f .write (response .content )
-                return {
-                "status":"success",
-                "message":"Sample application PDF downloaded",
-                "file":output_file ,
-                "size":len (response .content )
-                }
-            else :
-                return {
-                "status":"error",
-                "message":f"Failed to download: {response .status_code }"
-                }
-
+            return self ._download ("GET","/sample-application-pdf",output_file ,"Sample application PDF")
         except Exception as e :
             return {
             "status":"error",
@@ -185,31 +201,15 @@ class PDFReportClient :
     def get_sample_statistics_pdf (self ,output_file :str ="sample_statistics.pdf")->Dict [str ,Any ]:
         """
         Download sample statistics PDF
-        
+
         Args:
             output_file: Local file path to save PDF
-        
+
         Returns:
             Dictionary with status information
         """
         try :
-            response =requests .get (f"{self .pdf_endpoint }/sample-statistics-pdf",timeout =30 )
-
-            if response .status_code ==200 :
-                with open (output_file ,'wb')as f :
-                    f .write (response .content )
-                return {
-                "status":"success",
-                "message":"Sample statistics PDF downloaded",
-                "file":output_file ,
-                "size":len (response .content )
-                }
-            else :
-                return {
-                "status":"error",
-                "message":f"Failed to download: {response .status_code }"
-                }
-
+            return self ._download ("GET","/sample-statistics-pdf",output_file ,"Sample statistics PDF")
         except Exception as e :
             return {
             "status":"error",
@@ -220,12 +220,12 @@ class PDFReportClient :
     def check_health (self )->Dict [str ,Any ]:
         """
         Check PDF Report service health
-        
+
         Returns:
             Service health status
         """
         try :
-            response =requests .get (f"{self .pdf_endpoint }/health",timeout =10 )
+            response =self .session .get (f"{self .pdf_endpoint }/health",timeout =10 )
             return response .json ()
 
         except Exception as e :
@@ -236,28 +236,128 @@ class PDFReportClient :
             }
 
 
+class AsyncPDFReportClient :
+    """
+    asyncio client for bulk report generation over one pooled httpx connection set
+
+    At most `concurrency` requests are in flight; 429/503 responses are retried
+    with exponential backoff, honouring Retry-After. Requires httpx.
+    """
+
+    def __init__ (
+    self ,
+    base_url :str ="http://localhost:8000",
+    concurrency :int =8 ,
+    retries :int =3 ,
+    backoff_factor :float =0.5 ,
+    timeout :float =30 
+    ):
+        try :
+            import httpx 
+        except ImportError as e :
+            raise ImportError ("AsyncPDFReportClient requires httpx (pip install httpx)")from e 
+
+        self .pdf_endpoint =f"{base_url }/pdf-reports"
+        self .retries =retries 
+        self .backoff_factor =backoff_factor 
+        self ._semaphore =asyncio .Semaphore (concurrency )
+        self .client =httpx .AsyncClient (
+        timeout =timeout ,
+        limits =httpx .Limits (max_connections =concurrency ,max_keepalive_connections =concurrency ),
+        transport =httpx .AsyncHTTPTransport (retries =retries )
+        )
+
+    async def close (self ):
+        await self .client .aclose ()
+
+    async def __aenter__ (self ):
+        return self 
+
+    async def __aexit__ (self ,*exc ):
+        await self .close ()
+
+    def _retry_delay (self ,attempt :int ,retry_after :Optional [str ])->float :
+        if retry_after and retry_after .isdigit ():
+            return float (retry_after )
+        return self .backoff_factor *(2 **attempt )
+
+    async def _download (self ,method :str ,path :str ,output_file :Optional [str ],**kwargs )->Dict [str ,Any ]:
+        async with self ._semaphore :
+            for attempt in range (self .retries +1 ):
+                async with self .client .stream (method ,f"{self .pdf_endpoint }{path }",**kwargs )as response :
+                    if response .status_code in RETRY_STATUSES and attempt <self .retries :
+                        delay =self ._retry_delay (attempt ,response .headers .get ("Retry-After"))
+                    elif response .status_code !=200 :
+                        await response .aread ()
+                        return {
+                        "status":"error",
+                        "message":f"Server error: {response .status_code }",
+                        "details":response .text 
+                        }
+                    elif output_file :
+                        size =0 
+                        with _part_file (output_file )as f :
+                            async for chunk in response .aiter_bytes (CHUNK_SIZE ):
+                                f .write (chunk )
+                                size +=len (chunk )
+                        return {"status":"success","message":"PDF generated and saved","file":output_file ,"size":size }
+                    else :
+                        content =await response .aread ()
+                        return {"status":"success","message":"PDF generated","content":content ,"size":len (content )}
+                await asyncio .sleep (delay )
+
+    async def generate_application_pdf (self ,application_data :Dict [str ,Any ],output_file :Optional [str ]=None )->Dict [str ,Any ]:
+        try :
+            return await self ._download ("POST","/application-approval-pdf",output_file ,json =application_data )
+        except Exception as e :
+            return {"status":"error","message":"Failed to generate PDF","error":str (e )}
+
+    async def generate_statistics_pdf (self ,statistics_data :Dict [str ,Any ],output_file :Optional [str ]=None )->Dict [str ,Any ]:
+        try :
+            return await self ._download ("POST","/statistics-pdf",output_file ,json =statistics_data )
+        except Exception as e :
+            return {"status":"error","message":"Failed to generate statistics PDF","error":str (e )}
+
+    async def generate_many (self ,applications :List [Dict [str ,Any ]],output_dir :str ="./reports")->List [Dict [str ,Any ]]:
+        """
+        Generate approval PDFs for many applications concurrently
+
+        Args:
+            applications: application_data payloads
+            output_dir: Directory the PDFs are streamed into
+
+        Returns:
+            One result dict per application, in input order
+        """
+        def output_file (index :int ,data :Dict [str ,Any ])->str :
+            ident =data .get ('application',{}).get ('id')or data .get ('customer',{}).get ('id')or index 
+            return os .path .join (output_dir ,f"application_{index :05d}_{ident }.pdf")
+
+        return await asyncio .gather (*(
+        self .generate_application_pdf (data ,output_file (i ,data ))
+        for i ,data in enumerate (applications )
+        ))
+
 
 def download_sample_reports (output_dir :str ="./reports"):
-    """Download sample PDFs for testing"""
     """
-    Download sample PDFs for testing
-    
+    Download sample PDFs for testing, both in parallel over one pooled session
+
     Args:
         output_dir: Directory to save reports
     """
 
     Path (output_dir ).mkdir (parents =True ,exist_ok =True )
 
-    client =PDFReportClient ()
-
     print (f"Downloading sample reports to {output_dir }...")
 
+    with PDFReportClient ()as client ,ThreadPoolExecutor (max_workers =2 )as pool :
+        app_future =pool .submit (client .get_sample_application_pdf ,f"{output_dir }/sample_application.pdf")
+        stats_future =pool .submit (client .get_sample_statistics_pdf ,f"{output_dir }/sample_statistics.pdf")
+        app_result =app_future .result ()
+        stats_result =stats_future .result ()
 
-    app_result =client .get_sample_application_pdf (f"{output_dir }/sample_application.pdf")
     print (f"Application PDF: {app_result ['message']}")
-
-
-    stats_result =client .get_sample_statistics_pdf (f"{output_dir }/sample_statistics.pdf")
     print (f"Statistics PDF: {stats_result ['message']}")
 
     return {
@@ -353,10 +453,10 @@ output_dir :str ="./reports"
     }
     }
 
-    client =PDFReportClient ()
     output_file =f"{output_dir }/application_{customer_id }_{datetime .now ().strftime ('%Y%m%d_%H%M%S')}.pdf"
 
-    result =client .generate_application_pdf (application_data ,output_file )
+    with PDFReportClient ()as client :
+        result =client .generate_application_pdf (application_data ,output_file )
 
     return result 
 
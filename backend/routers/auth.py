@@ -4,6 +4,9 @@ from typing import Optional
 from datetime import datetime ,timedelta 
 import secrets 
 
+from sqlalchemy import case ,or_ 
+from sqlalchemy .exc import IntegrityError 
+
 from database .models import get_session ,User ,AuthSession 
 from utils .auth_utils import create_password ,verify_password 
 
@@ -50,19 +53,25 @@ def get_db ():
 
 
 def _find_user (db ,username_or_email :str )->Optional [User ]:
-    u =db .query (User ).filter (User .username ==username_or_email ).first ()
-    if not u :
-        u =db .query (User ).filter (User .email ==username_or_email ).first ()
-    return u 
+    """Resolve a login identifier in one round-trip, preferring a username match."""
+    return (
+    db .query (User )
+    .filter (or_ (User .username ==username_or_email ,User .email ==username_or_email ))
+    .order_by (case ((User .username ==username_or_email ,0 ),else_ =1 ))
+    .first ()
+    )
+
+
+def _conflict_detail (db ,data :RegisterRequest )->str :
+    if db .query (User .id ).filter (User .username ==data .username ).first ():
+        return "Username already exists"
+    if db .query (User .id ).filter (User .email ==str (data .email )).first ():
+        return "Email already exists"
+    return "User already exists"
 
 
 @router .post ("/register",response_model =RegisterResponse )
 def register (data :RegisterRequest ,db =Depends (get_db )):
-    if db .query (User ).filter (User .username ==data .username ).first ():
-        raise HTTPException (status_code =409 ,detail ="Username already exists")
-    if db .query (User ).filter (User .email ==data .email ).first ():
-        raise HTTPException (status_code =409 ,detail ="Email already exists")
-
     pwd_hash ,salt =create_password (data .password )
     user =User (
     user_id =f"U-{secrets .token_hex (6 )}",
@@ -77,15 +86,20 @@ def register (data :RegisterRequest ,db =Depends (get_db )):
     updated_at =datetime .utcnow (),
     )
     db .add (user )
-    db .commit ()
-    db .refresh (user )
-
-    return RegisterResponse (
-    user_id =user .id ,
-    username =user .username ,
-    email =user .email ,
-    created_at =user .created_at ,
-    )
+    try :
+        db .flush ()
+        response =RegisterResponse (
+        user_id =user .id ,
+        username =user .username ,
+        email =user .email ,
+        created_at =user .created_at ,
+        )
+        db .commit ()
+    except IntegrityError :
+        db .rollback ()
+        raise HTTPException (status_code =409 ,detail =_conflict_detail (db ,data ))
+
+    return response 
 
 
 @router .post ("/login",response_model =LoginResponse )
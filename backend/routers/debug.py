@@ -0,0 +1,70 @@
+"""
+Debug Router
+Opt-in, token-protected diagnostics for live workers
+"""
+
+import asyncio 
+import hmac 
+from datetime import datetime 
+
+from fastapi import APIRouter ,Header ,HTTPException ,Query ,Response 
+from typing import Optional 
+
+from utils .sampling_profiler import (
+PROFILER_ENABLED ,
+PROFILER_MAX_SECONDS ,
+PROFILER_INTERVAL_MS ,
+PROFILER_TOKEN ,
+ProfilerBusy ,
+profiler ,
+to_collapsed ,
+to_speedscope ,
+)
+
+router =APIRouter (prefix ="/debug",tags =["Debug"])
+
+
+def _authorize (authorization :Optional [str ]):
+    if not PROFILER_ENABLED or not PROFILER_TOKEN :
+        raise HTTPException (status_code =404 ,detail ="Not Found")
+    scheme ,_ ,token =(authorization or "").partition (" ")
+    if scheme .lower ()!="bearer"or not hmac .compare_digest (token .encode (),PROFILER_TOKEN .encode ()):
+        raise HTTPException (status_code =401 ,detail ="Invalid profiler token",headers ={"WWW-Authenticate":"Bearer"})
+
+
+@router .get ("/profile")
+async def profile (
+seconds :float =Query (10.0 ,gt =0 ,le =PROFILER_MAX_SECONDS ),
+format :str =Query ("collapsed",pattern ="^(collapsed|speedscope)$"),
+interval_ms :float =Query (PROFILER_INTERVAL_MS ,ge =1.0 ,le =1000.0 ),
+include_idle :bool =False ,
+authorization :Optional [str ]=Header (None )
+)->Response :
+    """
+    Sample every thread of this worker for `seconds` and return the profile
+
+    Args:
+        seconds: Sampling duration, capped by PROFILER_MAX_SECONDS
+        format: "collapsed" (flamegraph.pl / speedscope import) or "speedscope" JSON
+        interval_ms: Sampling interval
+        include_idle: Keep stacks parked in waits/selects (dropped by default)
+
+    Returns:
+        Profile file; sample count and measured sampler overhead are in X-Profile-* headers
+    """
+    _authorize (authorization )
+    try :
+        result =await asyncio .to_thread (profiler .sample ,seconds ,interval_ms ,include_idle )
+    except ProfilerBusy as e :
+        raise HTTPException (status_code =409 ,detail =str (e ))
+
+    stamp =datetime .now ().strftime ('%Y%m%d_%H%M%S')
+    headers ={
+    "X-Profile-Samples":str (result ["samples"]),
+    "X-Profile-Overhead":f"{result ['overhead']:.4f}",
+    }
+    if format =="speedscope":
+        headers ["Content-Disposition"]=f"attachment; filename=profile_{stamp }.speedscope.json"
+        return Response (to_speedscope (result ,f"profile {stamp }"),media_type ="application/json",headers =headers )
+    headers ["Content-Disposition"]=f"attachment; filename=profile_{stamp }.collapsed.txt"
+    return Response (to_collapsed (result ),media_type ="text/plain",headers =headers )
@@ -1,8 +1,9 @@
 
-from fastapi import APIRouter 
+from fastapi import APIRouter ,Header 
 from pydantic import BaseModel 
-from typing import Dict ,Any ,Optional 
+from typing import Dict ,Any ,List ,Optional ,Tuple 
 import re 
+import time 
 
 from fastapi .concurrency import run_in_threadpool 
 
@@ -16,6 +17,11 @@ from agents .underwriting_agent import underwrite_application
 from agents .risk_agent import assess_risk 
 from agents .offer_generation_agent import generate_offer 
 from agents .feedback_agent import generate_feedback 
+from agents .reason_codes import render_reasons ,with_reason_text 
+
+from database .decision_writer import decision_writer 
+from database .models import IntentDetection ,EmotionAnalysis ,PersuasionScore ,RiskAssessment ,FraudDetection ,Offer 
+from utils .metrics import stage_timer ,STAGE_SECONDS 
 
 router =APIRouter (prefix ="/orchestrator",tags =["Orchestrator"])
 
@@ -114,7 +120,7 @@ intent_conf :float
         else :
             return "We need to review a few more details before finalizing your application. This is standard procedure."
     elif decision =="DECLINED":
-        reasons =underwriting_result .get ("reasons",[])
+        reasons =render_reasons (underwriting_result )
         reason_text =", ".join (reasons )if reasons else "policy constraints"
         return (
         f"I understand this may be disappointing. Unfortunately, we're unable to approve the loan at this time "
@@ -181,37 +187,131 @@ offer :Dict [str ,Any ],
     return avg 
 
 
+def _as_int_id (value :Any )->Optional [int ]:
+    if isinstance (value ,bool ):
+        return None 
+    if isinstance (value ,int ):
+        return value 
+    if isinstance (value ,str )and value .isdigit ():
+        return int (value )
+    return None 
+
+
+def _decision_records (
+text :str ,
+customer_id :Optional [str ],
+mapped_intent :Dict ,
+emotion_label :Optional [str ],
+emotion_score :Optional [float ],
+sales :Dict ,
+risk :Dict ,
+offer :Dict ,
+application_data :Dict ,
+)->List [Tuple [Any ,Dict [str ,Any ]]]:
+    """Build audit rows for the write-behind decision writer."""
+    user_key =str (customer_id or application_data .get ("customer_id")or "anonymous")
+    records =[
+    (IntentDetection ,{
+    "user_id":user_key ,
+    "message":text ,
+    "detected_intent":mapped_intent .get ("label"),
+    "intent_confidence":float (mapped_intent .get ("score")or 0.0 ),
+    }),
+    (EmotionAnalysis ,{
+    "user_id":user_key ,
+    "message":text ,
+    "detected_emotion":emotion_label ,
+    "emotion_score":float (emotion_score or 0.0 ),
+    }),
+    ]
+
+    if isinstance (sales ,dict )and sales :
+        records .append ((PersuasionScore ,{
+        "user_id":user_key ,
+        "intent_confidence":float (mapped_intent .get ("score")or 0.0 ),
+        "sentiment_score":float ((sales .get ("sentiment")or {}).get ("score")or 0.0 ),
+        "urgency":int (sales .get ("urgency_raw")or 0 ),
+        "hesitation":int (sales .get ("hesitation")or 0 ),
+        "message_length":len (text ),
+        "conversion_bucket":sales .get ("tone_summary"),
+        }))
+
+    loan_request_id =_as_int_id (application_data .get ("loan_request_id"))
+    if loan_request_id is not None and risk :
+        records .append ((RiskAssessment ,{
+        "loan_request_id":loan_request_id ,
+        "risk_tier":risk .get ("risk_band"),
+        "risk_score":risk .get ("risk_score"),
+        "confidence":None ,
+        "delinquency_12m":application_data .get ("delinquency_12m"),
+        "outstanding_debt":application_data .get ("outstanding_debt"),
+        "num_hard_inquiries":application_data .get ("num_hard_inquiries"),
+        }))
+    if loan_request_id is not None and offer .get ("offer_available")is True :
+        records .append ((Offer ,{
+        "loan_request_id":loan_request_id ,
+        "recommended_rate":offer .get ("interest_rate"),
+        "recommended_tenure":offer .get ("tenure_months"),
+        "max_amount":offer .get ("loan_amount"),
+        "interest_type":None ,
+        "offer_expires_at":None ,
+        }))
+
+    user_id =_as_int_id (application_data .get ("user_id"))
+    fraud_score =application_data .get ("fraud_score")
+    if user_id is not None and isinstance (fraud_score ,(int ,float )):
+        records .append ((FraudDetection ,{
+        "user_id":user_id ,
+        "fraud_probability":float (fraud_score ),
+        "status":"flagged"if fraud_score >=0.7 else "clear",
+        "details":None ,
+        }))
+
+    return records 
+
+
 @router .post ("/process")
-async def master_orchestrator (payload :OrchestratorRequest ):
+async def master_orchestrator (
+payload :OrchestratorRequest ,
+x_debug_timings :Optional [str ]=Header (None )
+):
+    started =time .perf_counter ()
+    timings :Dict [str ,float ]={}
     text =payload .message 
     application_data =payload .application_data or {}
     documents =payload .documents or {}
 
 
-    intent_result =await run_in_threadpool (predict_intent ,text )
-    emotion_result =await run_in_threadpool (analyze_emotion ,text )
+    with stage_timer ("intent",timings ):
+        intent_result =await run_in_threadpool (predict_intent ,text )
+    with stage_timer ("emotion",timings ):
+        emotion_result =await run_in_threadpool (analyze_emotion ,text )
 
 
     mapped_intent =map_intent_label (intent_result )
 
-    sales =await analyze_message ({"message":text })
+    with stage_timer ("sales",timings ):
+        sales =await analyze_message ({"message":text })
 
 
     doc_payload =dict (documents )
     if "name"not in doc_payload and application_data .get ("name"):
         doc_payload ["name"]=application_data ["name"]
 
-    verification =(
-    await run_in_threadpool (verify_documents ,doc_payload )if doc_payload else {}
-    )
+    verification ={}
+    if doc_payload :
+        with stage_timer ("verification",timings ):
+            verification =await run_in_threadpool (verify_documents ,doc_payload )
 
 
 
     if verification .get ("status")=="verified"and application_data :
-        underwriting =await run_in_threadpool (underwrite_application ,application_data )
+        with stage_timer ("underwriting",timings ):
+            underwriting =await run_in_threadpool (underwrite_application ,application_data )
     elif application_data and not verification :
 
-        underwriting =await run_in_threadpool (underwrite_application ,application_data )
+        with stage_timer ("underwriting",timings ):
+            underwriting =await run_in_threadpool (underwrite_application ,application_data )
     else :
 
         underwriting ={
@@ -224,11 +324,12 @@ async def master_orchestrator (payload :OrchestratorRequest ):
 
 
     if application_data and verification and underwriting :
-        risk =assess_risk (
-        verification_result =verification ,
-        underwriting_result =underwriting ,
-        application_data =application_data ,
-        )
+        with stage_timer ("risk",timings ):
+            risk =assess_risk (
+            verification_result =verification ,
+            underwriting_result =underwriting ,
+            application_data =application_data ,
+            )
     else :
         risk ={}
 
@@ -240,11 +341,12 @@ async def master_orchestrator (payload :OrchestratorRequest ):
     and (underwriting .get ("decision")=="APPROVED")
     and (risk .get ("risk_band")!="HIGH")
     ):
-        offer =generate_offer (
-        application_data =application_data ,
-        underwriting_result =underwriting ,
-        risk_result =risk ,
-        )
+        with stage_timer ("offer",timings ):
+            offer =generate_offer (
+            application_data =application_data ,
+            underwriting_result =underwriting ,
+            risk_result =risk ,
+            )
     else :
 
         blocked_by =None 
@@ -309,12 +411,13 @@ async def master_orchestrator (payload :OrchestratorRequest ):
 
     if verification and underwriting and risk :
 
-        feedback =generate_feedback (
-        verification_result =verification ,
-        underwriting_result =underwriting ,
-        risk_result =risk ,
-        emotion =emotion_label 
-        )
+        with stage_timer ("feedback",timings ):
+            feedback =generate_feedback (
+            verification_result =verification ,
+            underwriting_result =underwriting ,
+            risk_result =risk ,
+            emotion =emotion_label 
+            )
     else :
         feedback ={}
 
@@ -394,15 +497,16 @@ async def master_orchestrator (payload :OrchestratorRequest ):
     "emotion":emotion_payload ,
     "sales":sales ,
     "verification":verification ,
-    "underwriting":underwriting ,
-    "risk":risk ,
+    "underwriting":with_reason_text (underwriting ),
+    "risk":with_reason_text (risk ),
     "offer":offer ,
     "feedback":feedback ,
     "application_data":masked_app_data ,
     "documents":masked_docs ,
     }
 
-    decision =mistral_think (str (context ))
+    with stage_timer ("mistral_think",timings ):
+        decision =mistral_think (str (context ))
 
     reply =None 
     actions =None 
@@ -576,4 +680,22 @@ async def master_orchestrator (payload :OrchestratorRequest ):
             "score":float (emotion_score or 0.5 )
             }
 
+    decision_writer .submit (_decision_records (
+    text ,
+    payload .customer_id ,
+    mapped_intent ,
+    emotion_label ,
+    emotion_score ,
+    sales ,
+    risk ,
+    offer ,
+    application_data ,
+    ))
+
+    total =time .perf_counter ()-started 
+    STAGE_SECONDS .observe (total ,stage ="total")
+    if x_debug_timings and x_debug_timings .lower ()not in ("0","false","no"):
+        timings ["total"]=round (total *1000 ,3 )
+        response_payload ["timings"]=timings 
+
     return response_payload 
@@ -3,20 +3,96 @@ PDF Report Router
 API endpoints for generating PDF reports for loan approvals and statistics
 """
 
-from fastapi import APIRouter ,HTTPException ,Response 
-from fastapi .responses import FileResponse ,StreamingResponse 
-from typing import Dict ,Any ,Optional 
-import io 
+from fastapi import APIRouter ,Body ,HTTPException ,Request ,Response 
+from fastapi .concurrency import run_in_threadpool 
+from fastapi .responses import FileResponse 
+from starlette .background import BackgroundTask 
+from typing import Dict ,Any ,List ,Optional 
 import os 
-from datetime import datetime 
+from datetime import date ,datetime ,timedelta 
 
-from utils .pdf_generator import PDFReportGenerator ,generate_application_pdf ,generate_statistics_pdf 
+from database .models import get_session 
+from services .statistics_service import get_statistics ,rebuild_rollups 
+from utils .pdf_render_pool import pdf_render_pool ,PDFRenderQueueFull 
+from utils .pdf_batch_jobs import pdf_job_manager ,PDF_JOB_MAX_BATCH 
+from utils .pdf_cache import pdf_report_cache ,report_key ,PDF_CACHE_ENABLED 
+from utils .report_storage import report_storage ,ReportPathError 
 
 router =APIRouter (prefix ="/pdf-reports",tags =["PDF Reports"])
 
 
+def _render_unavailable (e :PDFRenderQueueFull )->HTTPException :
+    return HTTPException (
+    status_code =503 ,
+    detail ="PDF rendering is at capacity, please retry shortly",
+    headers ={"Retry-After":str (e .retry_after )}
+    )
+
+
+def _discard (filepath :str ):
+    try :
+        os .remove (filepath )
+    except FileNotFoundError :
+        pass 
+
+
+def _etag_matches (if_none_match :Optional [str ],etag :str )->bool :
+    if not if_none_match :
+        return False 
+    candidates =[c .strip ()for c in if_none_match .split (",")]
+    return "*"in candidates or any ((c [2 :]if c .startswith ("W/")else c )==etag for c in candidates )
+
+
+async def _stream_pdf (request :Request ,kind :str ,data :Dict [str ,Any ],filename :str )->Response :
+    """
+    Serve a report from the content-addressed cache, rendering it on a miss
+
+    The ETag is the cache key, so a matching If-None-Match is answered with
+    304 before any rendering or disk access. With the cache disabled the
+    worker renders into a spool file that is deleted once streamed. Either
+    way ReportLab emits the document in one write at save(), so the file is
+    streamed back in chunks and the API process never buffers the whole PDF.
+    """
+    if not PDF_CACHE_ENABLED :
+        filepath =pdf_render_pool .spool_path (kind )
+        try :
+            await pdf_render_pool .render_to_file (kind ,data ,filepath )
+        except BaseException :
+            _discard (filepath )
+            raise 
+        return FileResponse (
+        filepath ,
+        media_type ='application/pdf',
+        filename =filename ,
+        background =BackgroundTask (_discard ,filepath )
+        )
+
+    key =report_key (kind ,data )
+    headers ={"ETag":f'"{key }"',"Cache-Control":"private, no-cache"}
+    if _etag_matches (request .headers .get ("if-none-match"),headers ["ETag"]):
+        return Response (status_code =304 ,headers =headers )
+
+    filepath =await pdf_report_cache .get_or_render (kind ,data ,key )
+    return FileResponse (filepath ,media_type ='application/pdf',filename =filename ,headers =headers )
+
+
+async def _save_pdf (kind :str ,data :Dict [str ,Any ],name :Optional [str ],label :Optional [str ]=None )->FileResponse :
+    """Render into the report store under a caller-chosen relative name or a generated one"""
+    try :
+        path =await report_storage .save (kind ,data ,name or report_storage .generate_name (kind ,label ))
+    except ReportPathError as e :
+        raise HTTPException (status_code =400 ,detail =str (e ))
+    return FileResponse (
+    path ,
+    media_type ='application/pdf',
+    filename =path .name ,
+    headers ={"X-Report-Name":str (path .relative_to (report_storage .root ))}
+    )
+
+
 @router .post ("/application-approval-pdf")
 async def generate_application_approval_pdf (
+request :Request ,
 application_data :Dict [str ,Any ],
 save_to_file :bool =False ,
 filepath :Optional [str ]=None 
@@ -34,10 +110,10 @@ filepath :Optional [str ]=None
             - offer: {approved_amount, interest_rate, tenure, emi, ...} (if approved)
             - feedback: {assistant_reply, actions, ...}
         save_to_file: Whether to save PDF to disk (default: False)
-        filepath: Path to save PDF if save_to_file is True
+        filepath: Name (relative to the report store) to save under; generated when omitted
     
     Returns:
-        PDF file as StreamingResponse or saved file response
+        PDF file streamed from a spool file, or the saved file response
     """
     try :
 
@@ -46,37 +122,25 @@ filepath :Optional [str ]=None
         if not application_data .get ('application'):
             raise HTTPException (status_code =400 ,detail ="Missing application data")
 
-
-        generator =PDFReportGenerator ()
-
         if save_to_file :
-            if not filepath :
-
-                customer_name =application_data .get ('customer',{}).get ('name','Application').replace (' ','_')
-                filepath =f"./reports/approval_{customer_name }_{datetime .now ().strftime ('%Y%m%d_%H%M%S')}.pdf"
-
-
-            os .makedirs (os .path .dirname (filepath )if os .path .dirname (filepath )else '.',exist_ok =True )
-
-            generator .generate_approval_report (application_data ,filepath )
-            return FileResponse (filepath ,media_type ='application/pdf',
-            filename =os .path .basename (filepath ))
+            customer_name =application_data .get ('customer',{}).get ('name','Application')
+            return await _save_pdf ("approval",application_data ,filepath ,customer_name )
         else :
 
-            pdf_buffer =generator .generate_approval_report (application_data )
+            return await _stream_pdf (request ,"approval",application_data ,"approval_report.pdf")
 
-            return StreamingResponse (
-            iter ([pdf_buffer .getvalue ()]),
-            media_type ='application/pdf',
-            headers ={"Content-Disposition":"attachment; filename=approval_report.pdf"}
-            )
 
+    except PDFRenderQueueFull as e :
+        raise _render_unavailable (e )
+    except HTTPException :
+        raise 
     except Exception as e :
         raise HTTPException (status_code =500 ,detail =f"Error generating PDF: {str (e )}")
 
 
 @router .post ("/statistics-pdf")
 async def generate_statistics_pdf_endpoint (
+request :Request ,
 statistics_data :Dict [str ,Any ],
 save_to_file :bool =False ,
 filepath :Optional [str ]=None 
@@ -97,45 +161,202 @@ filepath :Optional [str ]=None
             - fraud_stats: {flagged, confirmed, false_positives, ...}
             - metrics: {avg_decision_confidence, avg_processing_time, system_uptime, ...}
         save_to_file: Whether to save PDF to disk (default: False)
-        filepath: Path to save PDF if save_to_file is True
+        filepath: Name (relative to the report store) to save under; generated when omitted
     
     Returns:
-        PDF file as StreamingResponse or saved file response
+        PDF file streamed from a spool file, or the saved file response
     """
     try :
 
         if 'total_applications'not in statistics_data :
             raise HTTPException (status_code =400 ,detail ="Missing total_applications in statistics data")
 
-        generator =PDFReportGenerator ()
-
         if save_to_file :
-            if not filepath :
+            return await _save_pdf ("statistics",statistics_data ,filepath )
+        else :
 
-                filepath =f"./reports/statistics_{datetime .now ().strftime ('%Y%m%d_%H%M%S')}.pdf"
+            return await _stream_pdf (request ,"statistics",statistics_data ,"statistics_report.pdf")
 
 
-            os .makedirs (os .path .dirname (filepath )if os .path .dirname (filepath )else '.',exist_ok =True )
+    except PDFRenderQueueFull as e :
+        raise _render_unavailable (e )
+    except HTTPException :
+        raise 
+    except Exception as e :
+        raise HTTPException (status_code =500 ,detail =f"Error generating PDF: {str (e )}")
+
+
+def _period_statistics (start_date :Optional [date ],end_date :Optional [date ])->Dict [str ,Any ]:
+    end_date =end_date or datetime .utcnow ().date ()
+    start_date =start_date or end_date -timedelta (days =29 )
+    if start_date >end_date :
+        raise HTTPException (status_code =400 ,detail ="start_date must be on or before end_date")
+
+    db =get_session ()
+    try :
+        return get_statistics (db ,start_date ,end_date )
+    finally :
+        db .close ()
+
+
+@router .get ("/statistics")
+async def statistics_summary (
+start_date :Optional [date ]=None ,
+end_date :Optional [date ]=None 
+)->Dict [str ,Any ]:
+    """
+    Compute report statistics for a date range from the decision tables
+
+    Args:
+        start_date: First day of the period (default: 29 days before end_date)
+        end_date: Last day of the period, inclusive (default: today, UTC)
+
+    Returns:
+        statistics_data in the shape accepted by /statistics-pdf
+    """
+    try :
+        return await run_in_threadpool (_period_statistics ,start_date ,end_date )
+    except HTTPException :
+        raise 
+    except Exception as e :
+        raise HTTPException (status_code =500 ,detail =f"Error computing statistics: {str (e )}")
 
-            generator .generate_statistics_report (statistics_data ,filepath )
-            return FileResponse (filepath ,media_type ='application/pdf',
-            filename =os .path .basename (filepath ))
-        else :
 
-            pdf_buffer =generator .generate_statistics_report (statistics_data )
+def _rebuild_statistics (start_date :date ,end_date :date )->int :
+    if start_date >end_date :
+        raise HTTPException (status_code =400 ,detail ="start_date must be on or before end_date")
+    db =get_session ()
+    try :
+        return rebuild_rollups (db ,start_date ,end_date )
+    finally :
+        db .close ()
+
+
+@router .post ("/statistics/rebuild")
+async def rebuild_statistics (start_date :date ,end_date :date )->Dict [str ,Any ]:
+    """
+    Re-aggregate the daily statistics rollups for a date range
+
+    Imports through database/bulk_io.py invalidate the days they touch; use
+    this after rows for past days were written any other way (manual SQL,
+    restores, late corrections).
+    """
+    try :
+        days =await run_in_threadpool (_rebuild_statistics ,start_date ,end_date )
+    except HTTPException :
+        raise 
+    except Exception as e :
+        raise HTTPException (status_code =500 ,detail =f"Error rebuilding statistics: {str (e )}")
+    return {"start_date":start_date .isoformat (),"end_date":end_date .isoformat (),"days_materialized":days }
+
+
+@router .get ("/statistics-pdf")
+async def generate_period_statistics_pdf (
+request :Request ,
+start_date :Optional [date ]=None ,
+end_date :Optional [date ]=None 
+)->Response :
+    """
+    Generate a statistics PDF computed directly from the database for a date range
+    """
+    try :
+        statistics_data =await run_in_threadpool (_period_statistics ,start_date ,end_date )
 
-            return StreamingResponse (
-            iter ([pdf_buffer .getvalue ()]),
-            media_type ='application/pdf',
-            headers ={"Content-Disposition":"attachment; filename=statistics_report.pdf"}
-            )
+        return await _stream_pdf (request ,"statistics",statistics_data ,"statistics_report.pdf")
 
+    except PDFRenderQueueFull as e :
+        raise _render_unavailable (e )
+    except HTTPException :
+        raise 
     except Exception as e :
         raise HTTPException (status_code =500 ,detail =f"Error generating PDF: {str (e )}")
 
 
+@router .post ("/jobs",status_code =202 )
+async def submit_pdf_batch_job (
+applications :List [Dict [str ,Any ]]=Body (...,embed =True )
+)->Dict [str ,Any ]:
+    """
+    Submit a batch of approval reports to render in the background
+
+    Args:
+        applications: List of application_data payloads, as accepted by /application-approval-pdf
+
+    Returns:
+        Job id and initial status; poll /jobs/{job_id} for progress
+    """
+    if not applications :
+        raise HTTPException (status_code =400 ,detail ="No applications submitted")
+    if len (applications )>PDF_JOB_MAX_BATCH :
+        raise HTTPException (status_code =413 ,detail =f"Batch exceeds {PDF_JOB_MAX_BATCH } applications")
+    for i ,application_data in enumerate (applications ):
+        if not application_data .get ('customer')or not application_data .get ('application'):
+            raise HTTPException (status_code =400 ,detail =f"Application {i } is missing customer or application data")
+
+    job =pdf_job_manager .submit (applications )
+    return job .to_dict ()
+
+
+def _get_job (job_id :str ):
+    job =pdf_job_manager .get (job_id )
+    if job is None :
+        raise HTTPException (status_code =404 ,detail ="Job not found or expired")
+    return job 
+
+
+@router .get ("/jobs/{job_id}")
+async def pdf_batch_job_status (job_id :str )->Dict [str ,Any ]:
+    """
+    Progress of a batch job
+    """
+    return _get_job (job_id ).to_dict ()
+
+
+@router .get ("/jobs/{job_id}/download")
+async def download_pdf_batch_job (job_id :str )->Response :
+    """
+    Download all rendered reports of a finished job as a ZIP archive
+    """
+    job =_get_job (job_id )
+    if job .zip_path is None :
+        if job .finished_at is None :
+            raise HTTPException (status_code =409 ,detail =f"Job is {job .status }, results not ready")
+        raise HTTPException (status_code =404 ,detail ="Job produced no reports")
+    return FileResponse (job .zip_path ,media_type ='application/zip',filename =f"reports_{job .job_id }.zip")
+
+
+@router .get ("/jobs/{job_id}/files/{index}")
+async def download_pdf_batch_file (job_id :str ,index :int )->Response :
+    """
+    Download a single rendered report from a job by its position in the batch
+    """
+    job =_get_job (job_id )
+    if index <0 or index >=job .total :
+        raise HTTPException (status_code =404 ,detail ="No such document in job")
+    if index in job .errors :
+        raise HTTPException (status_code =422 ,detail =f"Rendering failed: {job .errors [index ]}")
+    filepath =job .files .get (index )
+    if filepath is None :
+        raise HTTPException (status_code =409 ,detail ="Document not rendered yet")
+    return FileResponse (filepath ,media_type ='application/pdf',filename =os .path .basename (filepath ))
+
+
+@router .get ("/saved/{name:path}")
+async def download_saved_report (name :str )->Response :
+    """
+    Download a report previously saved with save_to_file, by its name in the report store
+    """
+    try :
+        path =report_storage .resolve (name )
+    except ReportPathError as e :
+        raise HTTPException (status_code =400 ,detail =str (e ))
+    if not path .is_file ():
+        raise HTTPException (status_code =404 ,detail ="Report not found")
+    return FileResponse (path ,media_type ='application/pdf',filename =path .name )
+
+
 @router .get ("/sample-application-pdf")
-async def sample_application_pdf ()->Response :
+async def sample_application_pdf (request :Request )->Response :
     """
     Generate a sample PDF report for testing purposes
     """
@@ -195,21 +416,19 @@ async def sample_application_pdf ()->Response :
         }
         }
 
-        generator =PDFReportGenerator ()
-        pdf_buffer =generator .generate_approval_report (sample_data )
+        return await _stream_pdf (request ,"approval",sample_data ,"sample_approval_report.pdf")
 
-        return StreamingResponse (
-        iter ([pdf_buffer .getvalue ()]),
-        media_type ='application/pdf',
-        headers ={"Content-Disposition":"attachment; filename=sample_approval_report.pdf"}
-        )
 
+    except PDFRenderQueueFull as e :
+        raise _render_unavailable (e )
+    except HTTPException :
+        raise 
     except Exception as e :
         raise HTTPException (status_code =500 ,detail =f"Error generating sample PDF: {str (e )}")
 
 
 @router .get ("/sample-statistics-pdf")
-async def sample_statistics_pdf ()->Response :
+async def sample_statistics_pdf (request :Request )->Response :
     """
     Generate a sample statistics PDF report for testing purposes
     """
@@ -253,15 +472,13 @@ async def sample_statistics_pdf ()->Response :
         }
         }
 
-        generator =PDFReportGenerator ()
-        pdf_buffer =generator .generate_statistics_report (sample_stats )
+        return await _stream_pdf (request ,"statistics",sample_stats ,"sample_statistics_report.pdf")
 
-        return StreamingResponse (
-        iter ([pdf_buffer .getvalue ()]),
-        media_type ='application/pdf',
-        headers ={"Content-Disposition":"attachment; filename=sample_statistics_report.pdf"}
-        )
 
+    except PDFRenderQueueFull as e :
+        raise _render_unavailable (e )
+    except HTTPException :
+        raise 
     except Exception as e :
         raise HTTPException (status_code =500 ,detail =f"Error generating sample PDF: {str (e )}")
 
@@ -1,12 +1,12 @@
 import os 
-import joblib 
+from ml .artifacts import load_artifact 
 import numpy as np 
 from fastapi import APIRouter 
 
 BASE =os .path .dirname (os .path .dirname (__file__ ))
 MODEL =os .path .join (BASE ,"ml","supervisor_model.joblib")
 
-bundle =joblib .load (MODEL )
+bundle =load_artifact (MODEL )
 
 vec =bundle ["vectorizer"]
 clf =bundle ["classifier"]
@@ -0,0 +1,122 @@
+import json 
+import time 
+from typing import Any ,Dict 
+
+from fastapi import APIRouter ,HTTPException ,Request 
+from fastapi .concurrency import run_in_threadpool 
+from pydantic import BaseModel 
+
+from agents .batch_engine import evaluate_batch ,summarize ,to_columns 
+from agents .rule_engine import policy_store 
+from agents .scenario_engine import evaluate_scenarios 
+from utils .metrics import registry 
+
+router =APIRouter (
+prefix ="/agent/underwriting",
+tags =["Underwriting"]
+)
+
+ARROW_STREAM ="application/vnd.apache.arrow.stream"
+
+BATCH_ROWS =registry .counter ("underwriting_batch_rows","Applications evaluated by the batch underwriting endpoint")
+BATCH_SECONDS =registry .histogram ("underwriting_batch_seconds","Time spent evaluating a batch underwriting request")
+WHAT_IF_SCENARIOS =registry .counter ("underwriting_what_if_scenarios","Scenarios evaluated by the what-if endpoint")
+
+
+class WhatIfRequest (BaseModel ):
+    application_data :Dict [str ,Any ]
+    grid :Dict [str ,Any ]
+    verified :bool =True 
+
+
+def _read_table (body :bytes ,content_type :str ):
+    if content_type .startswith (ARROW_STREAM ):
+        try :
+            import pyarrow .ipc as ipc 
+        except ImportError :
+            raise HTTPException (status_code =415 ,detail ="Arrow input requires pyarrow")
+        return ipc .open_stream (body ).read_all ()
+    try :
+        payload =json .loads (body )
+    except ValueError :
+        raise HTTPException (status_code =400 ,detail ="Body must be JSON or an Arrow IPC stream")
+    columns =payload .get ("columns")if isinstance (payload ,dict )else None 
+    if not isinstance (columns ,dict ):
+        raise HTTPException (status_code =422 ,detail ="Expected {\"columns\": {name: [values, ...]}}")
+    return columns 
+
+
+def _run_batch (body :bytes ,content_type :str ,return_columns :bool ):
+    started =time .perf_counter ()
+    table =_read_table (body ,content_type )
+    try :
+        result =evaluate_batch (table )
+    except (ValueError ,TypeError )as e :
+        raise HTTPException (status_code =422 ,detail =str (e ))
+    response ={"summary":summarize (result )}
+    if return_columns :
+        response ["columns"]=to_columns (result )
+    elapsed =time .perf_counter ()-started 
+    BATCH_ROWS .inc (response ["summary"]["rows"])
+    BATCH_SECONDS .observe (elapsed )
+    response ["elapsed_ms"]=round (elapsed *1000 ,2 )
+    return response 
+
+
+@router .post ("/batch")
+async def underwrite_batch (request :Request ,return_columns :bool =False ):
+    """
+    Underwrite and risk-score a whole portfolio in one vectorized pass
+
+    The body is columnar: JSON {"columns": {"monthly_income": [...], ...}} or
+    an Arrow IPC stream (Content-Type: application/vnd.apache.arrow.stream)
+    when pyarrow is installed. Results match underwrite_application and
+    assess_risk row for row; pass return_columns=true for per-row decisions,
+    scores and reason bitmasks alongside the portfolio summary.
+    """
+    body =await request .body ()
+    content_type =request .headers .get ("content-type","")
+    return await run_in_threadpool (_run_batch ,body ,content_type ,return_columns )
+
+
+def _run_what_if (payload :WhatIfRequest ,return_surface :bool ):
+    started =time .perf_counter ()
+    try :
+        response =evaluate_scenarios (payload .application_data ,payload .grid ,payload .verified ,return_surface )
+    except (ValueError ,TypeError )as e :
+        raise HTTPException (status_code =422 ,detail =str (e ))
+    WHAT_IF_SCENARIOS .inc (response ["scenarios"])
+    response ["elapsed_ms"]=round ((time .perf_counter ()-started )*1000 ,2 )
+    return response 
+
+
+@router .post ("/what-if")
+async def what_if (payload :WhatIfRequest ,return_surface :bool =True ):
+    """
+    Evaluate a grid of variations on one application in a single vectorized pass
+
+    grid maps fields such as loan_amount, existing_emi, monthly_income or
+    credit_score to a list of values or {"min", "max", "steps"}; the
+    Cartesian product is underwritten, risk-scored and priced like the
+    orchestrator would. The response carries the baseline, the decision
+    surface (flat, row-major over the returned axes, which are sorted and
+    include the application's own values) and the nearest scenario that
+    flips the baseline decision with the offer it would get. Tenure is an
+    output of the risk band, not a grid field.
+    """
+    return await run_in_threadpool (_run_what_if ,payload ,return_surface )
+
+
+@router .get ("/policy")
+def credit_policy ():
+    """Active credit policy rules with per-rule hit counts since start-up"""
+    policy =policy_store .current ()
+    return {
+    "version":policy .version ,
+    "path":policy_store .path ,
+    "loaded_at":policy_store .loaded_at ,
+    "last_error":policy_store .last_error ,
+    "constants":policy .constants ,
+    "underwriting":policy .underwriting .describe (),
+    "risk":policy .risk .describe ()
+    }
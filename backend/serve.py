@@ -0,0 +1,174 @@
+"""
+Preload-then-fork Server
+Loads and primes every configured model once in a master process, freezes the
+heap, then forks uvicorn workers onto one shared listening socket so weights are
+shared copy-on-write instead of being loaded separately by each worker
+
+Forking is only safe from a single-threaded parent, so the master never starts
+a thread before it forks: torch runs on one intra-op and one inter-op thread
+while priming, tokenizer parallelism is off, CUDA is probed through NVML
+without creating a context, and the master never renders a PDF. Each worker
+then raises its torch threads. A serving worker does have live torch threads,
+which is why the PDF render pool it starts uses spawn rather than fork.
+
+Workers share nothing but the socket and what the master loaded. Batch PDF
+job state lives on disk and is served by any worker, but /metrics reports the
+registry of whichever worker answers the scrape; counters are not aggregated
+across workers.
+"""
+
+import gc 
+import logging 
+import os 
+import signal 
+import socket 
+import sys 
+import threading 
+import time 
+from typing import Dict ,List 
+
+logger =logging .getLogger ("serve")
+
+SERVE_HOST =os .environ .get ("SERVE_HOST","0.0.0.0")
+SERVE_PORT =int (os .environ .get ("SERVE_PORT","8000"))
+SERVE_WORKERS =int (os .environ .get ("SERVE_WORKERS",str (os .cpu_count ()or 1 )))
+SERVE_TORCH_THREADS =int (os .environ .get ("SERVE_TORCH_THREADS","0"))
+SERVE_LOG_LEVEL =os .environ .get ("SERVE_LOG_LEVEL","info")
+
+CPU_ONLY_MODELS =("eligibility","risk","supervisor")
+
+
+def preload (models :List [str ])->Dict [str ,float ]:
+    """Run the warm-up primers synchronously so the master holds every model"""
+    from utils .warmup import PRIMERS 
+
+    timings ={}
+    for name in models :
+        start =time .perf_counter ()
+        try :
+            PRIMERS [name ]()
+            timings [name ]=round (time .perf_counter ()-start ,2 )
+            logger .info (f"✓ Preloaded {name } in {timings [name ]:.2f}s")
+        except Exception as e :
+            logger .warning (f"⚠ Preload failed for {name }: {e }")
+    return timings 
+
+
+def bind_socket (host :str ,port :int )->socket .socket :
+    sock =socket .socket (socket .AF_INET6 if ":"in host else socket .AF_INET ,socket .SOCK_STREAM )
+    sock .setsockopt (socket .SOL_SOCKET ,socket .SO_REUSEADDR ,1 )
+    sock .bind ((host ,port ))
+    sock .listen (2048 )
+    sock .set_inheritable (True )
+    return sock 
+
+
+def run_worker (app ,sock :socket .socket ,torch_threads :int ):
+    """Child side of the fork: reset per-process state and serve until told to stop"""
+    import uvicorn 
+    from database import models as db_models 
+
+    gc .enable ()
+    signal .signal (signal .SIGINT ,signal .SIG_DFL )
+    signal .signal (signal .SIGTERM ,signal .SIG_DFL )
+    if db_models ._engine is not None :
+        db_models ._engine .dispose (close =False )
+    if torch_threads >0 :
+        import torch 
+        torch .set_num_threads (torch_threads )
+
+    server =uvicorn .Server (uvicorn .Config (app ,log_level =SERVE_LOG_LEVEL ))
+    server .run (sockets =[sock ])
+
+
+class Master :
+    """Forks the workers and replaces any that exit until asked to shut down"""
+
+    def __init__ (self ,app ,sock :socket .socket ,workers :int ,torch_threads :int ):
+        self .app =app 
+        self .sock =sock 
+        self .workers =max (1 ,workers )
+        self .torch_threads =torch_threads 
+        self .children :Dict [int ,int ]={}
+        self .stopping =False 
+
+    def spawn (self ,slot :int ):
+        pid =os .fork ()
+        if pid ==0 :
+            code =0 
+            try :
+                run_worker (self .app ,self .sock ,self .torch_threads )
+            except BaseException :
+                logger .exception (f"Worker {slot } crashed")
+                code =1 
+            finally :
+                os ._exit (code )
+        self .children [pid ]=slot 
+        logger .info (f"✓ Started worker {slot } (pid {pid })")
+
+    def stop (self ,signum ,frame ):
+        self .stopping =True 
+        for pid in list (self .children ):
+            try :
+                os .kill (pid ,signal .SIGTERM )
+            except ProcessLookupError :
+                pass 
+
+    def run (self ):
+        signal .signal (signal .SIGTERM ,self .stop )
+        signal .signal (signal .SIGINT ,self .stop )
+        for slot in range (self .workers ):
+            self .spawn (slot )
+
+        while self .children :
+            try :
+                pid ,status =os .wait ()
+            except ChildProcessError :
+                break 
+            except InterruptedError :
+                continue 
+            slot =self .children .pop (pid ,None )
+            if slot is None :
+                continue 
+            if not self .stopping :
+                logger .warning (f"⚠ Worker {slot } (pid {pid }) exited with status {status }, restarting")
+                time .sleep (1 )
+                self .spawn (slot )
+        self .sock .close ()
+
+
+def main ():
+    logging .basicConfig (level =SERVE_LOG_LEVEL .upper (),format ="%(asctime)s [%(process)d] %(message)s")
+
+    gc .disable ()
+    os .environ .setdefault ("TOKENIZERS_PARALLELISM","false")
+    os .environ .setdefault ("PYTORCH_NVML_BASED_CUDA_CHECK","1")
+    import torch 
+    torch .set_num_threads (1 )
+    torch .set_num_interop_threads (1 )
+    from main import app 
+    from utils .warmup import WARMUP_MODELS ,parse_models 
+
+    models =parse_models (os .environ .get ("SERVE_PRELOAD_MODELS",WARMUP_MODELS ))
+    if torch .cuda .is_available ():
+        logger .warning ("⚠ CUDA cannot be initialised before fork; preloading only the CPU models, workers load the rest")
+        models =[name for name in models if name in CPU_ONLY_MODELS ]
+
+    started =time .perf_counter ()
+    preload (models )
+    gc .collect ()
+    gc .freeze ()
+    logger .info (f"✓ Master preloaded {len (models )} models in {time .perf_counter ()-started :.1f}s, froze {gc .get_freeze_count ()} objects")
+    threads =[thread .name for thread in threading .enumerate ()if thread is not threading .main_thread ()]
+    if threads :
+        logger .warning (f"⚠ Master has live threads before fork ({', '.join (threads )}); workers may deadlock on locks they held")
+
+    torch_threads =SERVE_TORCH_THREADS or max (1 ,(os .cpu_count ()or 1 )//max (1 ,SERVE_WORKERS ))
+    sock =bind_socket (SERVE_HOST ,SERVE_PORT )
+    logger .info (f"✓ Listening on {SERVE_HOST }:{SERVE_PORT } with {SERVE_WORKERS } workers ({torch_threads } torch threads each)")
+    Master (app ,sock ,SERVE_WORKERS ,torch_threads ).run ()
+
+
+if __name__ =="__main__":
+    sys .path .insert (0 ,os .path .dirname (os .path .abspath (__file__ )))
+    main ()
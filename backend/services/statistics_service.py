@@ -0,0 +1,276 @@
+"""
+Statistics Service
+Computes report statistics with grouped SQL aggregates and keeps closed days
+materialized in daily_stats_rollups, so a period report reads O(days) rows
+instead of scanning the decision tables. Writers that add rows to past days
+invalidate those days, which are re-aggregated on the next read
+"""
+
+import os 
+from datetime import date ,datetime ,time ,timedelta 
+from typing import Any ,Dict ,Iterable ,List ,Optional ,Tuple 
+
+from sqlalchemy import delete ,func ,select 
+from sqlalchemy .exc import IntegrityError 
+
+from database .models import (
+DailyStatsRollup ,
+EmotionAnalysis ,
+FraudDetection ,
+LoanRequest ,
+Offer ,
+RiskAssessment ,
+)
+
+DAY_MARKER ="_day"
+ROLLUP_SETTLE_SECONDS =int (os .environ .get ("STATS_ROLLUP_SETTLE_SECONDS","900"))
+
+ROLLUP_SOURCES ={
+"decisions":(LoanRequest .__table__ .c .requested_at ,LoanRequest .__table__ .c .status ,LoanRequest .__table__ .c .loan_amount ),
+"risk_distribution":(RiskAssessment .__table__ .c .assessed_at ,RiskAssessment .__table__ .c .risk_tier ,RiskAssessment .__table__ .c .risk_score ),
+"fraud":(FraudDetection .__table__ .c .detected_at ,FraudDetection .__table__ .c .status ,FraudDetection .__table__ .c .fraud_probability ),
+"emotions":(EmotionAnalysis .__table__ .c .analyzed_at ,EmotionAnalysis .__table__ .c .detected_emotion ,EmotionAnalysis .__table__ .c .emotion_score ),
+"offers":(Offer .__table__ .c .created_at ,None ,Offer .__table__ .c .recommended_rate ),
+}
+
+EMOTION_POLARITY ={
+"joy":"positive",
+"surprise":"positive",
+"happy":"positive",
+"excited":"positive",
+"neutral":"neutral",
+"sadness":"negative",
+"fear":"negative",
+"anger":"negative",
+"disgust":"negative",
+"concern":"negative",
+"worried":"negative",
+"frustration":"negative",
+}
+
+FRAUD_FLAGGED ={"flagged","fraudulent","confirmed"}
+
+Aggregates =Dict [Tuple [str ,str ],List [float ]]
+
+
+def _as_date (value )->date :
+    if isinstance (value ,datetime ):
+        return value .date ()
+    if isinstance (value ,date ):
+        return value 
+    return date .fromisoformat (str (value )[:10 ])
+
+
+def _aggregate_range (db ,start :date ,end :date )->Dict [date ,Aggregates ]:
+    """Grouped COUNT/SUM per (day, metric, bucket) over [start, end]"""
+    lower =datetime .combine (start ,time .min )
+    upper =datetime .combine (end +timedelta (days =1 ),time .min )
+    per_day :Dict [date ,Aggregates ]={}
+
+    for metric ,(ts_col ,bucket_col ,value_col )in ROLLUP_SOURCES .items ():
+        day_expr =func .date (ts_col )
+        columns =[day_expr ,func .count (),func .sum (value_col )]
+        group_by =[day_expr ]
+        if bucket_col is not None :
+            columns .insert (1 ,bucket_col )
+            group_by .append (bucket_col )
+        stmt =select (*columns ).where (ts_col >=lower ,ts_col <upper ).group_by (*group_by )
+
+        for row in db .execute (stmt ):
+            if bucket_col is not None :
+                day_value ,bucket ,count ,total =row 
+            else :
+                day_value ,count ,total =row 
+                bucket =""
+            bucket =str (bucket or "unknown").lower ()
+            day_aggs =per_day .setdefault (_as_date (day_value ),{})
+            acc =day_aggs .setdefault ((metric ,bucket ),[0 ,0.0 ])
+            acc [0 ]+=int (count or 0 )
+            acc [1 ]+=float (total or 0.0 )
+    return per_day 
+
+
+def last_closed_day (now :Optional [datetime ]=None )->date :
+    """
+    Latest day whose rollup may be materialized
+
+    A day closes ROLLUP_SETTLE_SECONDS after midnight, so records captured
+    just before midnight and flushed by the decision writer just after still
+    land in the live aggregate rather than behind a stale rollup.
+    """
+    now =now or datetime .utcnow ()
+    return (now -timedelta (seconds =ROLLUP_SETTLE_SECONDS )).date ()-timedelta (days =1 )
+
+
+def invalidate_rollups (conn ,days :Iterable [date ])->int :
+    """
+    Drop the rollups of the given days so the next read re-aggregates them
+
+    Runs on the caller's Connection or Session without committing, so it can
+    share the transaction of the write that touched those days.
+    """
+    days =sorted ({_as_date (d )for d in days if d is not None })
+    for i in range (0 ,len (days ),500 ):
+        conn .execute (delete (DailyStatsRollup ).where (DailyStatsRollup .day .in_ (days [i :i +500 ])))
+    return len (days )
+
+
+def days_touched (table ,rows :Iterable [Dict [str ,Any ]])->List [date ]:
+    """Days of the rows' rollup timestamps, for tables that feed a rollup metric"""
+    columns =[ts_col .name for ts_col ,_ ,_ in ROLLUP_SOURCES .values ()if ts_col .table is table ]
+    if not columns :
+        return []
+    return sorted ({_as_date (row [name ])for row in rows for name in columns if row .get (name )is not None })
+
+
+def _insert_missing_rollups (db ,start :date ,end :date ,now :Optional [datetime ])->int :
+    """Aggregate and insert the closed days in [start, end] that have no rollup yet, without committing"""
+    last_closed =min (end ,last_closed_day (now ))
+    if last_closed <start :
+        return 0 
+
+    done ={
+    _as_date (d )
+    for d in db .execute (
+    select (DailyStatsRollup .day ).where (
+    DailyStatsRollup .metric ==DAY_MARKER ,
+    DailyStatsRollup .day >=start ,
+    DailyStatsRollup .day <=last_closed ,
+    )
+    ).scalars ()
+    }
+    missing =[
+    start +timedelta (days =i )
+    for i in range ((last_closed -start ).days +1 )
+    if start +timedelta (days =i )not in done 
+    ]
+    if not missing :
+        return 0 
+
+    per_day =_aggregate_range (db ,missing [0 ],missing [-1 ])
+    rows =[]
+    for day in missing :
+        rows .append ({"day":day ,"metric":DAY_MARKER ,"bucket":"","count":1 ,"total":None })
+        for (metric ,bucket ),(count ,total )in per_day .get (day ,{}).items ():
+            rows .append ({"day":day ,"metric":metric ,"bucket":bucket ,"count":count ,"total":total })
+    db .execute (DailyStatsRollup .__table__ .insert (),rows )
+    return len (missing )
+
+
+def refresh_rollups (db ,start :date ,end :date ,now :Optional [datetime ]=None )->int :
+    """
+    Materialize closed days in [start, end] that have no rollup yet
+
+    Returns:
+        Number of days materialized by this call
+    """
+    try :
+        days =_insert_missing_rollups (db ,start ,end ,now )
+        db .commit ()
+    except IntegrityError :
+        db .rollback ()
+        return 0 
+    return days 
+
+
+def rebuild_rollups (db ,start :date ,end :date ,now :Optional [datetime ]=None )->int :
+    """
+    Drop and re-aggregate the rollups in [start, end], e.g. after a backfill written around the service
+
+    The delete and the re-aggregation commit together, so readers see either
+    the old rollups or the new ones, and a failed rebuild leaves the old ones
+    in place.
+    """
+    try :
+        db .execute (delete (DailyStatsRollup ).where (DailyStatsRollup .day >=start ,DailyStatsRollup .day <=end ))
+        days =_insert_missing_rollups (db ,start ,end ,now )
+        db .commit ()
+    except Exception :
+        db .rollback ()
+        raise 
+    return days 
+
+
+def _read_rollups (db ,start :date ,end :date )->Aggregates :
+    stmt =(
+    select (DailyStatsRollup .metric ,DailyStatsRollup .bucket ,func .sum (DailyStatsRollup .count ),func .sum (DailyStatsRollup .total ))
+    .where (DailyStatsRollup .day >=start ,DailyStatsRollup .day <=end ,DailyStatsRollup .metric !=DAY_MARKER )
+    .group_by (DailyStatsRollup .metric ,DailyStatsRollup .bucket )
+    )
+    return {(metric ,bucket ):[int (count or 0 ),float (total or 0.0 )]for metric ,bucket ,count ,total in db .execute (stmt )}
+
+
+def _merge (target :Aggregates ,source :Aggregates ):
+    for key ,(count ,total )in source .items ():
+        acc =target .setdefault (key ,[0 ,0.0 ])
+        acc [0 ]+=count 
+        acc [1 ]+=total 
+
+
+def _bucket_counts (aggs :Aggregates ,metric :str )->Dict [str ,int ]:
+    return {bucket :count for (m ,bucket ),(count ,_ )in aggs .items ()if m ==metric }
+
+
+def get_statistics (db ,start :date ,end :date ,period :Optional [str ]=None )->Dict [str ,Any ]:
+    """
+    Build statistics_data for PDFReportGenerator.generate_statistics_report
+
+    Closed days come from daily rollups (materialized on demand); days that
+    are still open are aggregated live.
+    """
+    now =datetime .utcnow ()
+    first_open =last_closed_day (now )+timedelta (days =1 )
+    refresh_rollups (db ,start ,end ,now )
+
+    aggs =_read_rollups (db ,start ,min (end ,first_open -timedelta (days =1 )))
+    if end >=first_open :
+        for day_aggs in _aggregate_range (db ,max (start ,first_open ),end ).values ():
+            _merge (aggs ,day_aggs )
+
+    decisions =_bucket_counts (aggs ,"decisions")
+    total_applications =sum (decisions .values ())
+    total_loan_amount =sum (total for (m ,_ ),(_ ,total )in aggs .items ()if m =="decisions")
+
+    risk =_bucket_counts (aggs ,"risk_distribution")
+
+    emotions ={"positive":0 ,"neutral":0 ,"negative":0 ,"unknown":0 }
+    for label ,count in _bucket_counts (aggs ,"emotions").items ():
+        emotions [EMOTION_POLARITY .get (label ,"unknown")]+=count 
+
+    fraud =_bucket_counts (aggs ,"fraud")
+    fraud_checks =sum (fraud .values ())
+    flagged =sum (count for status ,count in fraud .items ()if status in FRAUD_FLAGGED )
+    confirmed =fraud .get ("confirmed",0 )
+    false_positives =fraud .get ("false_positive",0 )
+
+    offer_count ,offer_rate_total =aggs .get (("offers",""),[0 ,0.0 ])
+
+    return {
+    "total_applications":total_applications ,
+    "period":period or f"{start .isoformat ()} to {end .isoformat ()}",
+    "total_loan_amount":total_loan_amount ,
+    "avg_loan_amount":total_loan_amount /total_applications if total_applications else 0 ,
+    "decisions":{
+    "approved":decisions .get ("approved",0 ),
+    "declined":decisions .get ("declined",0 ),
+    "review":decisions .get ("review",0 )+decisions .get ("pending",0 ),
+    },
+    "risk_distribution":{
+    "low":risk .get ("low",0 ),
+    "medium":risk .get ("medium",0 ),
+    "high":risk .get ("high",0 ),
+    },
+    "emotions":emotions ,
+    "fraud_stats":{
+    "flagged":flagged ,
+    "fraud_rate":flagged /fraud_checks if fraud_checks else 0.0 ,
+    "confirmed":confirmed ,
+    "confirmed_rate":confirmed /fraud_checks if fraud_checks else 0.0 ,
+    "false_positives":false_positives ,
+    "false_positive_rate":false_positives /fraud_checks if fraud_checks else 0.0 ,
+    },
+    "offers":{
+    "generated":offer_count ,
+    "avg_rate":offer_rate_total /offer_count if offer_count else 0.0 ,
+    },
+    }
@@ -0,0 +1,220 @@
+"""
+Metrics
+In-process Prometheus-style counters, gauges and histograms with a text
+exposition renderer, plus stage timers for pipeline instrumentation
+"""
+
+import logging 
+import math 
+import threading 
+import time 
+from contextlib import contextmanager 
+from typing import Dict ,Iterable ,List ,Optional ,Tuple 
+
+logger =logging .getLogger (__name__ )
+
+DEFAULT_BUCKETS =(0.005 ,0.01 ,0.025 ,0.05 ,0.1 ,0.25 ,0.5 ,1.0 ,2.5 ,5.0 ,10.0 ,30.0 ,60.0 )
+
+
+def _format_value (value :float )->str :
+    if value ==math .inf :
+        return "+Inf"
+    if float (value ).is_integer ():
+        return str (int (value ))
+    return repr (float (value ))
+
+
+def _escape (value :str )->str :
+    return str (value ).replace ("\\","\\\\").replace ("\n","\\n").replace ('"','\\"')
+
+
+def _label_text (names :Iterable [str ],values :Iterable [str ],extra :Optional [Tuple [str ,str ]]=None )->str :
+    pairs =[f'{n }="{_escape (v )}"'for n ,v in zip (names ,values )]
+    if extra :
+        pairs .append (f'{extra [0 ]}="{_escape (extra [1 ])}"')
+    return "{"+",".join (pairs )+"}"if pairs else ""
+
+
+class _Metric :
+    kind ="untyped"
+
+    def __init__ (self ,name :str ,documentation :str ,labelnames :Iterable [str ]=()):
+        self .name =name 
+        self .documentation =documentation 
+        self .labelnames =tuple (labelnames )
+        self ._lock =threading .Lock ()
+        self ._values :Dict [Tuple [str ,...],object ]={}
+
+    def _key (self ,labels :Dict [str ,str ])->Tuple [str ,...]:
+        if set (labels )!=set (self .labelnames ):
+            raise ValueError (f"{self .name } expects labels {self .labelnames }, got {tuple (labels )}")
+        return tuple (str (labels [n ])for n in self .labelnames )
+
+    def header (self ,name :Optional [str ]=None )->List [str ]:
+        name =name or self .name 
+        return [f"# HELP {name } {self .documentation }",f"# TYPE {name } {self .kind }"]
+
+
+class Counter (_Metric ):
+    kind ="counter"
+
+    def inc (self ,amount :float =1.0 ,**labels ):
+        key =self ._key (labels )
+        with self ._lock :
+            self ._values [key ]=self ._values .get (key ,0.0 )+amount 
+
+    def value (self ,**labels )->float :
+        return self ._values .get (self ._key (labels ),0.0 )
+
+    def render (self )->List [str ]:
+        with self ._lock :
+            items =sorted (self ._values .items ())
+        return self .header (f"{self .name }_total")+[
+        f"{self .name }_total{_label_text (self .labelnames ,key )} {_format_value (v )}"for key ,v in items 
+        ]
+
+
+class Gauge (_Metric ):
+    kind ="gauge"
+
+    def set (self ,value :float ,**labels ):
+        key =self ._key (labels )
+        with self ._lock :
+            self ._values [key ]=float (value )
+
+    def inc (self ,amount :float =1.0 ,**labels ):
+        key =self ._key (labels )
+        with self ._lock :
+            self ._values [key ]=self ._values .get (key ,0.0 )+amount 
+
+    def dec (self ,amount :float =1.0 ,**labels ):
+        self .inc (-amount ,**labels )
+
+    def value (self ,**labels )->float :
+        return self ._values .get (self ._key (labels ),0.0 )
+
+    def render (self )->List [str ]:
+        with self ._lock :
+            items =sorted (self ._values .items ())
+        return self .header ()+[
+        f"{self .name }{_label_text (self .labelnames ,key )} {_format_value (v )}"for key ,v in items 
+        ]
+
+
+class Histogram (_Metric ):
+    kind ="histogram"
+
+    def __init__ (self ,name :str ,documentation :str ,labelnames :Iterable [str ]=(),buckets :Iterable [float ]=DEFAULT_BUCKETS ):
+        super ().__init__ (name ,documentation ,labelnames )
+        self .buckets =tuple (sorted (buckets ))+(math .inf ,)
+
+    def observe (self ,value :float ,**labels ):
+        key =self ._key (labels )
+        with self ._lock :
+            state =self ._values .get (key )
+            if state is None :
+                state =self ._values [key ]=[[0 ]*len (self .buckets ),0.0 ,0 ]
+            for i ,bound in enumerate (self .buckets ):
+                if value <=bound :
+                    state [0 ][i ]+=1 
+                    break 
+            state [1 ]+=value 
+            state [2 ]+=1 
+
+    def snapshot (self ,**labels )->Dict [str ,float ]:
+        state =self ._values .get (self ._key (labels ))
+        if state is None :
+            return {"count":0 ,"sum":0.0 }
+        return {"count":state [2 ],"sum":state [1 ]}
+
+    def distribution (self ,**labels )->Dict [str ,int ]:
+        """Per-bucket (non-cumulative) observation counts keyed by upper bound"""
+        state =self ._values .get (self ._key (labels ))
+        if state is None :
+            return {}
+        return {_format_value (bound ):n for bound ,n in zip (self .buckets ,state [0 ])if n }
+
+    def render (self )->List [str ]:
+        with self ._lock :
+            items =sorted ((k ,([*s [0 ]],s [1 ],s [2 ]))for k ,s in self ._values .items ())
+        lines =self .header ()
+        for key ,(counts ,total ,count )in items :
+            cumulative =0 
+            for bound ,n in zip (self .buckets ,counts ):
+                cumulative +=n 
+                labels =_label_text (self .labelnames ,key ,("le",_format_value (bound )))
+                lines .append (f"{self .name }_bucket{labels } {cumulative }")
+            labels =_label_text (self .labelnames ,key )
+            lines .append (f"{self .name }_sum{labels } {_format_value (total )}")
+            lines .append (f"{self .name }_count{labels } {count }")
+        return lines 
+
+
+class MetricsRegistry :
+    """Named metrics plus collectors called at scrape time to refresh gauges"""
+
+    def __init__ (self ):
+        self ._metrics :Dict [str ,_Metric ]={}
+        self ._collectors =[]
+        self ._lock =threading .Lock ()
+
+    def _register (self ,cls ,name :str ,*args ,**kwargs ):
+        with self ._lock :
+            metric =self ._metrics .get (name )
+            if metric is None :
+                metric =self ._metrics [name ]=cls (name ,*args ,**kwargs )
+            elif not isinstance (metric ,cls ):
+                raise ValueError (f"Metric {name } already registered as {metric .kind }")
+            return metric 
+
+    def counter (self ,name :str ,documentation :str ,labelnames :Iterable [str ]=())->Counter :
+        return self ._register (Counter ,name ,documentation ,labelnames )
+
+    def gauge (self ,name :str ,documentation :str ,labelnames :Iterable [str ]=())->Gauge :
+        return self ._register (Gauge ,name ,documentation ,labelnames )
+
+    def histogram (self ,name :str ,documentation :str ,labelnames :Iterable [str ]=(),buckets :Iterable [float ]=DEFAULT_BUCKETS )->Histogram :
+        return self ._register (Histogram ,name ,documentation ,labelnames ,buckets )
+
+    def add_collector (self ,fn ):
+        self ._collectors .append (fn )
+
+    def render (self )->str :
+        """Prometheus text exposition format (version 0.0.4)"""
+        for collector in list (self ._collectors ):
+            try :
+                collector ()
+            except Exception as e :
+                logger .warning (f"⚠ Metrics collector {getattr (collector ,'__qualname__',collector )} failed: {e }")
+        lines =[]
+        for name in sorted (self ._metrics ):
+            lines .extend (self ._metrics [name ].render ())
+        return "\n".join (lines )+"\n"
+
+
+registry =MetricsRegistry ()
+
+STAGE_SECONDS =registry .histogram (
+"orchestrator_stage_seconds",
+"Latency of each orchestrator pipeline stage",
+["stage"],
+)
+
+
+@contextmanager 
+def stage_timer (stage :str ,timings :Optional [Dict [str ,float ]]=None ,histogram :Histogram =STAGE_SECONDS ):
+    """
+    Time a block as a pipeline stage
+
+    The duration is always observed into the stage histogram; when a timings
+    dict is passed it also receives the duration in milliseconds.
+    """
+    start =time .perf_counter ()
+    try :
+        yield 
+    finally :
+        elapsed =time .perf_counter ()-start 
+        histogram .observe (elapsed ,stage =stage )
+        if timings is not None :
+            timings [stage ]=round (elapsed *1000 ,3 )
+
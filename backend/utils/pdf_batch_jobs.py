@@ -0,0 +1,261 @@
+"""
+PDF Batch Jobs
+Renders approval reports for large batches of applications in the PDF render
+pool, tracking progress per job and keeping results on disk for a retention
+window. Job state is checkpointed to job.json in the job directory, so any
+worker process can answer status polls and downloads
+"""
+
+import asyncio 
+import json 
+import logging 
+import os 
+import re 
+import shutil 
+import time 
+import uuid 
+import zipfile 
+from typing import Any ,Dict ,List ,Optional 
+
+from utils .pdf_render_pool import pdf_render_pool ,render_report_to_file 
+
+logger =logging .getLogger (__name__ )
+
+PDF_JOB_RESULTS_DIR =os .environ .get ("PDF_JOB_RESULTS_DIR","./reports/jobs")
+PDF_JOB_RETENTION_HOURS =float (os .environ .get ("PDF_JOB_RETENTION_HOURS","24"))
+PDF_JOB_MAX_BATCH =int (os .environ .get ("PDF_JOB_MAX_BATCH","10000"))
+PDF_JOB_CONCURRENCY =int (os .environ .get ("PDF_JOB_CONCURRENCY",str (max (0 ,pdf_render_pool .max_workers -1 ))))
+PDF_JOB_STATE_INTERVAL =float (os .environ .get ("PDF_JOB_STATE_INTERVAL","1.0"))
+
+PDF_JOB_IDLE_POLL =0.2 
+
+STATE_FILE ="job.json"
+JOB_ID_PATTERN =re .compile (r"[0-9a-f]{32}")
+
+
+def _safe_name (value :Any )->str :
+    return re .sub (r"[^A-Za-z0-9_-]+","_",str (value or "application"))[:60 ]
+
+
+class PDFBatchJob :
+    """State of one batch: per-document files, progress and errors"""
+
+    def __init__ (self ,job_id :str ,applications :List [Dict [str ,Any ]],directory :str ):
+        self .job_id =job_id 
+        self .applications =applications 
+        self .directory =directory 
+        self .total =len (applications )
+        self .completed =0 
+        self .failed =0 
+        self .status ="queued"
+        self .files :Dict [int ,str ]={}
+        self .errors :Dict [int ,str ]={}
+        self .created_at =time .time ()
+        self .finished_at :Optional [float ]=None 
+        self .zip_path :Optional [str ]=None 
+        self .task :Optional [asyncio .Task ]=None 
+        self .saved_at =0.0 
+
+    def filename_for (self ,index :int )->str :
+        data =self .applications [index ]
+        ident =data .get ("application",{}).get ("id")or data .get ("customer",{}).get ("id")
+        return f"{index :05d}_{_safe_name (ident )}.pdf"
+
+    def to_dict (self )->Dict [str ,Any ]:
+        return {
+        "job_id":self .job_id ,
+        "status":self .status ,
+        "total":self .total ,
+        "completed":self .completed ,
+        "failed":self .failed ,
+        "progress":round ((self .completed +self .failed )/self .total ,4 )if self .total else 1.0 ,
+        "errors":{str (i ):e for i ,e in self .errors .items ()},
+        "created_at":self .created_at ,
+        "finished_at":self .finished_at ,
+        "download_ready":self .zip_path is not None ,
+        }
+
+    def state (self )->Dict [str ,Any ]:
+        """Snapshot persisted to job.json; file paths are stored relative to the job directory"""
+        return {
+        **self .to_dict (),
+        "files":{str (i ):os .path .basename (p )for i ,p in self .files .items ()},
+        "zip":os .path .basename (self .zip_path )if self .zip_path else None ,
+        }
+
+    @classmethod 
+    def load (cls ,directory :str )->Optional ["PDFBatchJob"]:
+        """Read-only job rebuilt from a job.json written by any worker"""
+        try :
+            with open (os .path .join (directory ,STATE_FILE ),encoding ="utf-8")as f :
+                state =json .load (f )
+        except (OSError ,ValueError ):
+            return None 
+        job =cls (state ["job_id"],[],directory )
+        job .total =state ["total"]
+        job .completed =state ["completed"]
+        job .failed =state ["failed"]
+        job .status =state ["status"]
+        job .errors ={int (i ):e for i ,e in state ["errors"].items ()}
+        job .files ={int (i ):os .path .join (directory ,name )for i ,name in state ["files"].items ()}
+        job .created_at =state ["created_at"]
+        job .finished_at =state ["finished_at"]
+        job .zip_path =os .path .join (directory ,state ["zip"])if state .get ("zip")else None 
+        return job 
+
+
+def write_state (directory :str ,state :Dict [str ,Any ]):
+    """Atomically replace a job's job.json"""
+    path =os .path .join (directory ,STATE_FILE )
+    tmp =f"{path }.{uuid .uuid4 ().hex }.tmp"
+    with open (tmp ,"w",encoding ="utf-8")as f :
+        json .dump (state ,f )
+    os .replace (tmp ,path )
+
+
+class PDFBatchJobManager :
+    """
+    Submits batches to the render pool and enforces result retention
+
+    Every job of this process shares one semaphore of `concurrency` renders,
+    one below the pool's worker count by default, so a month-end batch always
+    leaves a worker for interactive /application-approval-pdf renders. With a
+    concurrency of 0 (a single-worker pool) batches still run, one document
+    at a time and only while no interactive render is in flight, so an
+    interactive request waits for at most one batch document.
+    """
+
+    def __init__ (
+    self ,
+    results_dir :str =PDF_JOB_RESULTS_DIR ,
+    retention_hours :float =PDF_JOB_RETENTION_HOURS ,
+    concurrency :int =PDF_JOB_CONCURRENCY ,
+    ):
+        self .results_dir =results_dir 
+        self .retention_seconds =retention_hours *3600 
+        self .concurrency =concurrency 
+        self .jobs :Dict [str ,PDFBatchJob ]={}
+        self ._slots =asyncio .Semaphore (max (1 ,concurrency ))
+
+    def submit (self ,applications :List [Dict [str ,Any ]])->PDFBatchJob :
+        job_id =uuid .uuid4 ().hex 
+        directory =os .path .join (self .results_dir ,job_id )
+        os .makedirs (directory ,exist_ok =True )
+        job =PDFBatchJob (job_id ,applications ,directory )
+        write_state (directory ,job .state ())
+        self .jobs [job_id ]=job 
+        job .task =asyncio .create_task (self ._run (job ))
+        return job 
+
+    def get (self ,job_id :str )->Optional [PDFBatchJob ]:
+        """This process's live job, else the state another worker checkpointed to disk"""
+        job =self .jobs .get (job_id )
+        if job is not None :
+            return job 
+        if not JOB_ID_PATTERN .fullmatch (job_id ):
+            return None 
+        return PDFBatchJob .load (os .path .join (self .results_dir ,job_id ))
+
+    async def _checkpoint (self ,job :PDFBatchJob ):
+        now =time .monotonic ()
+        if now -job .saved_at <PDF_JOB_STATE_INTERVAL :
+            return 
+        job .saved_at =now 
+        try :
+            await asyncio .to_thread (write_state ,job .directory ,job .state ())
+        except OSError as e :
+            logger .warning (f"⚠ Could not checkpoint PDF batch job {job .job_id }: {e }")
+
+    async def _run (self ,job :PDFBatchJob ):
+        job .status ="running"
+        await self ._checkpoint (job )
+
+        async def render_one (index :int ):
+            async with self ._slots :
+                if self .concurrency <1 :
+                    while pdf_render_pool .in_flight :
+                        await asyncio .sleep (PDF_JOB_IDLE_POLL )
+                path =os .path .join (job .directory ,job .filename_for (index ))
+                try :
+                    await pdf_render_pool .run_background (render_report_to_file ,"approval",job .applications [index ],path )
+                    job .files [index ]=path 
+                    job .completed +=1 
+                except Exception as e :
+                    job .errors [index ]=str (e )
+                    job .failed +=1 
+            await self ._checkpoint (job )
+
+        try :
+            await asyncio .gather (*(render_one (i )for i in range (job .total )))
+            if job .files :
+                job .zip_path =await asyncio .to_thread (self ._build_zip ,job )
+            job .status ="completed"if not job .failed else ("partial"if job .completed else "failed")
+        except asyncio .CancelledError :
+            job .status ="cancelled"
+            raise 
+        finally :
+            job .applications =[
+            {"application":a .get ("application",{}),"customer":a .get ("customer",{})}
+            for a in job .applications 
+            ]
+            job .finished_at =time .time ()
+            try :
+                write_state (job .directory ,job .state ())
+            except OSError as e :
+                logger .warning (f"⚠ Could not save PDF batch job {job .job_id }: {e }")
+            logger .info (f"PDF batch job {job .job_id } {job .status }: {job .completed }/{job .total } rendered")
+
+    def _build_zip (self ,job :PDFBatchJob )->str :
+        zip_path =os .path .join (job .directory ,"reports.zip")
+        with zipfile .ZipFile (zip_path ,"w",compression =zipfile .ZIP_STORED )as archive :
+            for index in sorted (job .files ):
+                archive .write (job .files [index ],arcname =os .path .basename (job .files [index ]))
+        return zip_path 
+
+    def purge_expired (self )->int :
+        """
+        Delete jobs that finished before the retention window, from any worker
+
+        Directories without a readable job.json, and jobs whose owner stopped
+        checkpointing (the worker died), expire by modification time instead.
+        """
+        cutoff =time .time ()-self .retention_seconds 
+        purged =0 
+        if not os .path .isdir (self .results_dir ):
+            return purged 
+        for entry in os .scandir (self .results_dir ):
+            if not entry .is_dir ():
+                continue 
+            live =self .jobs .get (entry .name )
+            if live is not None and live .finished_at is None :
+                continue 
+            job =live or PDFBatchJob .load (entry .path )
+            if job is not None and job .finished_at :
+                expired =job .finished_at <cutoff 
+            else :
+                state_path =os .path .join (entry .path ,STATE_FILE )
+                expired =(os .path .getmtime (state_path )if os .path .exists (state_path )else entry .stat ().st_mtime )<cutoff 
+            if expired :
+                shutil .rmtree (entry .path ,ignore_errors =True )
+                self .jobs .pop (entry .name ,None )
+                purged +=1 
+        return purged 
+
+    async def run_retention (self ,interval :float =600 ):
+        while True :
+            try :
+                purged =await asyncio .to_thread (self .purge_expired )
+                if purged :
+                    logger .info (f"✓ Purged {purged } expired PDF batch jobs")
+            except Exception as e :
+                logger .warning (f"⚠ PDF job retention sweep failed: {e }")
+            await asyncio .sleep (interval )
+
+    async def shutdown (self ):
+        for job in self .jobs .values ():
+            if job .task and not job .task .done ():
+                job .task .cancel ()
+        await asyncio .gather (*(j .task for j in self .jobs .values ()if j .task ),return_exceptions =True )
+
+
+pdf_job_manager =PDFBatchJobManager ()
@@ -0,0 +1,152 @@
+"""
+PDF Report Cache
+Content-addressed on-disk cache of rendered reports, keyed by a canonical hash
+of the report kind, input payload and template version, with LRU eviction
+"""
+
+import asyncio 
+import hashlib 
+import json 
+import logging 
+import os 
+import time 
+import uuid 
+from typing import Any ,Dict ,Optional 
+
+from utils .pdf_generator import TEMPLATE_VERSION 
+from utils .pdf_render_pool import pdf_render_pool 
+
+logger =logging .getLogger (__name__ )
+
+PDF_CACHE_ENABLED =os .environ .get ("PDF_CACHE_ENABLED","1")=="1"
+PDF_CACHE_DIR =os .environ .get ("PDF_CACHE_DIR","./reports/cache")
+PDF_CACHE_MAX_BYTES =int (os .environ .get ("PDF_CACHE_MAX_MB","256"))*1024 *1024 
+PDF_CACHE_MIN_AGE_SECONDS =60 
+
+
+def report_key (kind :str ,data :Dict [str ,Any ])->str :
+    """sha256 of the canonical JSON form of (kind, template version, payload)"""
+    canonical =json .dumps (
+    {"kind":kind ,"template":TEMPLATE_VERSION ,"data":data },
+    sort_keys =True ,
+    separators =(",",":"),
+    ensure_ascii =False ,
+    default =str ,
+    )
+    return hashlib .sha256 (canonical .encode ("utf-8")).hexdigest ()
+
+
+class PDFReportCache :
+    """LRU by file mtime: hits touch the file, inserts evict the oldest beyond max_bytes"""
+
+    def __init__ (self ,directory :str =PDF_CACHE_DIR ,max_bytes :int =PDF_CACHE_MAX_BYTES ):
+        self .directory =directory 
+        self .max_bytes =max_bytes 
+        self .hits =0 
+        self .misses =0 
+        self .evictions =0 
+        self ._size :Optional [int ]=None 
+        self ._pending :Dict [str ,asyncio .Task ]={}
+
+    def path_for (self ,key :str )->str :
+        return os .path .join (self .directory ,key [:2 ],f"{key }.pdf")
+
+    def lookup (self ,key :str )->Optional [str ]:
+        path =self .path_for (key )
+        try :
+            os .utime (path )
+        except FileNotFoundError :
+            return None 
+        return path 
+
+    async def get_or_render (self ,kind :str ,data :Dict [str ,Any ],key :Optional [str ]=None )->str :
+        """
+        Path of the cached report, rendering it once if absent
+
+        The render runs as a task owned by the cache and every concurrent miss
+        awaits it through a shield, so a cancelled request only stops its own
+        wait: the others still get the report, and it still lands in the cache.
+        """
+        key =key or report_key (kind ,data )
+        path =self .lookup (key )
+        if path :
+            self .hits +=1 
+            return path 
+
+        task =self ._pending .get (key )
+        if task is None :
+            self .misses +=1 
+            task =asyncio .create_task (self ._render (kind ,data ,key ))
+            self ._pending [key ]=task 
+            task .add_done_callback (lambda done :self ._render_finished (key ,done ))
+        return await asyncio .shield (task )
+
+    def _render_finished (self ,key :str ,task :asyncio .Task ):
+        if self ._pending .get (key )is task :
+            del self ._pending [key ]
+        if not task .cancelled ():
+            task .exception ()
+
+    async def _render (self ,kind :str ,data :Dict [str ,Any ],key :str )->str :
+        path =self .path_for (key )
+        os .makedirs (os .path .dirname (path ),exist_ok =True )
+        tmp_path =f"{path }.{uuid .uuid4 ().hex }.tmp"
+        try :
+            size =await pdf_render_pool .render_to_file (kind ,data ,tmp_path )
+            os .replace (tmp_path ,path )
+        except BaseException :
+            if os .path .exists (tmp_path ):
+                os .remove (tmp_path )
+            raise 
+        if self ._size is not None :
+            self ._size +=size 
+        if self ._size is None or self ._size >self .max_bytes :
+            await asyncio .to_thread (self .evict )
+        return path 
+
+    def evict (self )->int :
+        """Delete least recently used reports until the cache fits in max_bytes"""
+        entries =[]
+        total =0 
+        for root ,_ ,files in os .walk (self .directory ):
+            for name in files :
+                if not name .endswith (".pdf"):
+                    continue 
+                path =os .path .join (root ,name )
+                try :
+                    stat =os .stat (path )
+                except FileNotFoundError :
+                    continue 
+                entries .append ((stat .st_mtime ,stat .st_size ,path ))
+                total +=stat .st_size 
+
+        removed =0 
+        if total >self .max_bytes :
+            recent =time .time ()-PDF_CACHE_MIN_AGE_SECONDS 
+            for mtime ,size ,path in sorted (entries ):
+                if total <=self .max_bytes or mtime >recent :
+                    break 
+                try :
+                    os .remove (path )
+                except FileNotFoundError :
+                    pass 
+                total -=size 
+                removed +=1 
+            self .evictions +=removed 
+            if removed :
+                logger .info (f"✓ Evicted {removed } cached PDF reports")
+        self ._size =total 
+        return removed 
+
+    def stats (self )->Dict [str ,Any ]:
+        return {
+        "enabled":PDF_CACHE_ENABLED ,
+        "hits":self .hits ,
+        "misses":self .misses ,
+        "evictions":self .evictions ,
+        "size_bytes":self ._size ,
+        "max_bytes":self .max_bytes ,
+        }
+
+
+pdf_report_cache =PDFReportCache ()
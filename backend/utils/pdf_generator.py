@@ -4,7 +4,9 @@ Generates professional PDF reports for loan applications, approvals, and statist
 """
 
 import io 
+from copy import copy 
 from datetime import datetime 
+from functools import lru_cache 
 from typing import Dict ,Any ,Optional ,BinaryIO 
 from reportlab .lib .pagesizes import letter ,A4 
 from reportlab .lib .styles import getSampleStyleSheet ,ParagraphStyle 
@@ -15,6 +17,131 @@ from reportlab .lib import colors
 from reportlab .pdfgen import canvas 
 
 
+TEMPLATE_VERSION ="2025.1"
+
+BRAND_BLUE =HexColor ('#1f4788')
+PRIMARY_BLUE =HexColor ('#2563eb')
+SECTION_BACKGROUND =HexColor ('#f0f4ff')
+LABEL_GREY =HexColor ('#4b5563')
+
+_COLOR_HEX ={
+'LOW':'#059669',
+'MEDIUM':'#d97706',
+'HIGH':'#dc2626',
+}
+
+FOOTER_NOTICE =(
+"<b>Important Notice:</b> This report is confidential and intended solely for authorized personnel. "
+"Unauthorized distribution is prohibited. All information contained herein is subject to applicable "
+"privacy and data protection regulations."
+)
+
+
+@lru_cache (maxsize =None )
+def get_report_stylesheet ():
+    """Sample stylesheet plus the report's custom paragraph styles, built once per process"""
+    styles =getSampleStyleSheet ()
+    styles .add (ParagraphStyle (
+    name ='CustomTitle',
+    parent =styles ['Heading1'],
+    fontSize =24 ,
+    textColor =BRAND_BLUE ,
+    spaceAfter =12 ,
+    alignment =1 
+    ))
+
+    styles .add (ParagraphStyle (
+    name ='SectionHeader',
+    parent =styles ['Heading2'],
+    fontSize =14 ,
+    textColor =PRIMARY_BLUE ,
+    spaceAfter =8 ,
+    spaceBefore =8 ,
+    borderColor =PRIMARY_BLUE ,
+    borderWidth =1 ,
+    borderPadding =4 ,
+    backColor =SECTION_BACKGROUND 
+    ))
+
+    styles .add (ParagraphStyle (
+    name ='FieldLabel',
+    parent =styles ['Normal'],
+    fontSize =10 ,
+    textColor =LABEL_GREY ,
+    spaceAfter =2 
+    ))
+
+    styles .add (ParagraphStyle (
+    name ='FieldValue',
+    parent =styles ['Normal'],
+    fontSize =11 ,
+    textColor =black ,
+    spaceAfter =6 
+    ))
+
+    styles .add (ParagraphStyle (
+    name ='Status',
+    parent =styles ['Normal'],
+    fontSize =12 ,
+    spaceAfter =8 
+    ))
+    return styles 
+
+
+@lru_cache (maxsize =64 )
+def get_table_style (
+header_color :str ,
+row_alt_color :str ,
+body_color :Optional [str ]=None ,
+align :str ='LEFT',
+bold_labels :bool =True ,
+header_emphasis :bool =True ,
+valign_top :bool =False ,
+row_height :float =0.25 
+)->TableStyle :
+    """
+    Shared TableStyle for a header colour / banding combination
+
+    TableStyle objects are only read by Table.setStyle, so one instance per
+    combination is reused by every report rendered in the process.
+    """
+    commands =[
+    ('BACKGROUND',(0 ,0 ),(-1 ,0 ),HexColor (header_color )),
+    ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
+    ('ALIGN',(0 ,0 ),(-1 ,-1 ),align ),
+    ]
+    if valign_top :
+        commands .append (('VALIGN',(0 ,0 ),(-1 ,-1 ),'TOP'))
+    commands .append (('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'))
+    if header_emphasis :
+        commands .append (('FONTSIZE',(0 ,0 ),(-1 ,0 ),10 ))
+        commands .append (('BOTTOMPADDING',(0 ,0 ),(-1 ,0 ),8 ))
+    if body_color :
+        commands .append (('BACKGROUND',(0 ,1 ),(-1 ,-1 ),HexColor (body_color )))
+    commands .append (('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ))
+    commands .append (('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor (row_alt_color )]))
+    if bold_labels :
+        commands .append (('FONTNAME',(0 ,1 ),(0 ,-1 ),'Helvetica-Bold'))
+    commands .append (('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ))
+    commands .append (('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),row_height *inch ))
+    return TableStyle (commands )
+
+
+@lru_cache (maxsize =None )
+def _static_paragraph (text :str ,style_name :str )->Paragraph :
+    return Paragraph (text ,get_report_stylesheet ()[style_name ])
+
+
+def static_paragraph (text :str ,style_name :str ='Normal')->Paragraph :
+    """
+    Paragraph for fixed markup, parsed once and shallow-copied per use
+
+    Layout state set by wrap/split lives on the copy, while the parsed
+    fragments are shared with the cached template.
+    """
+    return copy (_static_paragraph (text ,style_name ))
+
+
 class PDFReportGenerator :
     """Generate professional PDF reports for loan applications"""
 
@@ -22,55 +149,7 @@ class PDFReportGenerator :
         """Initialize PDF generator"""
         self .page_size =page_size 
         self .width ,self .height =page_size 
-        self .styles =getSampleStyleSheet ()
-        self ._setup_custom_styles ()
-
-    def _setup_custom_styles (self ):
-        """Setup custom paragraph styles"""
-        self .styles .add (ParagraphStyle (
-        name ='CustomTitle',
-        parent =self .styles ['Heading1'],
-        fontSize =24 ,
-        textColor =HexColor ('#1f4788'),
-        spaceAfter =12 ,
-        alignment =1 
-        ))
-
-        self .styles .add (ParagraphStyle (
-        name ='SectionHeader',
-        parent =self .styles ['Heading2'],
-        fontSize =14 ,
-        textColor =HexColor ('#2563eb'),
-        spaceAfter =8 ,
-        spaceBefore =8 ,
-        borderColor =HexColor ('#2563eb'),
-        borderWidth =1 ,
-        borderPadding =4 ,
-        backColor =HexColor ('#f0f4ff')
-        ))
-
-        self .styles .add (ParagraphStyle (
-        name ='FieldLabel',
-        parent =self .styles ['Normal'],
-        fontSize =10 ,
-        textColor =HexColor ('#4b5563'),
-        spaceAfter =2 
-        ))
-
-        self .styles .add (ParagraphStyle (
-        name ='FieldValue',
-        parent =self .styles ['Normal'],
-        fontSize =11 ,
-        textColor =black ,
-        spaceAfter =6 
-        ))
-
-        self .styles .add (ParagraphStyle (
-        name ='Status',
-        parent =self .styles ['Normal'],
-        fontSize =12 ,
-        spaceAfter =8 
-        ))
+        self .styles =get_report_stylesheet ()
 
     def generate_approval_report (self ,application_data :Dict [str ,Any ],filepath :Optional [str ]=None )->BinaryIO :
         """
@@ -154,7 +233,7 @@ class PDFReportGenerator :
         elements =[]
 
 
-        title =Paragraph ("EY BANK - LOAN APPLICATION REPORT",self .styles ['CustomTitle'])
+        title =static_paragraph ("EY BANK - LOAN APPLICATION REPORT",'CustomTitle')
         elements .append (title )
 
 
@@ -173,7 +252,7 @@ class PDFReportGenerator :
         """Build customer information section"""
         elements =[]
 
-        elements .append (Paragraph ("CUSTOMER INFORMATION",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("CUSTOMER INFORMATION",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         customer =data .get ('customer',{})
@@ -193,20 +272,7 @@ class PDFReportGenerator :
         ]
 
         table =Table (customer_data ,colWidths =[2 *inch ,4 *inch ])
-        table .setStyle (TableStyle ([
-        ('BACKGROUND',(0 ,0 ),(-1 ,0 ),HexColor ('#2563eb')),
-        ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
-        ('ALIGN',(0 ,0 ),(-1 ,-1 ),'LEFT'),
-        ('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,0 ),10 ),
-        ('BOTTOMPADDING',(0 ,0 ),(-1 ,0 ),8 ),
-        ('BACKGROUND',(0 ,1 ),(-1 ,-1 ),HexColor ('#f9fafb')),
-        ('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ),
-        ('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor ('#f3f4f6')]),
-        ('FONTNAME',(0 ,1 ),(0 ,-1 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ),
-        ('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),0.25 *inch ),
-        ]))
+        table .setStyle (get_table_style ('#2563eb','#f3f4f6',body_color ='#f9fafb'))
 
         elements .append (table )
         return elements 
@@ -215,7 +281,7 @@ class PDFReportGenerator :
         """Build loan application section"""
         elements =[]
 
-        elements .append (Paragraph ("LOAN APPLICATION DETAILS",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("LOAN APPLICATION DETAILS",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         application =data .get ('application',{})
@@ -231,20 +297,7 @@ class PDFReportGenerator :
         ]
 
         table =Table (app_data ,colWidths =[2 *inch ,4 *inch ])
-        table .setStyle (TableStyle ([
-        ('BACKGROUND',(0 ,0 ),(-1 ,0 ),HexColor ('#2563eb')),
-        ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
-        ('ALIGN',(0 ,0 ),(-1 ,-1 ),'LEFT'),
-        ('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,0 ),10 ),
-        ('BOTTOMPADDING',(0 ,0 ),(-1 ,0 ),8 ),
-        ('BACKGROUND',(0 ,1 ),(-1 ,-1 ),HexColor ('#f9fafb')),
-        ('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ),
-        ('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor ('#f3f4f6')]),
-        ('FONTNAME',(0 ,1 ),(0 ,-1 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ),
-        ('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),0.25 *inch ),
-        ]))
+        table .setStyle (get_table_style ('#2563eb','#f3f4f6',body_color ='#f9fafb'))
 
         elements .append (table )
         return elements 
@@ -253,7 +306,7 @@ class PDFReportGenerator :
         """Build verification status section"""
         elements =[]
 
-        elements .append (Paragraph ("VERIFICATION STATUS",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("VERIFICATION STATUS",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         verification =data .get ('verification',{})
@@ -268,19 +321,7 @@ class PDFReportGenerator :
         ]
 
         table =Table (verification_data ,colWidths =[3 *inch ,3 *inch ])
-        table .setStyle (TableStyle ([
-        ('BACKGROUND',(0 ,0 ),(-1 ,0 ),HexColor ('#059669')),
-        ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
-        ('ALIGN',(0 ,0 ),(-1 ,-1 ),'CENTER'),
-        ('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,0 ),10 ),
-        ('BOTTOMPADDING',(0 ,0 ),(-1 ,0 ),8 ),
-        ('BACKGROUND',(0 ,1 ),(-1 ,-1 ),HexColor ('#f0fdf4')),
-        ('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ),
-        ('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor ('#f0fdf4')]),
-        ('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ),
-        ('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),0.25 *inch ),
-        ]))
+        table .setStyle (get_table_style ('#059669','#f0fdf4',body_color ='#f0fdf4',align ='CENTER',bold_labels =False ))
 
         elements .append (table )
         return elements 
@@ -289,7 +330,7 @@ class PDFReportGenerator :
         """Build risk assessment section"""
         elements =[]
 
-        elements .append (Paragraph ("RISK ASSESSMENT",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("RISK ASSESSMENT",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         risk =data .get ('risk',{})
@@ -311,26 +352,13 @@ class PDFReportGenerator :
 
         risk_band =risk .get ('risk_band','MEDIUM').upper ()
         if 'LOW'in risk_band :
-            header_color =HexColor ('#059669')
+            header_color =_COLOR_HEX ['LOW']
         elif 'HIGH'in risk_band :
-            header_color =HexColor ('#dc2626')
+            header_color =_COLOR_HEX ['HIGH']
         else :
-            header_color =HexColor ('#d97706')
-
-        table .setStyle (TableStyle ([
-        ('BACKGROUND',(0 ,0 ),(-1 ,0 ),header_color ),
-        ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
-        ('ALIGN',(0 ,0 ),(-1 ,-1 ),'LEFT'),
-        ('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,0 ),10 ),
-        ('BOTTOMPADDING',(0 ,0 ),(-1 ,0 ),8 ),
-        ('BACKGROUND',(0 ,1 ),(-1 ,-1 ),HexColor ('#fafafa')),
-        ('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ),
-        ('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor ('#f3f4f6')]),
-        ('FONTNAME',(0 ,1 ),(0 ,-1 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ),
-        ('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),0.25 *inch ),
-        ]))
+            header_color =_COLOR_HEX ['MEDIUM']
+
+        table .setStyle (get_table_style (header_color ,'#f3f4f6',body_color ='#fafafa'))
 
         elements .append (table )
         return elements 
@@ -339,7 +367,7 @@ class PDFReportGenerator :
         """Build underwriting decision section"""
         elements =[]
 
-        elements .append (Paragraph ("UNDERWRITING DECISION",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("UNDERWRITING DECISION",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         underwriting =data .get ('underwriting',{})
@@ -347,17 +375,14 @@ class PDFReportGenerator :
 
 
         if 'APPROVE'in decision :
-            status_color =HexColor ('#059669')
-            text_color ='#059669'
+            status_color =_COLOR_HEX ['LOW']
         elif 'DECLINE'in decision :
-            status_color =HexColor ('#dc2626')
-            text_color ='#dc2626'
+            status_color =_COLOR_HEX ['HIGH']
         else :
-            status_color =HexColor ('#d97706')
-            text_color ='#d97706'
+            status_color =_COLOR_HEX ['MEDIUM']
 
 
-        status_text =f"<font color='{text_color }'><b>{decision }</b></font>"
+        status_text =f"<font color='{status_color }'><b>{decision }</b></font>"
         status_para =Paragraph (f"Decision: {status_text }",self .styles ['Status'])
         elements .append (status_para )
         elements .append (Spacer (1 ,0.1 *inch ))
@@ -371,20 +396,7 @@ class PDFReportGenerator :
         ]
 
         table =Table (underwriting_data ,colWidths =[2 *inch ,4 *inch ])
-        table .setStyle (TableStyle ([
-        ('BACKGROUND',(0 ,0 ),(-1 ,0 ),status_color ),
-        ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
-        ('ALIGN',(0 ,0 ),(-1 ,-1 ),'LEFT'),
-        ('VALIGN',(0 ,0 ),(-1 ,-1 ),'TOP'),
-        ('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,0 ),10 ),
-        ('BOTTOMPADDING',(0 ,0 ),(-1 ,0 ),8 ),
-        ('BACKGROUND',(0 ,1 ),(-1 ,-1 ),HexColor ('#fafafa')),
-        ('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ),
-        ('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor ('#f3f4f6')]),
-        ('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ),
-        ('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),0.3 *inch ),
-        ]))
+        table .setStyle (get_table_style (status_color ,'#f3f4f6',body_color ='#fafafa',bold_labels =False ,valign_top =True ,row_height =0.3 ))
 
         elements .append (table )
         return elements 
@@ -393,7 +405,7 @@ class PDFReportGenerator :
         """Build loan offer section"""
         elements =[]
 
-        elements .append (Paragraph ("APPROVED OFFER DETAILS",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("APPROVED OFFER DETAILS",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         offer =data .get ('offer',{})
@@ -410,20 +422,7 @@ class PDFReportGenerator :
         ]
 
         table =Table (offer_data ,colWidths =[2.5 *inch ,3.5 *inch ])
-        table .setStyle (TableStyle ([
-        ('BACKGROUND',(0 ,0 ),(-1 ,0 ),HexColor ('#0891b2')),
-        ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
-        ('ALIGN',(0 ,0 ),(-1 ,-1 ),'LEFT'),
-        ('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,0 ),10 ),
-        ('BOTTOMPADDING',(0 ,0 ),(-1 ,0 ),8 ),
-        ('BACKGROUND',(0 ,1 ),(-1 ,-1 ),HexColor ('#f0f9fa')),
-        ('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ),
-        ('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor ('#cffafe')]),
-        ('FONTNAME',(0 ,1 ),(0 ,-1 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ),
-        ('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),0.25 *inch ),
-        ]))
+        table .setStyle (get_table_style ('#0891b2','#cffafe',body_color ='#f0f9fa'))
 
         elements .append (table )
         return elements 
@@ -432,7 +431,7 @@ class PDFReportGenerator :
         """Build feedback and comments section"""
         elements =[]
 
-        elements .append (Paragraph ("FEEDBACK & RECOMMENDATIONS",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("FEEDBACK & RECOMMENDATIONS",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         feedback =data .get ('feedback',{})
@@ -471,14 +470,7 @@ class PDFReportGenerator :
 
         elements .append (Spacer (1 ,0.2 *inch ))
 
-        footer_text =(
-        "<b>Important Notice:</b> This report is confidential and intended solely for authorized personnel. "
-        "Unauthorized distribution is prohibited. All information contained herein is subject to applicable "
-        "privacy and data protection regulations."
-        )
-
-        footer_para =Paragraph (footer_text ,self .styles ['Normal'])
-        elements .append (footer_para )
+        elements .append (static_paragraph (FOOTER_NOTICE ))
 
         elements .append (Spacer (1 ,0.1 *inch ))
 
@@ -518,7 +510,7 @@ class PDFReportGenerator :
         elements =[]
 
 
-        title =Paragraph ("EY BANK - STATISTICS & METRICS REPORT",self .styles ['CustomTitle'])
+        title =static_paragraph ("EY BANK - STATISTICS & METRICS REPORT",'CustomTitle')
         elements .append (title )
 
         timestamp =datetime .now ().strftime ("%Y-%m-%d %H:%M:%S")
@@ -527,7 +519,7 @@ class PDFReportGenerator :
         elements .append (Spacer (1 ,0.2 *inch ))
 
 
-        elements .append (Paragraph ("SUMMARY STATISTICS",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("SUMMARY STATISTICS",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         summary_data =[
@@ -540,24 +532,13 @@ class PDFReportGenerator :
         ]
 
         table =Table (summary_data ,colWidths =[3 *inch ,3 *inch ])
-        table .setStyle (TableStyle ([
-        ('BACKGROUND',(0 ,0 ),(-1 ,0 ),HexColor ('#2563eb')),
-        ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
-        ('ALIGN',(0 ,0 ),(-1 ,-1 ),'LEFT'),
-        ('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'),
-        ('FONTSIZE',(0 ,0 ),(-1 ,0 ),10 ),
-        ('BOTTOMPADDING',(0 ,0 ),(-1 ,0 ),8 ),
-        ('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ),
-        ('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor ('#f3f4f6')]),
-        ('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ),
-        ('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),0.25 *inch ),
-        ]))
+        table .setStyle (get_table_style ('#2563eb','#f3f4f6',bold_labels =False ))
 
         elements .append (table )
         elements .append (Spacer (1 ,0.2 *inch ))
 
 
-        elements .append (Paragraph ("DECISIONS DISTRIBUTION",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("DECISIONS DISTRIBUTION",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         decisions =statistics_data .get ('decisions',{})
@@ -569,22 +550,13 @@ class PDFReportGenerator :
         ]
 
         table =Table (decisions_data ,colWidths =[2.5 *inch ,2.5 *inch ])
-        table .setStyle (TableStyle ([
-        ('BACKGROUND',(0 ,0 ),(-1 ,0 ),HexColor ('#059669')),
-        ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
-        ('ALIGN',(0 ,0 ),(-1 ,-1 ),'CENTER'),
-        ('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'),
-        ('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ),
-        ('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor ('#f0fdf4')]),
-        ('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ),
-        ('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),0.25 *inch ),
-        ]))
+        table .setStyle (get_table_style ('#059669','#f0fdf4',align ='CENTER',bold_labels =False ,header_emphasis =False ))
 
         elements .append (table )
         elements .append (Spacer (1 ,0.2 *inch ))
 
 
-        elements .append (Paragraph ("RISK DISTRIBUTION",self .styles ['SectionHeader']))
+        elements .append (static_paragraph ("RISK DISTRIBUTION",'SectionHeader'))
         elements .append (Spacer (1 ,0.1 *inch ))
 
         risk_dist =statistics_data .get ('risk_distribution',{})
@@ -596,16 +568,7 @@ class PDFReportGenerator :
         ]
 
         table =Table (risk_data ,colWidths =[2.5 *inch ,2.5 *inch ])
-        table .setStyle (TableStyle ([
-        ('BACKGROUND',(0 ,0 ),(-1 ,0 ),HexColor ('#d97706')),
-        ('TEXTCOLOR',(0 ,0 ),(-1 ,0 ),white ),
-        ('ALIGN',(0 ,0 ),(-1 ,-1 ),'CENTER'),
-        ('FONTNAME',(0 ,0 ),(-1 ,0 ),'Helvetica-Bold'),
-        ('GRID',(0 ,0 ),(-1 ,-1 ),1 ,black ),
-        ('ROWBACKGROUNDS',(0 ,1 ),(-1 ,-1 ),[white ,HexColor ('#fffbeb')]),
-        ('FONTSIZE',(0 ,0 ),(-1 ,-1 ),9 ),
-        ('ROWHEIGHT',(0 ,0 ),(-1 ,-1 ),0.25 *inch ),
-        ]))
+        table .setStyle (get_table_style ('#d97706','#fffbeb',align ='CENTER',bold_labels =False ,header_emphasis =False ))
 
         elements .append (table )
         elements .append (Spacer (1 ,0.15 *inch ))
@@ -0,0 +1,175 @@
+"""
+PDF Render Pool
+Runs ReportLab layout in a bounded process pool so report rendering never
+blocks the event loop. Callers beyond the worker count wait in a bounded
+queue; once that is full, submissions fail fast with PDFRenderQueueFull
+"""
+
+import asyncio 
+import logging 
+import multiprocessing 
+import os 
+import shutil 
+import tempfile 
+import uuid 
+from concurrent .futures import BrokenExecutor ,Executor ,ProcessPoolExecutor ,ThreadPoolExecutor 
+from typing import Any ,Dict ,Optional 
+
+logger =logging .getLogger (__name__ )
+
+PDF_RENDER_WORKERS =int (os .environ .get ("PDF_RENDER_WORKERS",str (max (1 ,(os .cpu_count ()or 2 )//2 ))))
+PDF_RENDER_QUEUE_LIMIT =int (os .environ .get ("PDF_RENDER_QUEUE_LIMIT",str (max (1 ,PDF_RENDER_WORKERS )*4 )))
+PDF_RENDER_RETRY_AFTER =int (os .environ .get ("PDF_RENDER_RETRY_AFTER","5"))
+
+
+class PDFRenderQueueFull (Exception ):
+    """Raised when every worker is busy and the wait queue is at its limit"""
+
+    def __init__ (self ,retry_after :int =PDF_RENDER_RETRY_AFTER ):
+        super ().__init__ ("PDF rendering queue is full")
+        self .retry_after =retry_after 
+
+
+_generator =None 
+
+
+def _worker_generator ():
+    """One PDFReportGenerator per worker process, reused across documents"""
+    global _generator 
+    if _generator is None :
+        from utils .pdf_generator import PDFReportGenerator 
+        _generator =PDFReportGenerator ()
+    return _generator 
+
+
+def render_report_to_file (kind :str ,data :Dict [str ,Any ],filepath :str )->int :
+    """Render a report straight to disk (runs inside a worker); returns the file size"""
+    generator =_worker_generator ()
+    if kind =="approval":
+        generator .generate_approval_report (data ,filepath )
+    elif kind =="statistics":
+        generator .generate_statistics_report (data ,filepath )
+    else :
+        raise ValueError (f"Unknown report kind: {kind }")
+    return os .path .getsize (filepath )
+
+
+class PDFRenderPool :
+    """Bounded, lazily started process pool for PDF rendering"""
+
+    def __init__ (
+    self ,
+    max_workers :int =PDF_RENDER_WORKERS ,
+    queue_limit :int =PDF_RENDER_QUEUE_LIMIT ,
+    retry_after :int =PDF_RENDER_RETRY_AFTER ,
+    ):
+        self .max_workers =max_workers 
+        self .queue_limit =queue_limit 
+        self .retry_after =retry_after 
+        self .in_flight =0 
+        self .rejected =0 
+        self ._executor :Optional [Executor ]=None 
+        self ._spool_dir :Optional [str ]=None 
+
+    @property 
+    def capacity (self )->int :
+        return max (1 ,self .max_workers )+self .queue_limit 
+
+    def _get_executor (self )->Executor :
+        if self ._executor is None :
+            if self .max_workers <=0 :
+                self ._executor =ThreadPoolExecutor (thread_name_prefix ="pdf-render")
+            else :
+                self ._executor =ProcessPoolExecutor (
+                max_workers =self .max_workers ,
+                mp_context =multiprocessing .get_context ("spawn"),
+                )
+            logger .info (f"✓ PDF render pool started ({self .max_workers } workers, queue limit {self .queue_limit })")
+        return self ._executor 
+
+    def _discard_executor (self ,executor :Executor ):
+        """Drop a broken pool (a worker segfaulted or was OOM-killed) so the next call starts a fresh one"""
+        if self ._executor is executor :
+            self ._executor =None 
+            logger .warning ("⚠ PDF render pool broken, restarting it on the next render")
+        executor .shutdown (wait =False ,cancel_futures =True )
+
+    def reserve (self ):
+        """Claim a slot or raise PDFRenderQueueFull; pair with release()"""
+        if self .in_flight >=self .capacity :
+            self .rejected +=1 
+            raise PDFRenderQueueFull (self .retry_after )
+        self .in_flight +=1 
+
+    def release (self ):
+        self .in_flight -=1 
+
+    async def _submit (self ,fn ,args ,on_done =None ):
+        """Submit to the executor; on_done runs on the loop once the work has actually finished"""
+        loop =asyncio .get_running_loop ()
+        executor =self ._get_executor ()
+        try :
+            future =executor .submit (fn ,*args )
+        except BaseException as e :
+            if on_done is not None :
+                on_done ()
+            if isinstance (e ,BrokenExecutor ):
+                self ._discard_executor (executor )
+            raise 
+
+        if on_done is not None :
+            def notify (_ ):
+                try :
+                    loop .call_soon_threadsafe (on_done )
+                except RuntimeError :
+                    pass 
+            future .add_done_callback (notify )
+        try :
+            return await asyncio .wrap_future (future )
+        except BrokenExecutor :
+            self ._discard_executor (executor )
+            raise 
+
+    async def run (self ,fn ,*args ):
+        """
+        Run a picklable top-level function in the pool (threads when workers=0)
+
+        The slot is released when the work itself finishes, not when the
+        caller stops waiting, so a cancelled request whose document is still
+        rendering keeps counting against admission.
+        """
+        self .reserve ()
+        return await self ._submit (fn ,args ,self .release )
+
+    async def run_background (self ,fn ,*args ):
+        """Run work in the pool without taking an interactive queue slot (batch jobs)"""
+        return await self ._submit (fn ,args )
+
+    async def render_to_file (self ,kind :str ,data :Dict [str ,Any ],filepath :str )->int :
+        """Render in a worker straight to filepath, so the PDF never crosses the pipe as one buffer"""
+        return await self .run (render_report_to_file ,kind ,data ,filepath )
+
+    def spool_path (self ,prefix :str )->str :
+        """Fresh path in this process's spool directory for a report that is streamed then discarded"""
+        if self ._spool_dir is None or not os .path .isdir (self ._spool_dir ):
+            self ._spool_dir =tempfile .mkdtemp (prefix ="ey_pdf_spool_")
+        return os .path .join (self ._spool_dir ,f"{prefix }_{uuid .uuid4 ().hex }.pdf")
+
+    def stats (self )->Dict [str ,int ]:
+        return {
+        "workers":self .max_workers ,
+        "queue_limit":self .queue_limit ,
+        "in_flight":self .in_flight ,
+        "rejected":self .rejected ,
+        }
+
+    def shutdown (self ):
+        if self ._executor is not None :
+            self ._executor .shutdown (wait =True ,cancel_futures =True )
+            self ._executor =None 
+        if self ._spool_dir is not None :
+            shutil .rmtree (self ._spool_dir ,ignore_errors =True )
+            self ._spool_dir =None 
+
+
+pdf_render_pool =PDFRenderPool ()
@@ -0,0 +1,120 @@
+"""
+Report Storage
+Server-side storage for saved PDF reports under one fixed root directory, with
+generated names, path sandboxing and a janitor enforcing size and age limits
+"""
+
+import asyncio 
+import logging 
+import os 
+import re 
+import time 
+import uuid 
+from datetime import datetime 
+from pathlib import Path 
+from typing import Any ,Dict ,Optional 
+
+from utils .pdf_render_pool import pdf_render_pool 
+
+logger =logging .getLogger (__name__ )
+
+REPORTS_DIR =os .environ .get ("REPORTS_DIR","./reports/saved")
+REPORTS_MAX_BYTES =int (os .environ .get ("REPORTS_MAX_MB","1024"))*1024 *1024 
+REPORTS_MAX_AGE_HOURS =float (os .environ .get ("REPORTS_MAX_AGE_HOURS","168"))
+REPORTS_JANITOR_INTERVAL =float (os .environ .get ("REPORTS_JANITOR_INTERVAL","600"))
+
+
+class ReportPathError (ValueError ):
+    """Raised when a requested report name escapes the storage root or is malformed"""
+
+
+def _slug (value :Any )->str :
+    return re .sub (r"[^A-Za-z0-9_-]+","_",str (value or "report")).strip ("_")[:60 ]or "report"
+
+
+class ReportStorage :
+    """Saved reports live only under root; names are generated or validated against it"""
+
+    def __init__ (
+    self ,
+    root :str =REPORTS_DIR ,
+    max_bytes :int =REPORTS_MAX_BYTES ,
+    max_age_hours :float =REPORTS_MAX_AGE_HOURS ,
+    ):
+        self .root =Path (root ).resolve ()
+        self .max_bytes =max_bytes 
+        self .max_age_seconds =max_age_hours *3600 
+        self .removed =0 
+
+    def generate_name (self ,kind :str ,label :Optional [str ]=None )->str :
+        timestamp =datetime .now ().strftime ('%Y%m%d_%H%M%S')
+        parts =[_slug (kind )]+([_slug (label )]if label else [])+[timestamp ,uuid .uuid4 ().hex [:8 ]]
+        return "_".join (parts )+".pdf"
+
+    def resolve (self ,name :str )->Path :
+        """Absolute path for a report name, refusing anything outside the root"""
+        if not name or "\x00"in name or os .path .isabs (name ):
+            raise ReportPathError ("Report name must be a relative path inside the report store")
+        if not name .endswith (".pdf"):
+            name =f"{name }.pdf"
+        path =(self .root /name ).resolve ()
+        if self .root not in path .parents :
+            raise ReportPathError ("Report name escapes the report store")
+        return path 
+
+    async def save (self ,kind :str ,data :Dict [str ,Any ],name :str )->Path :
+        """Render a report in the PDF pool directly into the store (atomically replaced)"""
+        path =self .resolve (name )
+        await asyncio .to_thread (path .parent .mkdir ,parents =True ,exist_ok =True )
+        tmp_path =path .with_name (f".{path .name }.{uuid .uuid4 ().hex }.tmp")
+        try :
+            await pdf_render_pool .render_to_file (kind ,data ,str (tmp_path ))
+            await asyncio .to_thread (os .replace ,tmp_path ,path )
+        except BaseException :
+            await asyncio .to_thread (tmp_path .unlink ,missing_ok =True )
+            raise 
+        return path 
+
+    def enforce_limits (self )->int :
+        """Delete reports older than the age limit, then the oldest until under the size limit"""
+        if not self .root .is_dir ():
+            return 0 
+        cutoff =time .time ()-self .max_age_seconds 
+        entries =[]
+        removed =0 
+        for path in self .root .rglob ("*"):
+            try :
+                stat =path .stat ()
+            except FileNotFoundError :
+                continue 
+            if not path .is_file ():
+                continue 
+            if stat .st_mtime <cutoff :
+                path .unlink (missing_ok =True )
+                removed +=1 
+            elif path .suffix ==".pdf":
+                entries .append ((stat .st_mtime ,stat .st_size ,path ))
+
+        total =sum (size for _ ,size ,_ in entries )
+        for _ ,size ,path in sorted (entries ):
+            if total <=self .max_bytes :
+                break 
+            path .unlink (missing_ok =True )
+            total -=size 
+            removed +=1 
+
+        self .removed +=removed 
+        return removed 
+
+    async def run_janitor (self ,interval :float =REPORTS_JANITOR_INTERVAL ):
+        while True :
+            try :
+                removed =await asyncio .to_thread (self .enforce_limits )
+                if removed :
+                    logger .info (f"✓ Report janitor removed {removed } saved reports")
+            except Exception as e :
+                logger .warning (f"⚠ Report janitor failed: {e }")
+            await asyncio .sleep (interval )
+
+
+report_storage =ReportStorage ()
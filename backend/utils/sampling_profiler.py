@@ -0,0 +1,151 @@
+"""
+Sampling Profiler
+Low-overhead wall-clock sampler over every Python thread in the worker
+(event loop, threadpool and model threads), exporting collapsed stacks or
+speedscope JSON. Nothing runs unless a profile is being taken
+"""
+
+import json 
+import os 
+import sys 
+import threading 
+import time 
+from collections import Counter 
+from typing import Any ,Dict ,Tuple 
+
+PROFILER_ENABLED =os .environ .get ("PROFILER_ENABLED","0")=="1"
+PROFILER_TOKEN =os .environ .get ("PROFILER_TOKEN","")
+PROFILER_MAX_SECONDS =float (os .environ .get ("PROFILER_MAX_SECONDS","60"))
+PROFILER_INTERVAL_MS =float (os .environ .get ("PROFILER_INTERVAL_MS","10"))
+PROFILER_MIN_INTERVAL_MS =1.0 
+
+IDLE_LEAVES ={
+("threading.py","wait"),
+("threading.py","_wait_for_tstate_lock"),
+("selectors.py","select"),
+("queue.py","get"),
+("thread.py","_worker"),
+}
+
+Frame =Tuple [str ,str ,int ]
+
+
+class ProfilerBusy (Exception ):
+    """Raised when a profile is requested while another one is running"""
+
+
+class SamplingProfiler :
+    """Samples sys._current_frames() at a fixed interval for a bounded duration"""
+
+    def __init__ (self ):
+        self ._lock =threading .Lock ()
+
+    def sample (self ,seconds :float ,interval_ms :float =PROFILER_INTERVAL_MS ,include_idle :bool =False )->Dict [str ,Any ]:
+        if not self ._lock .acquire (blocking =False ):
+            raise ProfilerBusy ("A profile is already running")
+        try :
+            return self ._sample (
+            min (max (seconds ,0.01 ),PROFILER_MAX_SECONDS ),
+            max (interval_ms ,PROFILER_MIN_INTERVAL_MS )/1000.0 ,
+            include_idle ,
+            )
+        finally :
+            self ._lock .release ()
+
+    def _sample (self ,seconds :float ,interval :float ,include_idle :bool )->Dict [str ,Any ]:
+        me =threading .get_ident ()
+        stacks :Counter =Counter ()
+        code_names :Dict [Any ,Frame ]={}
+        started =time .perf_counter ()
+        deadline =started +seconds 
+        samples =0 
+        busy =0.0 
+
+        while True :
+            tick =time .perf_counter ()
+            if tick >=deadline :
+                break 
+            names ={t .ident :t .name for t in threading .enumerate ()}
+            for ident ,frame in sys ._current_frames ().items ():
+                if ident ==me :
+                    continue 
+                stack =[]
+                while frame is not None :
+                    code =frame .f_code 
+                    key =code_names .get (code )
+                    if key is None :
+                        key =code_names [code ]=(
+                        code .co_qualname if hasattr (code ,"co_qualname")else code .co_name ,
+                        code .co_filename ,
+                        code .co_firstlineno ,
+                        )
+                    stack .append (key )
+                    frame =frame .f_back 
+                if not stack :
+                    continue 
+                if not include_idle and (os .path .basename (stack [0 ][1 ]),stack [0 ][0 ].rsplit (".",1 )[-1 ])in IDLE_LEAVES :
+                    continue 
+                stack .reverse ()
+                stacks [(names .get (ident ,f"thread-{ident }"),tuple (stack ))]+=1 
+            samples +=1 
+            spent =time .perf_counter ()-tick 
+            busy +=spent 
+            time .sleep (max (0.0 ,interval -spent ))
+
+        duration =time .perf_counter ()-started 
+        return {
+        "stacks":stacks ,
+        "samples":samples ,
+        "interval":interval ,
+        "duration":duration ,
+        "overhead":busy /duration if duration else 0.0 ,
+        }
+
+
+def to_collapsed (profile :Dict [str ,Any ])->str :
+    """Brendan Gregg collapsed-stack format, one 'thread;frame;frame count' line per stack"""
+    lines =[]
+    for (thread ,stack ),count in profile ["stacks"].most_common ():
+        frames =";".join (f"{name } ({os .path .basename (filename )}:{line })"for name ,filename ,line in stack )
+        lines .append (f"{thread };{frames } {count }")
+    return "\n".join (lines )+"\n"
+
+
+def to_speedscope (profile :Dict [str ,Any ],name :str ="profile")->str :
+    """speedscope file format with one sampled profile per thread"""
+    frame_index :Dict [Frame ,int ]={}
+    frames =[]
+    per_thread :Dict [str ,Tuple [list ,list ]]={}
+    for (thread ,stack ),count in profile ["stacks"].items ():
+        indices =[]
+        for frame in stack :
+            idx =frame_index .get (frame )
+            if idx is None :
+                idx =frame_index [frame ]=len (frames )
+                frames .append ({"name":frame [0 ],"file":frame [1 ],"line":frame [2 ]})
+            indices .append (idx )
+        samples ,weights =per_thread .setdefault (thread ,([],[]))
+        samples .append (indices )
+        weights .append (count *profile ["interval"])
+
+    return json .dumps ({
+    "$schema":"https://www.speedscope.app/file-format-schema.json",
+    "shared":{"frames":frames },
+    "profiles":[
+    {
+    "type":"sampled",
+    "name":thread ,
+    "unit":"seconds",
+    "startValue":0 ,
+    "endValue":sum (weights ),
+    "samples":samples ,
+    "weights":weights ,
+    }
+    for thread ,(samples ,weights )in sorted (per_thread .items ())
+    ],
+    "name":name ,
+    "exporter":"agentic-ai-backend",
+    })
+
+
+profiler =SamplingProfiler ()
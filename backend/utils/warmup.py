@@ -0,0 +1,205 @@
+"""
+Model Warm-up
+Loads and primes the configured models in parallel at startup with representative
+dummy inputs so the first real request does not pay for weight loading and
+first-call allocation; /ready reports 503 until this has finished
+"""
+
+import asyncio 
+import logging 
+import os 
+import time 
+from typing import Any ,Callable ,Dict ,List ,Optional 
+
+logger =logging .getLogger (__name__ )
+
+DEFAULT_WARMUP_MODELS ="intent,emotion,sentiment,name_checker,feedback_llm,offer_llm,mistral,eligibility,risk,supervisor"
+
+WARMUP_MODELS =os .environ .get ("WARMUP_MODELS",DEFAULT_WARMUP_MODELS )
+WARMUP_CONCURRENCY =int (os .environ .get ("WARMUP_CONCURRENCY","3"))
+WARMUP_PRIME_CALLS =int (os .environ .get ("WARMUP_PRIME_CALLS","2"))
+WARMUP_REQUIRE_ALL =os .environ .get ("WARMUP_REQUIRE_ALL","0").lower ()in ("1","true","yes")
+
+SAMPLE_MESSAGE ="I need a personal loan of 5 lakh for home renovation, can you help?"
+
+
+def _prime_intent ():
+    from ml .infer_intent import predict_intent 
+    return predict_intent (SAMPLE_MESSAGE )
+
+
+def _prime_emotion ():
+    from ml .infer_emotion import analyze_emotion 
+    return analyze_emotion (SAMPLE_MESSAGE )
+
+
+def _prime_sentiment ():
+    from agents .sales_persuasion import get_sentiment_analyzer 
+    from ml .gpu_accelerated_inference import accelerator 
+
+    analyzer =get_sentiment_analyzer ()
+    if analyzer is None :
+        raise RuntimeError ("sentiment analyzer unavailable")
+    return accelerator .run_model ("sentiment",analyzer ,SAMPLE_MESSAGE )
+
+
+def _prime_name_checker ():
+    from agents .verification_agent import get_name_checker 
+    from ml .gpu_accelerated_inference import accelerator 
+
+    checker =get_name_checker ()
+    if checker is None :
+        raise RuntimeError ("name checker unavailable")
+    return accelerator .run_model ("name_checker",checker ,"Rajesh Kumar",candidate_labels =["valid person name","random text"])
+
+
+def _prime_feedback_llm ():
+    from agents .feedback_agent import generate_feedback 
+    return generate_feedback (
+    verification_result ={"status":"verified"},
+    underwriting_result ={"decision":"APPROVED"},
+    risk_result ={"risk_band":"LOW","reasons":[]},
+    emotion ="neutral",
+    )
+
+
+def _prime_offer_llm ():
+    from agents .offer_generation_agent import generate_offer 
+    return generate_offer (
+    application_data ={"monthly_income":90000 ,"loan_amount":500000 },
+    underwriting_result ={"decision":"APPROVED"},
+    risk_result ={"risk_band":"LOW"},
+    )
+
+
+def _prime_mistral ():
+    from llm .mistral_orchestrator import mistral_think 
+    return mistral_think (f"Customer message: {SAMPLE_MESSAGE }\nIntent: loan_application")
+
+
+def _prime_eligibility ():
+    from ml .predict_eligibility import predict_eligibility 
+    return predict_eligibility (
+    credit_score =720 ,annual_income =900000 ,employment_type ="salaried",existing_loans_count =1 ,
+    debt_to_income =0.3 ,intent_confidence =0.8 ,persuasion_index =0.5 ,sentiment_score =0.2 ,
+    age =35 ,loan_amount =500000 ,
+    )
+
+
+def _prime_risk ():
+    from ml .predict_risk import predict_risk 
+    return predict_risk ({
+    "credit_score":720 ,"delinquency_12m":0 ,"outstanding_debt":150000 ,"income":900000 ,
+    "loan_amount":500000 ,"debt_to_income":0.3 ,"age":35 ,"num_hard_inquiries":1 ,
+    "employment_type":"salaried",
+    })
+
+
+def _prime_supervisor ():
+    from ml .supervisor_route import route_message 
+    return route_message (SAMPLE_MESSAGE )
+
+
+PRIMERS :Dict [str ,Callable [[],Any ]]={
+"intent":_prime_intent ,
+"emotion":_prime_emotion ,
+"sentiment":_prime_sentiment ,
+"name_checker":_prime_name_checker ,
+"feedback_llm":_prime_feedback_llm ,
+"offer_llm":_prime_offer_llm ,
+"mistral":_prime_mistral ,
+"eligibility":_prime_eligibility ,
+"risk":_prime_risk ,
+"supervisor":_prime_supervisor ,
+}
+
+
+def parse_models (value :str )->List [str ]:
+    if value .strip ().lower ()in ("","none","0","off"):
+        return []
+    names =[name .strip ()for name in value .split (",")if name .strip ()]
+    unknown =[name for name in names if name not in PRIMERS ]
+    if unknown :
+        logger .warning (f"⚠ Ignoring unknown warm-up models: {', '.join (unknown )}")
+    return [name for name in names if name in PRIMERS ]
+
+
+class ModelWarmup :
+    """Runs each primer a few times on a worker thread and tracks overall readiness"""
+
+    def __init__ (
+    self ,
+    models :Optional [List [str ]]=None ,
+    concurrency :int =WARMUP_CONCURRENCY ,
+    prime_calls :int =WARMUP_PRIME_CALLS ,
+    require_all :bool =WARMUP_REQUIRE_ALL ,
+    ):
+        self .models =parse_models (WARMUP_MODELS )if models is None else models 
+        self .concurrency =max (1 ,concurrency )
+        self .prime_calls =max (1 ,prime_calls )
+        self .require_all =require_all 
+        self .status ="pending"
+        self .started_at :Optional [float ]=None 
+        self .finished_at :Optional [float ]=None 
+        self .results :Dict [str ,Dict [str ,Any ]]={name :{"status":"pending"}for name in self .models }
+
+    @property 
+    def ready (self )->bool :
+        if self .status !="done":
+            return False 
+        return not self .require_all or all (r ["status"]=="ready"for r in self .results .values ())
+
+    def _prime (self ,name :str ):
+        timings =[]
+        for _ in range (self .prime_calls ):
+            start =time .perf_counter ()
+            PRIMERS [name ]()
+            timings .append (round (time .perf_counter ()-start ,3 ))
+        return timings 
+
+    async def _warm (self ,name :str ,semaphore :asyncio .Semaphore ):
+        async with semaphore :
+            self .results [name ]={"status":"warming"}
+            try :
+                timings =await asyncio .to_thread (self ._prime ,name )
+                self .results [name ]={"status":"ready","first_call_seconds":timings [0 ],"primed_call_seconds":timings [-1 ]}
+                logger .info (f"✓ Warmed {name } in {timings [0 ]:.2f}s (primed call {timings [-1 ]:.3f}s)")
+            except Exception as e :
+                self .results [name ]={"status":"failed","error":str (e )}
+                logger .warning (f"⚠ Warm-up failed for {name }: {e }")
+
+    async def run (self ):
+        self .status ="running"
+        self .started_at =time .time ()
+        semaphore =asyncio .Semaphore (self .concurrency )
+        await asyncio .gather (*(self ._warm (name ,semaphore )for name in self .models ))
+        self .finished_at =time .time ()
+        self .status ="done"
+        failed =[name for name ,r in self .results .items ()if r ["status"]=="failed"]
+        logger .info (f"✓ Model warm-up finished in {self .finished_at -self .started_at :.1f}s"+(f" ({len (failed )} failed)"if failed else ""))
+
+    def report (self )->Dict [str ,Any ]:
+        """
+        Warm-up state for /ready
+
+        status is "degraded" once warm-up is done and any model failed,
+        whether or not that failure makes the instance unready; the HTTP code
+        follows ready, which only counts failures under require_all.
+        """
+        elapsed =None 
+        if self .started_at :
+            elapsed =round ((self .finished_at or time .time ())-self .started_at ,2 )
+        if self .status !="done":
+            status ="warming"
+        elif any (r ["status"]=="failed"for r in self .results .values ()):
+            status ="degraded"
+        else :
+            status ="ready"
+        return {
+        "status":status ,
+        "elapsed_seconds":elapsed ,
+        "models":self .results ,
+        }
+
+
+model_warmup =ModelWarmup ()